@@ -6,8 +6,16 @@
 -- Enable UUID generation
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 
+-- Enable trigram indexes for substring search
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- Drop tables if they exist (for clean setup)
+DROP TABLE IF EXISTS import_progress CASCADE;
+DROP TABLE IF EXISTS engagement_client_summary CASCADE;
+DROP TABLE IF EXISTS engagement_summary CASCADE;
+DROP TABLE IF EXISTS deletions CASCADE;
 DROP TABLE IF EXISTS engagements CASCADE;
+DROP TABLE IF EXISTS staff CASCADE;
 DROP TABLE IF EXISTS clients CASCADE;
 
 -- ============================================================================
@@ -24,12 +32,29 @@ CREATE TABLE clients (
     status VARCHAR(20) DEFAULT 'active',    -- Client status (active/inactive)
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    -- Search column kept current by the database (lowercased name, PAN and email)
+    search_document TEXT GENERATED ALWAYS AS (
+        lower(name || ' ' || pan || ' ' || coalesce(email, ''))
+    ) STORED,
     
     -- Constraints
     CONSTRAINT clients_pan_format CHECK (pan ~ '^[A-Z]{5}[0-9]{4}[A-Z]$'),
     CONSTRAINT clients_status_check CHECK (status IN ('active', 'inactive'))
 );
 
+-- ============================================================================
+-- Staff Table
+-- ============================================================================
+-- People engagements are assigned to as senior or assistant. name_key is the
+-- name with whitespace collapsed and lowercased, so spelling variants such as
+-- "Ajay " and "ajay" are one staff member.
+CREATE TABLE staff (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,             -- Name as shown
+    name_key VARCHAR(100) NOT NULL UNIQUE,  -- lower(trimmed, single-spaced name)
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
 -- ============================================================================
 -- Engagements Table
 -- ============================================================================
@@ -42,8 +67,10 @@ CREATE TABLE engagements (
     file_number_as_per VARCHAR(50),                 -- File number reference code
     type VARCHAR(100) NOT NULL,                     -- Engagement type (e.g., "FIRM", "HUF")
     type2 VARCHAR(100),                             -- Engagement sub-type (e.g., "Individual-Audit")
-    senior VARCHAR(100),                            -- Senior staff assigned
-    assistant VARCHAR(100),                         -- Assistant staff assigned
+    senior VARCHAR(100),                            -- Senior staff assigned (staff.name)
+    assistant VARCHAR(100),                         -- Assistant staff assigned (staff.name)
+    senior_id INTEGER REFERENCES staff(id) ON DELETE SET NULL,     -- Senior staff member
+    assistant_id INTEGER REFERENCES staff(id) ON DELETE SET NULL,  -- Assistant staff member
     status VARCHAR(100) NOT NULL,                   -- Engagement status
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
@@ -58,6 +85,36 @@ CREATE TABLE engagements (
     CONSTRAINT unique_client_file_number UNIQUE (client_id, file_number)
 );
 
+-- ============================================================================
+-- Deletions Table
+-- ============================================================================
+-- Tombstones for deleted clients and engagements, read by the change feeds
+-- (GET /clients/changes, /engagements/changes). Written by the API in the
+-- deleting transaction, including engagements removed by the client cascade.
+CREATE TABLE deletions (
+    id BIGSERIAL PRIMARY KEY,               -- Tiebreaker for equal deleted_at
+    entity VARCHAR(20) NOT NULL,            -- clients or engagements
+    entity_id UUID NOT NULL,                -- ID of the deleted row
+    client_id UUID,                         -- Owning client of a deleted engagement
+    deleted_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- ============================================================================
+-- Import Progress Table
+-- ============================================================================
+-- Checkpoints of chunked CSV imports (tools/migrations/import_clients_csv.py
+-- --commit-every), one row per imported file, so --resume continues after
+-- the last committed chunk.
+CREATE TABLE import_progress (
+    file_hash CHAR(64) PRIMARY KEY,         -- SHA-256 of the file contents
+    file_name TEXT NOT NULL,                -- Path the file was imported from
+    byte_offset BIGINT NOT NULL,            -- Offset after the last committed row
+    row_number BIGINT NOT NULL,             -- Line number of the last committed row
+    rows_imported BIGINT NOT NULL,          -- Valid rows committed so far
+    completed_at TIMESTAMP WITH TIME ZONE,  -- Set once the whole file is imported
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
 -- ============================================================================
 -- Indexes for Performance
 -- ============================================================================
@@ -66,13 +123,24 @@ CREATE TABLE engagements (
 CREATE INDEX idx_clients_pan ON clients(pan);
 CREATE INDEX idx_clients_name ON clients(name);
 CREATE INDEX idx_clients_status ON clients(status);
+-- Trigram index serves search LIKE '%term%' and word_similarity() ranking
+CREATE INDEX idx_clients_search_trgm ON clients USING gin (search_document gin_trgm_ops);
+-- Change feed seeks on (updated_at, id)
+CREATE INDEX idx_clients_updated_at ON clients(updated_at, id);
 
 -- Engagements table indexes
 CREATE INDEX idx_engagements_client_id ON engagements(client_id);
 CREATE INDEX idx_engagements_status ON engagements(status);
 CREATE INDEX idx_engagements_type ON engagements(type);
 CREATE INDEX idx_engagements_senior ON engagements(senior);
+-- Staff filters and per-staff workload are exact lookups on these
+CREATE INDEX ix_engagements_senior_id ON engagements(senior_id);
+CREATE INDEX ix_engagements_assistant_id ON engagements(assistant_id);
 CREATE INDEX idx_engagements_file_number ON engagements(file_number);
+CREATE INDEX idx_engagements_updated_at ON engagements(updated_at, id);
+
+-- Deletions table indexes
+CREATE INDEX idx_deletions_entity_deleted_at ON deletions(entity, deleted_at, id);
 
 -- ============================================================================
 -- Triggers for Updated At Timestamp
@@ -99,6 +167,117 @@ CREATE TRIGGER update_engagements_updated_at
     FOR EACH ROW 
     EXECUTE FUNCTION update_updated_at_column();
 
+-- ============================================================================
+-- Engagement Summaries (reporting)
+-- ============================================================================
+-- Engagement counts per group, kept current by statement-level triggers on
+-- engagements: each statement applies one set-based delta from its
+-- transition tables, however many rows it wrote. Groups at zero are removed.
+
+CREATE TABLE engagement_summary (
+    status VARCHAR(100) NOT NULL,
+    type VARCHAR(100) NOT NULL,
+    senior VARCHAR(100) NOT NULL,            -- '' when no senior is assigned
+    engagements INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (status, type, senior)
+);
+
+CREATE TABLE engagement_client_summary (
+    client_id UUID NOT NULL,
+    status VARCHAR(100) NOT NULL,
+    engagements INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (client_id, status)
+);
+
+CREATE OR REPLACE FUNCTION engagement_summary_update()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO engagement_summary AS s (status, type, senior, engagements)
+    SELECT status, type, senior, sum(delta) FROM (
+        SELECT status, type, coalesce(senior, '') AS senior, -1 AS delta FROM old_rows
+        UNION ALL
+        SELECT status, type, coalesce(senior, '') AS senior, 1 AS delta FROM new_rows
+    ) d
+    GROUP BY status, type, senior HAVING sum(delta) <> 0 ORDER BY status, type, senior
+    ON CONFLICT (status, type, senior) DO UPDATE SET engagements = s.engagements + EXCLUDED.engagements;
+    DELETE FROM engagement_summary WHERE engagements <= 0 AND (status, type, senior) IN
+        (SELECT status, type, coalesce(senior, '') FROM old_rows);
+
+    INSERT INTO engagement_client_summary AS s (client_id, status, engagements)
+    SELECT client_id, status, sum(delta) FROM (
+        SELECT client_id, status, -1 AS delta FROM old_rows
+        UNION ALL
+        SELECT client_id, status, 1 AS delta FROM new_rows
+    ) d
+    GROUP BY client_id, status HAVING sum(delta) <> 0 ORDER BY client_id, status
+    ON CONFLICT (client_id, status) DO UPDATE SET engagements = s.engagements + EXCLUDED.engagements;
+    DELETE FROM engagement_client_summary WHERE engagements <= 0 AND (client_id, status) IN
+        (SELECT client_id, status FROM old_rows);
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER engagement_summary_update
+    AFTER UPDATE ON engagements
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION engagement_summary_update();
+
+CREATE OR REPLACE FUNCTION engagement_summary_insert()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO engagement_summary AS s (status, type, senior, engagements)
+    SELECT status, type, coalesce(senior, ''), count(*) FROM new_rows
+    GROUP BY 1, 2, 3 ORDER BY 1, 2, 3
+    ON CONFLICT (status, type, senior) DO UPDATE SET engagements = s.engagements + EXCLUDED.engagements;
+
+    INSERT INTO engagement_client_summary AS s (client_id, status, engagements)
+    SELECT client_id, status, count(*) FROM new_rows
+    GROUP BY 1, 2 ORDER BY 1, 2
+    ON CONFLICT (client_id, status) DO UPDATE SET engagements = s.engagements + EXCLUDED.engagements;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER engagement_summary_insert
+    AFTER INSERT ON engagements
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION engagement_summary_insert();
+
+CREATE OR REPLACE FUNCTION engagement_summary_delete()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO engagement_summary AS s (status, type, senior, engagements)
+    SELECT status, type, coalesce(senior, ''), -count(*) FROM old_rows
+    GROUP BY 1, 2, 3 ORDER BY 1, 2, 3
+    ON CONFLICT (status, type, senior) DO UPDATE SET engagements = s.engagements + EXCLUDED.engagements;
+    DELETE FROM engagement_summary WHERE engagements <= 0 AND (status, type, senior) IN
+        (SELECT status, type, coalesce(senior, '') FROM old_rows);
+
+    INSERT INTO engagement_client_summary AS s (client_id, status, engagements)
+    SELECT client_id, status, -count(*) FROM old_rows
+    GROUP BY 1, 2 ORDER BY 1, 2
+    ON CONFLICT (client_id, status) DO UPDATE SET engagements = s.engagements + EXCLUDED.engagements;
+    DELETE FROM engagement_client_summary WHERE engagements <= 0 AND (client_id, status) IN
+        (SELECT client_id, status FROM old_rows);
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER engagement_summary_delete
+    AFTER DELETE ON engagements
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION engagement_summary_delete();
+
+-- Initial fill from existing engagements (none on a clean setup; needed when
+-- this section is applied to a database that already has engagements)
+INSERT INTO engagement_summary (status, type, senior, engagements)
+SELECT status, type, coalesce(senior, ''), count(*) FROM engagements GROUP BY 1, 2, 3;
+INSERT INTO engagement_client_summary (client_id, status, engagements)
+SELECT client_id, status, count(*) FROM engagements GROUP BY 1, 2;
+
 -- ============================================================================
 -- Sample Queries for Verification
 -- ============================================================================
@@ -129,3 +308,22 @@ CREATE TRIGGER update_engagements_updated_at
 -- 3. PAN format is validated: 5 letters + 4 digits + 1 letter
 -- 4. Cascading delete ensures data integrity (deleting client removes engagements)
 -- 5. Indexes are created on commonly queried fields for performance
+-- 6. Existing databases can add client search with:
+--      CREATE EXTENSION IF NOT EXISTS pg_trgm;
+--      ALTER TABLE clients ADD COLUMN search_document TEXT GENERATED ALWAYS AS (
+--          lower(name || ' ' || pan || ' ' || coalesce(email, ''))) STORED;
+--      CREATE INDEX CONCURRENTLY idx_clients_search_trgm
+--          ON clients USING gin (search_document gin_trgm_ops);
+-- 7. Existing databases can add the change feeds by creating the deletions
+--    table and its index above, plus:
+--      CREATE INDEX CONCURRENTLY idx_clients_updated_at ON clients(updated_at, id);
+--      CREATE INDEX CONCURRENTLY idx_engagements_updated_at ON engagements(updated_at, id);
+-- 8. Existing databases get the engagement summaries by running the
+--    "Engagement Summaries" section above, which creates the tables, their
+--    three triggers and fills them from the existing engagements. The API's
+--    create_all (used by the tests) creates the same triggers.
+-- 9. Existing databases get the staff table, the engagement staff columns
+--    and their indexes with tools/migrations/add_staff_table.py, which also
+--    merges spelling variants of existing names
+-- 10. Existing databases get import_progress from the importer, which
+--     creates it on its first --commit-every run
@@ -2,10 +2,18 @@
 Database connection and session management
 """
 
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from starlette.concurrency import run_in_threadpool
+from typing import Any, AsyncGenerator, Callable, Generator, List, Optional, Union
+import itertools
+import threading
+import time
 
 from .config import get_settings
 
@@ -25,6 +33,39 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+@event.listens_for(Engine, "connect")
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    """SQLite ignores foreign keys (and ON DELETE CASCADE) unless asked per connection."""
+    if "sqlite" in type(dbapi_connection).__module__:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+def to_async_url(url: str) -> str:
+    """Swap a sync database URL to its async driver (asyncpg / aiosqlite)."""
+    scheme, _, rest = url.partition("://")
+    backend = scheme.split("+")[0]
+    drivers = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+    if backend not in drivers:
+        raise ValueError(f"No async driver configured for '{backend}'")
+    return f"{drivers[backend]}://{rest}"
+
+
+# Async engine, only created when the async path is enabled
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.async_database:
+    async_engine = create_async_engine(
+        settings.async_database_url or to_async_url(settings.database_url),
+        pool_pre_ping=True,
+        echo=settings.debug
+    )
+    # Objects stay readable after commit; lazy loads are not possible outside run_sync
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
 def get_db() -> Generator[Session, None, None]:
     """
     Dependency function to get database session.
@@ -35,3 +76,163 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency function to get an async database session.
+    Yields a session and ensures it's closed after use.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Session dependency for API routes, selected by settings.async_database
+get_session = get_async_db if settings.async_database else get_db
+
+# Either session type, as yielded by get_session
+DbSession = Union[Session, AsyncSession]
+
+
+# ============================================================================
+# Read Replicas
+# ============================================================================
+
+class _Replica:
+    """One read replica with its session factories and health state."""
+
+    def __init__(self, url: str, use_async: bool):
+        self.url = url
+        self.session_factory = sessionmaker(
+            autocommit=False,
+            autoflush=False,
+            bind=create_engine(url, pool_pre_ping=True, echo=settings.debug)
+        )
+        self.async_session_factory = None
+        if use_async:
+            self.async_session_factory = async_sessionmaker(
+                create_async_engine(to_async_url(url), pool_pre_ping=True, echo=settings.debug),
+                autoflush=False,
+                expire_on_commit=False
+            )
+        self.down_until = 0.0
+
+
+class ReplicaRouter:
+    """
+    Round-robin over read replicas, skipping ones that recently failed.
+
+    A replica is checked when a session is opened: the connection checkout
+    runs pool_pre_ping, so a dead replica is noticed before the route runs and
+    is skipped for `retry_seconds`. When no replica is usable the caller falls
+    back to the primary.
+    """
+
+    def __init__(self, urls: List[str], retry_seconds: float = 30.0, use_async: bool = False):
+        self.retry_seconds = retry_seconds
+        self.replicas = [_Replica(url, use_async) for url in urls]
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+
+    def replicas_in_turn(self) -> List[_Replica]:
+        """Healthy replicas, rotated so successive calls start on the next one."""
+        now = time.monotonic()
+        with self._lock:
+            start = next(self._turn) % len(self.replicas)
+        rotated = self.replicas[start:] + self.replicas[:start]
+        return [replica for replica in rotated if replica.down_until <= now]
+
+    def mark_down(self, replica: _Replica) -> None:
+        """Skip a replica until retry_seconds have passed."""
+        replica.down_until = time.monotonic() + self.retry_seconds
+
+    def open_session(self) -> Optional[Session]:
+        """Open a session on the next healthy replica, or None if none respond."""
+        for replica in self.replicas_in_turn():
+            db = replica.session_factory()
+            try:
+                db.connection()
+            except DBAPIError:
+                db.close()
+                self.mark_down(replica)
+                continue
+            return db
+        return None
+
+    async def open_async_session(self) -> Optional[AsyncSession]:
+        """Async version of open_session."""
+        for replica in self.replicas_in_turn():
+            db = replica.async_session_factory()
+            try:
+                await db.connection()
+            except (DBAPIError, OSError):
+                await db.close()
+                self.mark_down(replica)
+                continue
+            return db
+        return None
+
+
+replica_router = None
+if settings.database_replica_urls:
+    replica_router = ReplicaRouter(
+        settings.database_replica_urls,
+        retry_seconds=settings.replica_retry_seconds,
+        use_async=settings.async_database
+    )
+
+
+def wants_primary(request: Request) -> bool:
+    """
+    Read-your-writes: True if this client wrote within the stickiness window.
+    The timestamp comes from the cookie set on successful writes (see main.py).
+    """
+    last_write = request.cookies.get(settings.read_your_writes_cookie)
+    try:
+        return time.time() - float(last_write) < settings.read_your_writes_seconds
+    except (TypeError, ValueError):
+        return False
+
+
+def get_replica_read_db(request: Request) -> Generator[Session, None, None]:
+    """
+    Dependency function to get a read-only session from a replica.
+    Falls back to the primary when the client recently wrote or no replica responds.
+    """
+    db = None if wants_primary(request) else replica_router.open_session()
+    if db is None:
+        db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_replica_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Async version of get_replica_read_db."""
+    db = None if wants_primary(request) else await replica_router.open_async_session()
+    if db is None:
+        db = AsyncSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+# Read dependencies: identical to the primary ones when no replicas are configured
+get_read_db = get_replica_read_db if replica_router else get_db
+if replica_router:
+    get_read_session = get_async_replica_read_db if settings.async_database else get_replica_read_db
+else:
+    get_read_session = get_session
+
+
+async def run_db(db: DbSession, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a sync service function against either session type without blocking
+    the event loop. AsyncSession runs it through run_sync on the async driver;
+    a sync Session runs it in the threadpool, as sync routes did.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(lambda session: fn(session, *args, **kwargs))
+    return await run_in_threadpool(fn, db, *args, **kwargs)
@@ -4,12 +4,18 @@ Main entry point for the API server
 """
 
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from .config import get_settings
-from .routers import clients_router, engagements_router
+from .database import replica_router
+from .middleware import CompressionMiddleware
+from .responses import ORJSONResponse
+from .routers import clients_router, engagements_router, events_router, staff_router, analytics_router
+from .services.events import event_broadcaster
+import math
+import time
 
 settings = get_settings()
 
@@ -20,8 +26,10 @@ async def lifespan(app: FastAPI):
     # Startup
     print(f"Starting {settings.app_name} v{settings.app_version}")
     print(f"API Documentation: http://localhost:8000/docs")
+    event_broadcaster.start()
     yield
     # Shutdown
+    event_broadcaster.stop()
     print(f"Shutting down {settings.app_name}")
 
 
@@ -32,6 +40,7 @@ app = FastAPI(
     description="API for CA Office Suite - Client Control & Engagement Management",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -42,11 +51,40 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Browsers only hand ETags to scripts when they are exposed
+    expose_headers=["ETag"],
 )
 
+# Compress JSON bodies above the configured size
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_minimum_size,
+    gzip_level=settings.compression_gzip_level,
+    brotli_quality=settings.compression_brotli_quality,
+)
+
+# Read-your-writes: after a successful write, the client's reads stay on the
+# primary for read_your_writes_seconds so replica lag never hides its own change
+if replica_router:
+    @app.middleware("http")
+    async def mark_recent_write(request: Request, call_next):
+        response = await call_next(request)
+        if request.method in ("POST", "PUT", "PATCH", "DELETE") and response.status_code < 400:
+            response.set_cookie(
+                settings.read_your_writes_cookie,
+                str(time.time()),
+                max_age=math.ceil(settings.read_your_writes_seconds),
+                httponly=True,
+                samesite="lax"
+            )
+        return response
+
 # Include routers
 app.include_router(clients_router, prefix=settings.api_prefix)
 app.include_router(engagements_router, prefix=settings.api_prefix)
+app.include_router(events_router, prefix=settings.api_prefix)
+app.include_router(staff_router, prefix=settings.api_prefix)
+app.include_router(analytics_router, prefix=settings.api_prefix)
 
 
 # ============================================================================
@@ -0,0 +1,142 @@
+"""
+Response Compression
+ASGI middleware that gzip- or brotli-encodes response bodies above a size threshold
+"""
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Optional
+import gzip
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick br or gzip from an Accept-Encoding header, preferring br."""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, *params = [token.strip() for token in part.split(";")]
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(name)
+
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+# Encodings this middleware applies, each tagged onto the ETags it changes
+ETAG_ENCODINGS = ("gzip", "br")
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """
+    ETag of an encoded body: a strong tag gets the encoding as a suffix
+    ('"v"' -> '"v-gzip"'), since every representation needs its own strong
+    validator. Weak tags may be shared and are left as they are.
+    """
+    if etag.startswith('"') and etag.endswith('"'):
+        return f'{etag[:-1]}-{encoding}"'
+    return etag
+
+
+def identity_etag(etag: str) -> str:
+    """Undo encoded_etag, so a validator of any encoding matches the identity one."""
+    for encoding in ETAG_ENCODINGS:
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+
+class CompressionMiddleware:
+    """
+    Compress complete response bodies of at least `minimum_size` bytes.
+
+    Only single-message bodies are compressed. Streaming responses (exports,
+    which gzip themselves, and long-lived event streams) and bodies that
+    already carry a Content-Encoding pass through untouched. A compressed
+    body's ETag gets the encoding as a suffix (see encoded_etag), and a 304
+    answering an If-None-Match with such a tag carries it back.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = choose_encoding(request_headers.get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                # Hold the headers until the body size is known
+                start = message
+                return
+            if start is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=list(start["headers"]))
+            passthrough = (
+                message.get("more_body", False)
+                or "content-encoding" in headers
+                or len(body) < self.minimum_size
+            )
+            if not passthrough:
+                body = self.compress(body, encoding)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+                if "etag" in headers:
+                    headers["ETag"] = encoded_etag(headers["etag"], encoding)
+                message = {**message, "body": body}
+            elif start["status"] == 304 and "etag" in headers:
+                # Revalidating the encoded representation the client holds
+                encoded = encoded_etag(headers["etag"], encoding)
+                tags = [tag.strip().removeprefix("W/") for tag in request_headers.get("if-none-match", "").split(",")]
+                if encoded != headers["etag"] and encoded in tags:
+                    headers["ETag"] = encoded
+                    headers.add_vary_header("Accept-Encoding")
+
+            await send({**start, "headers": headers.raw})
+            start = None
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
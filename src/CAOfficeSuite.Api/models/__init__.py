@@ -2,5 +2,8 @@
 
 from .client import Client
 from .engagement import Engagement
+from .staff import Staff
+from .deletion import Deletion
+from .engagement_summary import EngagementSummary, EngagementClientSummary
 
-__all__ = ["Client", "Engagement"]
+__all__ = ["Client", "Engagement", "Staff", "Deletion", "EngagementSummary", "EngagementClientSummary"]
@@ -3,7 +3,8 @@ Client SQLAlchemy Model
 Represents the clients table in the database
 """
 
-from sqlalchemy import Column, String, DateTime, CheckConstraint
+from sqlalchemy import Column, String, DateTime, CheckConstraint, Computed, Index
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -26,14 +27,35 @@ class Client(Base):
     address = Column(String, nullable=True)
     status = Column(String(20), nullable=False, default='active', index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    # ETags and If-Match compare updated_at exactly; SQLite's CURRENT_TIMESTAMP has
+    # no fractional seconds, so values bound on SQLite are stored the same way
+    updated_at = Column(
+        DateTime(timezone=True).with_variant(sqlite.DATETIME(truncate_microseconds=True), "sqlite"),
+        server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+    
+    # Search column maintained by the database (lowercased name, PAN and email)
+    search_document = Column(
+        String,
+        Computed("lower(name || ' ' || pan || ' ' || coalesce(email, ''))", persisted=True)
+    )
     
     # Relationships
-    engagements = relationship("Engagement", back_populates="client", cascade="all, delete-orphan")
+    # passive_deletes: the FK's ON DELETE CASCADE removes engagements without loading them
+    engagements = relationship("Engagement", back_populates="client", cascade="all, delete-orphan", passive_deletes=True)
     
     # Constraints
     __table_args__ = (
         CheckConstraint("status IN ('active', 'inactive')", name='clients_status_check'),
+        # Trigram index so substring search can use an index (requires pg_trgm)
+        Index(
+            'idx_clients_search_trgm',
+            'search_document',
+            postgresql_using='gin',
+            postgresql_ops={'search_document': 'gin_trgm_ops'}
+        ),
+        # The change feed seeks on (updated_at, id)
+        Index('idx_clients_updated_at', 'updated_at', 'id'),
     )
     
     def __repr__(self):
@@ -0,0 +1,41 @@
+"""
+Deletion SQLAlchemy Model
+Represents the deletions table: tombstones for the change feeds
+"""
+
+from sqlalchemy import Column, String, BigInteger, Integer, DateTime, Index
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from ..database import Base
+
+
+class Deletion(Base):
+    """
+    Tombstone for a deleted client or engagement.
+
+    Rows are hard-deleted, so the change feeds read deletes from here. No
+    foreign keys: the rows they point at no longer exist.
+    """
+    
+    __tablename__ = "deletions"
+    
+    # Columns
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    entity = Column(String(20), nullable=False)  # clients or engagements
+    entity_id = Column(UUID(as_uuid=True), nullable=False)
+    client_id = Column(UUID(as_uuid=True), nullable=True)  # Owning client of a deleted engagement
+    deleted_at = Column(
+        DateTime(timezone=True).with_variant(sqlite.DATETIME(truncate_microseconds=True), "sqlite"),
+        server_default=func.now(), nullable=False
+    )
+    
+    # Constraints
+    __table_args__ = (
+        # The change feeds seek on (deleted_at, id) per entity
+        Index('idx_deletions_entity_deleted_at', 'entity', 'deleted_at', 'id'),
+    )
+    
+    def __repr__(self):
+        return f"<Deletion(entity={self.entity}, entity_id={self.entity_id}, deleted_at={self.deleted_at})>"
@@ -3,7 +3,8 @@ Engagement SQLAlchemy Model
 Represents the engagements table in the database
 """
 
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, UniqueConstraint, Index
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -24,11 +25,19 @@ class Engagement(Base):
     file_number_as_per = Column(String(50), nullable=True)
     type = Column(String(100), nullable=False, index=True)
     type2 = Column(String(100), nullable=True)
+    # Staff names as shown; the ids are what filters and workload queries use
     senior = Column(String(100), nullable=True, index=True)
     assistant = Column(String(100), nullable=True)
+    senior_id = Column(Integer, ForeignKey('staff.id', ondelete='SET NULL'), nullable=True, index=True)
+    assistant_id = Column(Integer, ForeignKey('staff.id', ondelete='SET NULL'), nullable=True, index=True)
     status = Column(String(100), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    # ETags and If-Match compare updated_at exactly; SQLite's CURRENT_TIMESTAMP has
+    # no fractional seconds, so values bound on SQLite are stored the same way
+    updated_at = Column(
+        DateTime(timezone=True).with_variant(sqlite.DATETIME(truncate_microseconds=True), "sqlite"),
+        server_default=func.now(), onupdate=func.now(), nullable=False
+    )
     
     # Relationships
     client = relationship("Client", back_populates="engagements")
@@ -36,6 +45,8 @@ class Engagement(Base):
     # Constraints
     __table_args__ = (
         UniqueConstraint('client_id', 'file_number', name='unique_client_file_number'),
+        # The change feed seeks on (updated_at, id)
+        Index('idx_engagements_updated_at', 'updated_at', 'id'),
     )
     
     def __repr__(self):
@@ -0,0 +1,152 @@
+"""
+Engagement Summary SQLAlchemy Models
+Represents the engagement_summary and engagement_client_summary tables:
+engagement counts per group, kept current by triggers on engagements
+"""
+
+from sqlalchemy import Column, String, Integer, DDL, event, text
+from sqlalchemy.dialects.postgresql import UUID
+
+from ..database import Base
+
+
+class EngagementSummary(Base):
+    """Number of engagements per (status, type, senior)."""
+
+    __tablename__ = "engagement_summary"
+
+    # Columns
+    status = Column(String(100), primary_key=True)
+    type = Column(String(100), primary_key=True)
+    senior = Column(String(100), primary_key=True)  # '' when no senior is assigned
+    engagements = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<EngagementSummary(status={self.status}, type={self.type}, senior={self.senior}, engagements={self.engagements})>"
+
+
+class EngagementClientSummary(Base):
+    """Number of engagements per (client, status)."""
+
+    __tablename__ = "engagement_client_summary"
+
+    # Columns
+    client_id = Column(UUID(as_uuid=True), primary_key=True)
+    status = Column(String(100), primary_key=True)
+    engagements = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<EngagementClientSummary(client_id={self.client_id}, status={self.status}, engagements={self.engagements})>"
+
+
+# ============================================================================
+# Maintenance Triggers
+# ============================================================================
+# Every insert, update and delete on engagements (API writes, bulk upserts,
+# client cascades and direct imports alike) applies its +1/-1 deltas to the
+# summaries in the same transaction. Groups that drop to zero are removed.
+
+# (table, key columns, key expressions over an engagements row)
+_SUMMARIES = (
+    ("engagement_summary", ("status", "type", "senior"), ("status", "type", "coalesce(senior, '')")),
+    ("engagement_client_summary", ("client_id", "status"), ("client_id", "status")),
+)
+
+
+def _pg_apply(sources) -> str:
+    """
+    Set-based delta for PostgreSQL statement triggers: `sources` are
+    (transition table, sign) pairs; one statement per summary whatever
+    the number of rows written.
+    """
+    statements = []
+    for table, keys, expressions in _SUMMARIES:
+        columns = ", ".join(keys)
+        selects = " UNION ALL ".join(
+            f"SELECT {', '.join(f'{e} AS {k}' for k, e in zip(keys, expressions))}, {sign} AS delta FROM {rows}"
+            for rows, sign in sources
+        )
+        # Sorted keys give concurrent writers the same lock order
+        statements.append(
+            f"INSERT INTO {table} AS s ({columns}, engagements) "
+            f"SELECT {columns}, sum(delta) FROM ({selects}) d "
+            f"GROUP BY {columns} HAVING sum(delta) <> 0 ORDER BY {columns} "
+            f"ON CONFLICT ({columns}) DO UPDATE SET engagements = s.engagements + EXCLUDED.engagements;"
+        )
+        if any(sign < 0 for _, sign in sources):
+            statements.append(
+                f"DELETE FROM {table} WHERE engagements <= 0 AND ({columns}) IN "
+                f"(SELECT {', '.join(expressions)} FROM old_rows);"
+            )
+    return "\n    ".join(statements)
+
+
+def _sqlite_apply(sources) -> str:
+    """Row-level delta for SQLite triggers: `sources` are (NEW/OLD, sign) pairs."""
+    statements = []
+    for table, keys, expressions in _SUMMARIES:
+        columns = ", ".join(keys)
+        for row, sign in sources:
+            values = ", ".join(
+                expression.replace(key, f"{row}.{key}", 1) for key, expression in zip(keys, expressions)
+            )
+            statements.append(
+                f"INSERT INTO {table} ({columns}, engagements) VALUES ({values}, {sign}) "
+                f"ON CONFLICT ({columns}) DO UPDATE SET engagements = engagements + excluded.engagements;"
+            )
+        if any(sign < 0 for _, sign in sources):
+            old = " AND ".join(
+                f"{key} = {expression.replace(key, f'OLD.{key}', 1)}" for key, expression in zip(keys, expressions)
+            )
+            statements.append(f"DELETE FROM {table} WHERE engagements <= 0 AND {old};")
+    return "\n    ".join(statements)
+
+
+_PG_TRIGGERS = {
+    # op: (transition tables, delta sources)
+    "INSERT": ("NEW TABLE AS new_rows", (("new_rows", 1),)),
+    "UPDATE": ("OLD TABLE AS old_rows NEW TABLE AS new_rows", (("old_rows", -1), ("new_rows", 1))),
+    "DELETE": ("OLD TABLE AS old_rows", (("old_rows", -1),)),
+}
+
+_SQLITE_TRIGGERS = {
+    "INSERT": ("INSERT", (("NEW", 1),)),
+    "UPDATE": ("UPDATE OF client_id, status, type, senior", (("OLD", -1), ("NEW", 1))),
+    "DELETE": ("DELETE", (("OLD", -1),)),
+}
+
+for _op, (_transitions, _sources) in _PG_TRIGGERS.items():
+    _name = f"engagement_summary_{_op.lower()}"
+    for _statement in (
+        f"CREATE OR REPLACE FUNCTION {_name}() RETURNS TRIGGER AS $$\n"
+        f"BEGIN\n    {_pg_apply(_sources)}\n    RETURN NULL;\nEND;\n$$ LANGUAGE plpgsql",
+        f"DROP TRIGGER IF EXISTS {_name} ON engagements",
+        f"CREATE TRIGGER {_name} AFTER {_op} ON engagements REFERENCING {_transitions} "
+        f"FOR EACH STATEMENT EXECUTE FUNCTION {_name}()",
+    ):
+        event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+
+for _op, (_event, _sources) in _SQLITE_TRIGGERS.items():
+    event.listen(Base.metadata, "after_create", DDL(
+        f"CREATE TRIGGER IF NOT EXISTS engagement_summary_{_op.lower()} AFTER {_event} ON engagements "
+        f"FOR EACH ROW BEGIN\n    {_sqlite_apply(_sources)}\nEND"
+    ).execute_if(dialect="sqlite"))
+
+
+REBUILD_SUMMARIES = (
+    "DELETE FROM engagement_summary",
+    "INSERT INTO engagement_summary (status, type, senior, engagements) "
+    "SELECT status, type, coalesce(senior, ''), count(*) FROM engagements GROUP BY 1, 2, 3",
+    "DELETE FROM engagement_client_summary",
+    "INSERT INTO engagement_client_summary (client_id, status, engagements) "
+    "SELECT client_id, status, count(*) FROM engagements GROUP BY 1, 2",
+)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _populate_new_summaries(target, connection, tables=(), **kw):
+    """Fill summary tables created next to existing engagements (first deploy)."""
+    created = {table.name for table in tables}
+    if created & {"engagement_summary", "engagement_client_summary"} and "engagements" not in created:
+        for statement in REBUILD_SUMMARIES:
+            connection.execute(text(statement))
@@ -0,0 +1,29 @@
+"""
+Staff SQLAlchemy Model
+Represents the staff table: the people engagements are assigned to
+"""
+
+from sqlalchemy import Column, String, Integer, DateTime
+from sqlalchemy.sql import func
+
+from ..database import Base
+
+
+class Staff(Base):
+    """
+    Staff member referenced by engagements as senior or assistant.
+
+    `name_key` is the name with whitespace collapsed and lowercased, so
+    "Ajay ", "ajay" and "Ajay" are one person; `name` is the spelling shown.
+    """
+    
+    __tablename__ = "staff"
+    
+    # Columns
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(100), nullable=False)
+    name_key = Column(String(100), nullable=False, unique=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f"<Staff(id={self.id}, name={self.name})>"
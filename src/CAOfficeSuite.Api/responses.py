@@ -0,0 +1,127 @@
+"""
+Response Layer
+orjson-backed JSON responses, fast serialization of trusted rows, and ETags
+"""
+
+from fastapi.responses import ORJSONResponse as _ORJSONResponse, Response
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Type
+import hashlib
+import orjson
+
+from .middleware import identity_etag
+from .services.versioning import version_of, updated_at_of
+
+
+class ORJSONResponse(_ORJSONResponse):
+    """
+    Default JSON response class.
+
+    orjson serializes UUID and datetime natively; OPT_UTC_Z keeps UTC
+    timestamps as "...Z", matching what Pydantic produced before.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+        )
+
+
+def rows_as_dicts(rows: Iterable[Any], fields: Sequence[str]) -> List[Dict[str, Any]]:
+    """
+    Read `fields` straight off result rows (Core rows or ORM instances).
+
+    Rows loaded from the database were validated when written, so list
+    endpoints skip a Pydantic pass and hand plain dicts to orjson.
+    """
+    return [{field: getattr(row, field) for field in fields} for row in rows]
+
+
+def page_response(page_model: Type[BaseModel], **values: Any) -> ORJSONResponse:
+    """
+    Render a paginated list without validating it against `page_model`.
+
+    Keys follow the model's field order and omitted fields take the model's
+    defaults, so the body matches the documented response_model.
+    """
+    content = {
+        name: values[name] if name in values else field.default
+        for name, field in page_model.model_fields.items()
+    }
+    return ORJSONResponse(content)
+
+
+# ============================================================================
+# ETags and Conditional Requests
+# ============================================================================
+
+def row_etag(updated_at: datetime, fields: Optional[Sequence[str]] = None) -> str:
+    """
+    Strong ETag for one row: its version (updated_at in microseconds), plus a
+    digest of the field selection for sparse representations.
+    """
+    etag = str(version_of(updated_at))
+    if fields:
+        etag += "-" + hashlib.blake2b(",".join(fields).encode(), digest_size=4).hexdigest()
+    return f'"{etag}"'
+
+
+def page_etag(*parts: Any) -> str:
+    """Strong ETag for a list page from its parameters, totals and row versions."""
+    digest = hashlib.blake2b(
+        orjson.dumps(parts, option=orjson.OPT_NON_STR_KEYS, default=str), digest_size=16
+    )
+    return f'"p-{digest.hexdigest()}"'
+
+
+def _etags(header: str) -> List[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match check (weak comparison, so W/ prefixes are ignored). Tags
+    of gzip or br bodies, which CompressionMiddleware suffixes, match too.
+    """
+    if not if_none_match:
+        return False
+    tags = _etags(if_none_match)
+    return "*" in tags or etag in [identity_etag(tag.removeprefix("W/")) for tag in tags]
+
+
+def if_match_versions(if_match: Optional[str]) -> Optional[List[datetime]]:
+    """
+    updated_at values accepted by an If-Match header.
+
+    Returns None when there is no precondition (no header, or "*"), and an
+    empty list when no tag can match (weak or foreign tags). If-Match uses
+    strong comparison, so weak tags never match.
+    """
+    if not if_match:
+        return None
+    tags = _etags(if_match)
+    if "*" in tags:
+        return None
+
+    versions = []
+    for tag in tags:
+        if tag.startswith('"') and tag.endswith('"'):
+            version = tag[1:-1].split("-", 1)[0]
+            if version.isdigit():
+                versions.append(updated_at_of(int(version)))
+    return versions
+
+
+def not_modified(etag: str) -> Response:
+    """304 response carrying the current ETag."""
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+def cached_response(cached: tuple, if_none_match: Optional[str]) -> Response:
+    """Serve a (body, etag) pair from the response cache, or 304 if unchanged."""
+    body, etag = cached
+    if etag and etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return Response(body, media_type="application/json", headers={"ETag": etag} if etag else None)
@@ -2,5 +2,8 @@
 
 from .clients import router as clients_router
 from .engagements import router as engagements_router
+from .events import router as events_router
+from .staff import router as staff_router
+from .analytics import router as analytics_router
 
-__all__ = ["clients_router", "engagements_router"]
+__all__ = ["clients_router", "engagements_router", "events_router", "staff_router", "analytics_router"]
@@ -0,0 +1,87 @@
+"""
+Analytics API Router
+Dashboard aggregates over clients and engagements
+"""
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from typing import Optional
+from uuid import UUID
+
+from ..database import get_read_session, DbSession
+from ..services.async_services import AsyncAnalyticsService
+from ..services.cache import response_cache
+from ..schemas.analytics import EngagementSummaryResponse
+from ..responses import page_response, page_etag, etag_matches, not_modified, cached_response
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+
+@router.get("/engagements/summary", response_model=EngagementSummaryResponse)
+async def get_engagement_summary(
+    group_by: str = Query("status,type,senior", description="Comma-separated: status, type, senior, client_id"),
+    client_id: Optional[UUID] = Query(None, description="Only this client's engagements"),
+    status: Optional[str] = Query(None, description="Only engagements with this status"),
+    type: Optional[str] = Query(None, description="Only engagements of this type"),
+    senior: Optional[str] = Query(None, description="Only engagements of this senior (exact match)"),
+    limit: Optional[int] = Query(None, ge=1, le=10000, description="Maximum number of groups"),
+    if_none_match: Optional[str] = Header(None),
+    db: DbSession = Depends(get_read_session)
+):
+    """
+    Get engagement counts grouped by status, type, senior and/or client.
+
+    Query Parameters:
+    - **group_by**: Dimensions to group by (default: status,type,senior)
+    - **client_id**, **status**, **type**, **senior**: Only count matching engagements
+    - **limit**: Return only the largest groups
+
+    Counts come from summary tables the database keeps current on every
+    engagement write, so the response time does not grow with the number of
+    engagements. Per-client counts are kept by status only: client_id cannot
+    be combined with type or senior. Groups are ordered largest first.
+    """
+    dimensions = tuple(part.strip() for part in group_by.split(",") if part.strip())
+
+    cache_key = response_cache.key(
+        "engagements", "summary", group_by=dimensions, client_id=client_id,
+        status=status, type=type, senior=senior, limit=limit
+    )
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached_response(cached, if_none_match)
+    generation = response_cache.generation("engagements")
+
+    try:
+        groups, total = await AsyncAnalyticsService.get_engagement_summary(
+            db,
+            group_by=dimensions,
+            client_id=client_id,
+            status=status,
+            type=type,
+            senior=senior,
+            limit=limit
+        )
+    except ValueError as e:
+        # The `status` query parameter shadows fastapi.status in this handler
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        )
+
+    etag = page_etag(cache_key, total, [tuple(group.values()) for group in groups])
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    response = page_response(
+        EngagementSummaryResponse,
+        group_by=list(dimensions),
+        total=total,
+        groups=groups
+    )
+    response.headers["ETag"] = etag
+    response_cache.set(
+        cache_key, response.body, generation, "engagements",
+        filters={"client_id": client_id, "status": status, "type": type, "senior": senior},
+        etag=etag
+    )
+    return response
@@ -3,81 +3,287 @@ Client API Router
 Endpoints for client CRUD operations
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Optional, List, Any, Tuple
 from uuid import UUID
-import math
 
-from ..database import get_db
-from ..services.client_service import ClientService
+from ..database import get_db, get_read_db, get_session, get_read_session, DbSession
+from ..services.client_service import ClientService, CLIENT_READ_FIELDS
+from ..services.engagement_service import ENGAGEMENT_READ_FIELDS
+from ..services.async_services import AsyncClientService
+from ..services.cache import response_cache
 from ..schemas.client import (
     ClientCreate,
+    ClientBulkItem,
     ClientUpdate,
     ClientRead,
+    ClientTombstone,
+    ClientChanges,
     PaginatedClients
 )
 from ..schemas.engagement import EngagementRead, PaginatedEngagements
+from ..schemas.bulk import BulkUpsertResponse
+from ..schemas.sparse import sparse_model
+from ..responses import (
+    ORJSONResponse,
+    rows_as_dicts,
+    page_response,
+    row_etag,
+    page_etag,
+    etag_matches,
+    if_match_versions,
+    not_modified,
+    cached_response
+)
+from ..services.versioning import StaleWriteError
+from ..services.bulk import validate_records, build_bulk_response
+from ..services.export import EXPORT_FORMATS, stream_export
+from .dependencies import bulk_records, selected_fields
+from ..services.pagination import total_pages_for
 from ..config import get_settings
 
 router = APIRouter(prefix="/clients", tags=["clients"])
 settings = get_settings()
 
+# Optional extras accepted by the include query parameter
+CLIENT_INCLUDES = {"engagement_count"}
+
 
 @router.get("", response_model=PaginatedClients)
-def list_clients(
+async def list_clients(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size, description="Items per page"),
     search: Optional[str] = Query(None, description="Search in name, PAN, or email"),
     status: Optional[str] = Query(None, description="Filter by status (active/inactive)"),
-    sort_by: str = Query("name", description="Sort by field"),
+    sort_by: str = Query("name", description="Sort by field, or 'relevance' when searching"),
     sort_order: str = Query("asc", pattern="^(asc|desc)$", description="Sort order"),
-    db: Session = Depends(get_db)
+    pagination: str = Query("offset", pattern="^(offset|cursor)$", description="Pagination mode"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$", description="Total count mode"),
+    include: Optional[str] = Query(None, description="Comma-separated extras: engagement_count"),
+    fields: Optional[Tuple[str, ...]] = Depends(selected_fields(CLIENT_READ_FIELDS)),
+    if_none_match: Optional[str] = Header(None),
+    db: DbSession = Depends(get_read_session)
 ):
     """
     Get paginated list of clients with optional filtering and sorting.
     
     Query Parameters:
-    - **page**: Page number (default: 1)
+    - **page**: Page number (default: 1, ignored in cursor mode)
     - **page_size**: Items per page (default: 50, max: 100)
     - **search**: Search text for name, PAN, or email
     - **status**: Filter by status (active/inactive)
-    - **sort_by**: Field to sort by (default: name)
+    - **sort_by**: Field to sort by, or relevance to rank search matches (default: name)
     - **sort_order**: Sort order - asc or desc (default: asc)
+    - **pagination**: offset or cursor (default: offset; implied cursor when a cursor is given)
+    - **cursor**: Opaque cursor returned as next_cursor by the previous page
+    - **count**: exact, estimated (cached or planner estimate) or none (default: exact)
+    - **include**: engagement_count adds each client's engagement count (one grouped query per page)
+    - **fields**: Comma-separated columns to select and return, e.g. name,pan,status (id is always included)
+    
+    The page carries an ETag; a matching If-None-Match gets 304 Not Modified.
     """
-    clients, total = ClientService.get_clients(
-        db=db,
-        page=page,
-        page_size=page_size,
-        search=search,
-        status=status,
-        sort_by=sort_by,
-        sort_order=sort_order
+    includes = {part.strip() for part in include.split(",") if part.strip()} if include else set()
+    unknown = includes - CLIENT_INCLUDES
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown include: {', '.join(sorted(unknown))}"
+        )
+    
+    cache_key = response_cache.key(
+        "clients", "list", page=page, page_size=page_size, search=search, status=status,
+        sort_by=sort_by, sort_order=sort_order, pagination=pagination, cursor=cursor,
+        count=count, include=sorted(includes), fields=fields
     )
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached_response(cached, if_none_match)
+    
+    # Engagement counts go stale when engagements of the listed clients change
+    depends = {"engagements": "client_id"} if "engagement_count" in includes else {}
+    generation = response_cache.generation("clients", *depends)
+    
+    next_cursor = None
+    try:
+        if pagination == "cursor" or cursor:
+            clients, total, next_cursor = await AsyncClientService.get_clients_keyset(
+                db=db,
+                page_size=page_size,
+                cursor=cursor,
+                search=search,
+                status=status,
+                sort_by=sort_by,
+                sort_order=sort_order,
+                count_mode=count,
+                fields=fields
+            )
+        else:
+            clients, total = await AsyncClientService.get_clients(
+                db=db,
+                page=page,
+                page_size=page_size,
+                search=search,
+                status=status,
+                sort_by=sort_by,
+                sort_order=sort_order,
+                count_mode=count,
+                fields=fields
+            )
+    except ValueError as e:
+        # The `status` query parameter shadows fastapi.status in this handler
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        )
+    
+    counts = {}
+    if "engagement_count" in includes:
+        counts = await AsyncClientService.get_engagement_counts(db, [c.id for c in clients])
+    
+    # Versions of the rows on the page, so any change to them changes the ETag
+    etag = page_etag(cache_key, total, next_cursor, counts, [(c.id, c.updated_at) for c in clients])
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
     
-    total_pages = math.ceil(total / page_size) if total > 0 else 0
+    items = rows_as_dicts(clients, fields or CLIENT_READ_FIELDS)
+    if "engagement_count" in includes:
+        for item in items:
+            item["engagement_count"] = counts.get(item["id"], 0)
     
-    return PaginatedClients(
-        items=clients,
+    total_pages = total_pages_for(total, page_size)
+    
+    response = page_response(
+        PaginatedClients,
+        items=items,
         total=total,
         page=page,
         page_size=page_size,
-        total_pages=total_pages
+        total_pages=total_pages,
+        next_cursor=next_cursor,
+        count_mode=count
+    )
+    response.headers["ETag"] = etag
+    response_cache.set(
+        cache_key, response.body, generation, "clients",
+        filters={"search": search, "status": status},
+        ids=[item["id"] for item in items] if depends else (),
+        depends=depends,
+        etag=etag
+    )
+    return response
+
+
+@router.get("/changes", response_model=ClientChanges)
+async def get_client_changes(
+    updated_since: Optional[str] = Query(None, description="Watermark from a previous response, or an ISO-8601 timestamp"),
+    limit: int = Query(settings.change_feed_page_size, ge=1, le=settings.change_feed_max_page_size, description="Maximum rows and tombstones per response"),
+    db: DbSession = Depends(get_read_session)
+):
+    """
+    Get clients created, updated or deleted since a watermark.
+    
+    Query Parameters:
+    - **updated_since**: watermark returned by the previous call, or an
+      ISO-8601 timestamp to start from (omit to start from the beginning)
+    - **limit**: Maximum rows and tombstones per response (default: 500)
+    
+    Keep a local copy in sync by applying `items` and `deleted`, then calling
+    again with `watermark` (immediately while `has_more` is true). Changes
+    from the last few seconds are held back until they are settled.
+    """
+    try:
+        clients, deleted, watermark, has_more = await AsyncClientService.get_changes(
+            db, updated_since, limit, settings.change_feed_lag_seconds
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return page_response(
+        ClientChanges,
+        items=rows_as_dicts(clients, CLIENT_READ_FIELDS),
+        deleted=rows_as_dicts(deleted, list(ClientTombstone.model_fields)),
+        watermark=watermark,
+        has_more=has_more
+    )
+
+
+@router.get("/export")
+def export_clients(
+    search: Optional[str] = Query(None, description="Search in name, PAN, or email"),
+    status: Optional[str] = Query(None, description="Filter by status (active/inactive)"),
+    sort_by: str = Query("name", description="Sort by field"),
+    sort_order: str = Query("asc", pattern="^(asc|desc)$", description="Sort order"),
+    format: str = Query("csv", pattern="^(csv|ndjson)$", description="Export format"),
+    gzip: bool = Query(False, description="Gzip the export"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Stream every client matching the filters as CSV or NDJSON.
+    
+    Query Parameters:
+    - **search**, **status**, **sort_by**, **sort_order**: Same as the client list
+    - **format**: csv or ndjson (default: csv)
+    - **gzip**: Return a gzip-compressed file (default: false)
+    
+    Rows are read through a server-side cursor in batches, so memory use does
+    not grow with the number of matching clients.
+    """
+    # A dedicated session outlives this handler while the response streams
+    export_db = Session(bind=db.get_bind())
+    try:
+        query = ClientService.get_export_query(export_db, search, status, sort_by, sort_order)
+    except ValueError as e:
+        export_db.close()
+        # The `status` query parameter shadows fastapi.status in this handler
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    media_type, extension = EXPORT_FORMATS[format]
+    filename = f"clients.{extension}"
+    if gzip:
+        media_type, filename = "application/gzip", f"{filename}.gz"
+    
+    return StreamingResponse(
+        stream_export(
+            query, list(ClientRead.model_fields), format,
+            compress=gzip, batch_size=settings.export_batch_size
+        ),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
     )
 
 
 @router.get("/{client_id}", response_model=ClientRead)
-def get_client(
+async def get_client(
     client_id: UUID,
-    db: Session = Depends(get_db)
+    fields: Optional[Tuple[str, ...]] = Depends(selected_fields(CLIENT_READ_FIELDS)),
+    if_none_match: Optional[str] = Header(None),
+    db: DbSession = Depends(get_read_session)
 ):
     """
     Get a single client by ID.
     
     Path Parameters:
     - **client_id**: UUID of the client
+    
+    Query Parameters:
+    - **fields**: Comma-separated columns to select and return (id is always included)
+    
+    The ETag is the client's version; send it back as If-None-Match for a
+    304, or as If-Match on PUT to avoid overwriting someone else's change.
     """
-    client = ClientService.get_client_by_id(db, client_id)
+    cache_key = response_cache.key("clients", "detail", id=client_id, fields=fields)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached_response(cached, if_none_match)
+    generation = response_cache.generation("clients")
+    
+    client = await AsyncClientService.get_client_by_id(db, client_id, fields)
     
     if not client:
         raise HTTPException(
@@ -85,13 +291,23 @@ def get_client(
             detail=f"Client with id {client_id} not found"
         )
     
-    return client
+    etag = row_etag(client.updated_at, fields)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
+    # Sparse requests are validated against the slimmed model instead of ClientRead
+    model = sparse_model(ClientRead, fields) if fields else ClientRead
+    response = ORJSONResponse(model.model_validate(client).model_dump(), headers={"ETag": etag})
+    response_cache.set(
+        cache_key, response.body, generation, "clients", filters={"id": client_id}, etag=etag
+    )
+    return response
 
 
 @router.post("", response_model=ClientRead, status_code=status.HTTP_201_CREATED)
-def create_client(
+async def create_client(
     client_data: ClientCreate,
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_session)
 ):
     """
     Create a new client.
@@ -105,7 +321,7 @@ def create_client(
     - **status**: Client status - active or inactive (default: active)
     """
     try:
-        client = ClientService.create_client(db, client_data)
+        client = await AsyncClientService.create_client(db, client_data)
         return client
     except Exception as e:
         raise HTTPException(
@@ -114,11 +330,47 @@ def create_client(
         )
 
 
+@router.post("/bulk", response_model=BulkUpsertResponse)
+def bulk_upsert_clients(
+    records: List[Any] = Depends(bulk_records),
+    db: Session = Depends(get_db)
+):
+    """
+    Create or update many clients in one request.
+    
+    Request Body: JSON array, or NDJSON with Content-Type application/x-ndjson
+    - Each record takes the same fields as POST /clients
+    - **id**: Existing client UUID to update (optional; omit to create)
+    
+    All records are validated first. Invalid records are reported and skipped,
+    and valid ones are written with one multi-row upsert per chunk in a single
+    transaction.
+    """
+    valid, errors = validate_records(records, ClientBulkItem, key=lambda item: item.id)
+    
+    written = {}
+    if valid:
+        try:
+            rows = ClientService.bulk_upsert_clients(
+                db, [item for _, item in valid], chunk_size=settings.bulk_chunk_size
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Failed to upsert clients: {str(e)}"
+            )
+        written = {index: row for (index, _), row in zip(valid, rows)}
+    
+    return build_bulk_response(len(records), errors, written)
+
+
 @router.put("/{client_id}", response_model=ClientRead)
-def update_client(
+async def update_client(
     client_id: UUID,
     client_data: ClientUpdate,
-    db: Session = Depends(get_db)
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: DbSession = Depends(get_session)
 ):
     """
     Update an existing client.
@@ -133,8 +385,20 @@ def update_client(
     - **phone**: Client phone number
     - **address**: Client address
     - **status**: Client status - active or inactive
+    
+    Headers:
+    - **If-Match**: ETag from a previous read; the update is refused with
+      412 Precondition Failed if the client has changed since
     """
-    client = ClientService.update_client(db, client_id, client_data)
+    try:
+        client = await AsyncClientService.update_client(
+            db, client_id, client_data, expected_updated_at=if_match_versions(if_match)
+        )
+    except StaleWriteError:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=f"Client with id {client_id} was modified; fetch it again and retry"
+        )
     
     if not client:
         raise HTTPException(
@@ -142,13 +406,14 @@ def update_client(
             detail=f"Client with id {client_id} not found"
         )
     
+    response.headers["ETag"] = row_etag(client.updated_at)
     return client
 
 
 @router.delete("/{client_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_client(
+async def delete_client(
     client_id: UUID,
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_session)
 ):
     """
     Delete a client (cascades to engagements).
@@ -156,7 +421,7 @@ def delete_client(
     Path Parameters:
     - **client_id**: UUID of the client
     """
-    success = ClientService.delete_client(db, client_id)
+    success = await AsyncClientService.delete_client(db, client_id)
     
     if not success:
         raise HTTPException(
@@ -168,11 +433,13 @@ def delete_client(
 
 
 @router.get("/{client_id}/engagements", response_model=PaginatedEngagements)
-def get_client_engagements(
+async def get_client_engagements(
     client_id: UUID,
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size, description="Items per page"),
-    db: Session = Depends(get_db)
+    count: str = Query("exact", pattern="^(exact|estimated|none)$", description="Total count mode"),
+    if_none_match: Optional[str] = Header(None),
+    db: DbSession = Depends(get_read_session)
 ):
     """
     Get all engagements for a specific client.
@@ -183,28 +450,50 @@ def get_client_engagements(
     Query Parameters:
     - **page**: Page number (default: 1)
     - **page_size**: Items per page (default: 50, max: 100)
+    - **count**: exact, estimated (cached or planner estimate) or none (default: exact)
     """
-    # Check if client exists
-    client = ClientService.get_client_by_id(db, client_id)
+    cache_key = response_cache.key(
+        "engagements", "client", client_id=client_id, page=page, page_size=page_size, count=count
+    )
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached_response(cached, if_none_match)
+    generation = response_cache.generation("engagements")
+    
+    # Check if client exists (selecting only its id)
+    client = await AsyncClientService.get_client_by_id(db, client_id, ("id",))
     if not client:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Client with id {client_id} not found"
         )
     
-    engagements, total = ClientService.get_client_engagements(
+    engagements, total = await AsyncClientService.get_client_engagements(
         db=db,
         client_id=client_id,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        count_mode=count
     )
     
-    total_pages = math.ceil(total / page_size) if total > 0 else 0
+    etag = page_etag(cache_key, total, [(e.id, e.updated_at) for e in engagements])
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
     
-    return PaginatedEngagements(
-        items=engagements,
+    total_pages = total_pages_for(total, page_size)
+    
+    response = page_response(
+        PaginatedEngagements,
+        items=rows_as_dicts(engagements, ENGAGEMENT_READ_FIELDS),
         total=total,
         page=page,
         page_size=page_size,
-        total_pages=total_pages
+        total_pages=total_pages,
+        count_mode=count
+    )
+    response.headers["ETag"] = etag
+    response_cache.set(
+        cache_key, response.body, generation, "engagements", filters={"client_id": client_id},
+        etag=etag
     )
+    return response
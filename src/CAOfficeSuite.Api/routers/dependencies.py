@@ -0,0 +1,50 @@
+"""
+Shared Router Dependencies
+Request parsing dependencies used by more than one router
+"""
+
+from fastapi import HTTPException, Query, Request, status
+from typing import Any, List, Optional, Sequence, Tuple
+
+from ..services.bulk import parse_bulk_body
+from ..services.fields import parse_fields
+from ..config import get_settings
+
+settings = get_settings()
+
+
+async def bulk_records(request: Request) -> List[Any]:
+    """Dependency that reads a JSON array or NDJSON bulk request body."""
+    body = await request.body()
+    try:
+        records = parse_bulk_body(body, request.headers.get("content-type", ""))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    if len(records) > settings.bulk_max_records:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Bulk requests accept at most {settings.bulk_max_records} records"
+        )
+    
+    return records
+
+
+def selected_fields(allowed: Sequence[str]):
+    """Dependency factory for the fields query parameter (sparse fieldsets)."""
+    def dependency(
+        fields: Optional[str] = Query(
+            None, description=f"Comma-separated fields to return: {', '.join(allowed)}"
+        )
+    ) -> Optional[Tuple[str, ...]]:
+        try:
+            return parse_fields(fields, allowed)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+    return dependency
@@ -3,20 +3,44 @@ Engagement API Router
 Endpoints for engagement CRUD operations
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Optional, List, Any, Tuple
 from uuid import UUID
-import math
 
-from ..database import get_db
-from ..services.engagement_service import EngagementService
+from ..database import get_db, get_read_db, get_session, get_read_session, DbSession
+from ..services.engagement_service import EngagementService, ENGAGEMENT_READ_FIELDS
+from ..services.async_services import AsyncEngagementService
+from ..services.cache import response_cache
 from ..schemas.engagement import (
     EngagementCreate,
     EngagementUpdate,
+    EngagementBulkStatusUpdate,
     EngagementRead,
+    EngagementBulkStatusResult,
+    EngagementTombstone,
+    EngagementChanges,
     PaginatedEngagements
 )
+from ..schemas.bulk import BulkUpsertResponse
+from ..schemas.sparse import sparse_model
+from ..responses import (
+    ORJSONResponse,
+    rows_as_dicts,
+    page_response,
+    row_etag,
+    page_etag,
+    etag_matches,
+    if_match_versions,
+    not_modified,
+    cached_response
+)
+from ..services.versioning import StaleWriteError
+from ..services.bulk import validate_records, build_bulk_response
+from ..services.export import EXPORT_FORMATS, stream_export
+from .dependencies import bulk_records, selected_fields
+from ..services.pagination import total_pages_for
 from ..config import get_settings
 
 router = APIRouter(prefix="/engagements", tags=["engagements"])
@@ -24,65 +48,241 @@ settings = get_settings()
 
 
 @router.get("", response_model=PaginatedEngagements)
-def list_engagements(
+async def list_engagements(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size, description="Items per page"),
     client_id: Optional[UUID] = Query(None, description="Filter by client ID"),
     status: Optional[str] = Query(None, description="Filter by status"),
     type: Optional[str] = Query(None, description="Filter by engagement type"),
     senior: Optional[str] = Query(None, description="Filter by senior staff name"),
+    senior_id: Optional[int] = Query(None, description="Filter by senior staff ID"),
+    assistant_id: Optional[int] = Query(None, description="Filter by assistant staff ID"),
     sort_by: str = Query("file_number", description="Sort by field"),
     sort_order: str = Query("asc", pattern="^(asc|desc)$", description="Sort order"),
-    db: Session = Depends(get_db)
+    pagination: str = Query("offset", pattern="^(offset|cursor)$", description="Pagination mode"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$", description="Total count mode"),
+    fields: Optional[Tuple[str, ...]] = Depends(selected_fields(ENGAGEMENT_READ_FIELDS)),
+    if_none_match: Optional[str] = Header(None),
+    db: DbSession = Depends(get_read_session)
 ):
     """
     Get paginated list of engagements with optional filtering and sorting.
     
     Query Parameters:
-    - **page**: Page number (default: 1)
+    - **page**: Page number (default: 1, ignored in cursor mode)
     - **page_size**: Items per page (default: 50, max: 100)
     - **client_id**: Filter by client UUID
     - **status**: Filter by engagement status
     - **type**: Filter by engagement type
     - **senior**: Filter by senior staff name (partial match)
+    - **senior_id**, **assistant_id**: Filter by staff ID (exact, indexed; see GET /staff)
     - **sort_by**: Field to sort by (default: file_number)
     - **sort_order**: Sort order - asc or desc (default: asc)
+    - **pagination**: offset or cursor (default: offset; implied cursor when a cursor is given)
+    - **cursor**: Opaque cursor returned as next_cursor by the previous page
+    - **count**: exact, estimated (cached or planner estimate) or none (default: exact)
+    - **fields**: Comma-separated columns to select and return, e.g. file_number,type,status (id is always included)
+    
+    The page carries an ETag; a matching If-None-Match gets 304 Not Modified.
     """
-    engagements, total = EngagementService.get_engagements(
-        db=db,
-        page=page,
-        page_size=page_size,
-        client_id=client_id,
-        status=status,
-        type=type,
-        senior=senior,
-        sort_by=sort_by,
-        sort_order=sort_order
+    cache_key = response_cache.key(
+        "engagements", "list", page=page, page_size=page_size, client_id=client_id,
+        status=status, type=type, senior=senior, senior_id=senior_id, assistant_id=assistant_id,
+        sort_by=sort_by, sort_order=sort_order,
+        pagination=pagination, cursor=cursor, count=count, fields=fields
     )
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached_response(cached, if_none_match)
+    generation = response_cache.generation("engagements")
+    
+    next_cursor = None
+    try:
+        if pagination == "cursor" or cursor:
+            engagements, total, next_cursor = await AsyncEngagementService.get_engagements_keyset(
+                db=db,
+                page_size=page_size,
+                cursor=cursor,
+                client_id=client_id,
+                status=status,
+                type=type,
+                senior=senior,
+                senior_id=senior_id,
+                assistant_id=assistant_id,
+                sort_by=sort_by,
+                sort_order=sort_order,
+                count_mode=count,
+                fields=fields
+            )
+        else:
+            engagements, total = await AsyncEngagementService.get_engagements(
+                db=db,
+                page=page,
+                page_size=page_size,
+                client_id=client_id,
+                status=status,
+                type=type,
+                senior=senior,
+                senior_id=senior_id,
+                assistant_id=assistant_id,
+                sort_by=sort_by,
+                sort_order=sort_order,
+                count_mode=count,
+                fields=fields
+            )
+    except ValueError as e:
+        # The `status` query parameter shadows fastapi.status in this handler
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        )
     
-    total_pages = math.ceil(total / page_size) if total > 0 else 0
+    # Versions of the rows on the page, so any change to them changes the ETag
+    etag = page_etag(cache_key, total, next_cursor, [(e.id, e.updated_at) for e in engagements])
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
     
-    return PaginatedEngagements(
-        items=engagements,
+    total_pages = total_pages_for(total, page_size)
+    
+    response = page_response(
+        PaginatedEngagements,
+        items=rows_as_dicts(engagements, fields or ENGAGEMENT_READ_FIELDS),
         total=total,
         page=page,
         page_size=page_size,
-        total_pages=total_pages
+        total_pages=total_pages,
+        next_cursor=next_cursor,
+        count_mode=count
+    )
+    response.headers["ETag"] = etag
+    response_cache.set(
+        cache_key, response.body, generation, "engagements",
+        filters={
+            "client_id": client_id, "status": status, "type": type, "senior": senior,
+            "senior_id": senior_id, "assistant_id": assistant_id
+        },
+        etag=etag
+    )
+    return response
+
+
+@router.get("/changes", response_model=EngagementChanges)
+async def get_engagement_changes(
+    updated_since: Optional[str] = Query(None, description="Watermark from a previous response, or an ISO-8601 timestamp"),
+    client_id: Optional[UUID] = Query(None, description="Only changes to this client's engagements"),
+    limit: int = Query(settings.change_feed_page_size, ge=1, le=settings.change_feed_max_page_size, description="Maximum rows and tombstones per response"),
+    db: DbSession = Depends(get_read_session)
+):
+    """
+    Get engagements created, updated or deleted since a watermark.
+    
+    Query Parameters:
+    - **updated_since**: watermark returned by the previous call, or an
+      ISO-8601 timestamp to start from (omit to start from the beginning)
+    - **client_id**: Only changes to this client's engagements
+    - **limit**: Maximum rows and tombstones per response (default: 500)
+    
+    Engagements removed together with their client are reported in `deleted`.
+    Call again with `watermark` (immediately while `has_more` is true).
+    """
+    try:
+        engagements, deleted, watermark, has_more = await AsyncEngagementService.get_changes(
+            db, updated_since, limit, settings.change_feed_lag_seconds, client_id=client_id
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return page_response(
+        EngagementChanges,
+        items=rows_as_dicts(engagements, ENGAGEMENT_READ_FIELDS),
+        deleted=rows_as_dicts(deleted, list(EngagementTombstone.model_fields)),
+        watermark=watermark,
+        has_more=has_more
+    )
+
+
+@router.get("/export")
+def export_engagements(
+    client_id: Optional[UUID] = Query(None, description="Filter by client ID"),
+    status: Optional[str] = Query(None, description="Filter by status"),
+    type: Optional[str] = Query(None, description="Filter by engagement type"),
+    senior: Optional[str] = Query(None, description="Filter by senior staff name"),
+    senior_id: Optional[int] = Query(None, description="Filter by senior staff ID"),
+    assistant_id: Optional[int] = Query(None, description="Filter by assistant staff ID"),
+    sort_by: str = Query("file_number", description="Sort by field"),
+    sort_order: str = Query("asc", pattern="^(asc|desc)$", description="Sort order"),
+    format: str = Query("csv", pattern="^(csv|ndjson)$", description="Export format"),
+    gzip: bool = Query(False, description="Gzip the export"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Stream every engagement matching the filters as CSV or NDJSON.
+    
+    Query Parameters:
+    - **client_id**, **status**, **type**, **senior**, **senior_id**, **assistant_id**,
+      **sort_by**, **sort_order**: Same as the engagement list
+    - **format**: csv or ndjson (default: csv)
+    - **gzip**: Return a gzip-compressed file (default: false)
+    
+    Rows are read through a server-side cursor in batches, so memory use does
+    not grow with the number of matching engagements.
+    """
+    # A dedicated session outlives this handler while the response streams
+    export_db = Session(bind=db.get_bind())
+    try:
+        query = EngagementService.get_export_query(
+            export_db, client_id, status, type, senior, senior_id, assistant_id, sort_by, sort_order
+        )
+    except ValueError as e:
+        export_db.close()
+        # The `status` query parameter shadows fastapi.status in this handler
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    media_type, extension = EXPORT_FORMATS[format]
+    filename = f"engagements.{extension}"
+    if gzip:
+        media_type, filename = "application/gzip", f"{filename}.gz"
+    
+    return StreamingResponse(
+        stream_export(
+            query, list(EngagementRead.model_fields), format,
+            compress=gzip, batch_size=settings.export_batch_size
+        ),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
     )
 
 
 @router.get("/{engagement_id}", response_model=EngagementRead)
-def get_engagement(
+async def get_engagement(
     engagement_id: UUID,
-    db: Session = Depends(get_db)
+    fields: Optional[Tuple[str, ...]] = Depends(selected_fields(ENGAGEMENT_READ_FIELDS)),
+    if_none_match: Optional[str] = Header(None),
+    db: DbSession = Depends(get_read_session)
 ):
     """
     Get a single engagement by ID.
     
     Path Parameters:
     - **engagement_id**: UUID of the engagement
+    
+    Query Parameters:
+    - **fields**: Comma-separated columns to select and return (id is always included)
+    
+    The ETag is the engagement's version; send it back as If-None-Match for
+    a 304, or as If-Match on PUT to avoid overwriting someone else's change.
     """
-    engagement = EngagementService.get_engagement_by_id(db, engagement_id)
+    cache_key = response_cache.key("engagements", "detail", id=engagement_id, fields=fields)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached_response(cached, if_none_match)
+    generation = response_cache.generation("engagements")
+    
+    engagement = await AsyncEngagementService.get_engagement_by_id(db, engagement_id, fields)
     
     if not engagement:
         raise HTTPException(
@@ -90,13 +290,23 @@ def get_engagement(
             detail=f"Engagement with id {engagement_id} not found"
         )
     
-    return engagement
+    etag = row_etag(engagement.updated_at, fields)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
+    # Sparse requests are validated against the slimmed model instead of EngagementRead
+    model = sparse_model(EngagementRead, fields) if fields else EngagementRead
+    response = ORJSONResponse(model.model_validate(engagement).model_dump(), headers={"ETag": etag})
+    response_cache.set(
+        cache_key, response.body, generation, "engagements", filters={"id": engagement_id}, etag=etag
+    )
+    return response
 
 
 @router.post("", response_model=EngagementRead, status_code=status.HTTP_201_CREATED)
-def create_engagement(
+async def create_engagement(
     engagement_data: EngagementCreate,
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_session)
 ):
     """
     Create a new engagement.
@@ -110,9 +320,12 @@ def create_engagement(
     - **senior**: Senior staff assigned (optional)
     - **assistant**: Assistant staff assigned (optional)
     - **status**: Engagement status (required)
+    
+    Staff names are matched to staff members ignoring case and extra spaces
+    (new names add a member); the response carries their senior_id and assistant_id.
     """
     try:
-        engagement = EngagementService.create_engagement(db, engagement_data)
+        engagement = await AsyncEngagementService.create_engagement(db, engagement_data)
         return engagement
     except Exception as e:
         raise HTTPException(
@@ -121,11 +334,94 @@ def create_engagement(
         )
 
 
+@router.post("/bulk", response_model=BulkUpsertResponse)
+def bulk_upsert_engagements(
+    records: List[Any] = Depends(bulk_records),
+    db: Session = Depends(get_db)
+):
+    """
+    Create or update many engagements in one request.
+    
+    Request Body: JSON array, or NDJSON with Content-Type application/x-ndjson
+    - Each record takes the same fields as POST /engagements
+    - Records matching an existing (client_id, file_number) update that engagement
+    
+    All records are validated first, including that their client exists.
+    Invalid records are reported and skipped, and valid ones are written with one
+    multi-row upsert per chunk in a single transaction.
+    """
+    valid, errors = validate_records(
+        records, EngagementCreate, key=lambda item: (item.client_id, item.file_number)
+    )
+    
+    known_clients = EngagementService.get_existing_client_ids(db, {item.client_id for _, item in valid})
+    for index, item in valid:
+        if item.client_id not in known_clients:
+            errors[index] = [f"client_id: Client with id {item.client_id} not found"]
+    valid = [(index, item) for index, item in valid if index not in errors]
+    
+    written = {}
+    if valid:
+        try:
+            rows = EngagementService.bulk_upsert_engagements(
+                db, [item for _, item in valid], chunk_size=settings.bulk_chunk_size
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Failed to upsert engagements: {str(e)}"
+            )
+        written = {index: row for (index, _), row in zip(valid, rows)}
+    
+    return build_bulk_response(len(records), errors, written)
+
+
+@router.patch("/bulk-status", response_model=EngagementBulkStatusResult)
+def bulk_update_engagement_status(
+    update_data: EngagementBulkStatusUpdate,
+    db: Session = Depends(get_db)
+):
+    """
+    Move many engagements to a new status with one set-based UPDATE.
+    
+    Request Body:
+    - **status**: New engagement status (required)
+    - **ids**: Engagement UUIDs to update (optional)
+    - **filter**: client_id, status, type, senior, senior_id and/or assistant_id selecting engagements (optional)
+    
+    At least one of ids or filter is required; when both are given an
+    engagement must match both.
+    """
+    selection = update_data.filter.model_dump(exclude_none=True) if update_data.filter else {}
+    if update_data.ids is None and not selection:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide ids or at least one filter"
+        )
+    
+    if update_data.ids is not None and len(update_data.ids) > settings.bulk_max_records:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Bulk requests accept at most {settings.bulk_max_records} ids"
+        )
+    
+    updated_ids = EngagementService.bulk_update_status(
+        db,
+        new_status=update_data.status,
+        ids=update_data.ids,
+        **selection
+    )
+    
+    return EngagementBulkStatusResult(updated=len(updated_ids), ids=updated_ids)
+
+
 @router.put("/{engagement_id}", response_model=EngagementRead)
-def update_engagement(
+async def update_engagement(
     engagement_id: UUID,
     engagement_data: EngagementUpdate,
-    db: Session = Depends(get_db)
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: DbSession = Depends(get_session)
 ):
     """
     Update an existing engagement.
@@ -141,8 +437,20 @@ def update_engagement(
     - **senior**: Senior staff assigned
     - **assistant**: Assistant staff assigned
     - **status**: Engagement status
+    
+    Headers:
+    - **If-Match**: ETag from a previous read; the update is refused with
+      412 Precondition Failed if the engagement has changed since
     """
-    engagement = EngagementService.update_engagement(db, engagement_id, engagement_data)
+    try:
+        engagement = await AsyncEngagementService.update_engagement(
+            db, engagement_id, engagement_data, expected_updated_at=if_match_versions(if_match)
+        )
+    except StaleWriteError:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=f"Engagement with id {engagement_id} was modified; fetch it again and retry"
+        )
     
     if not engagement:
         raise HTTPException(
@@ -150,13 +458,14 @@ def update_engagement(
             detail=f"Engagement with id {engagement_id} not found"
         )
     
+    response.headers["ETag"] = row_etag(engagement.updated_at)
     return engagement
 
 
 @router.delete("/{engagement_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_engagement(
+async def delete_engagement(
     engagement_id: UUID,
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_session)
 ):
     """
     Delete an engagement.
@@ -164,7 +473,7 @@ def delete_engagement(
     Path Parameters:
     - **engagement_id**: UUID of the engagement
     """
-    success = EngagementService.delete_engagement(db, engagement_id)
+    success = await AsyncEngagementService.delete_engagement(db, engagement_id)
     
     if not success:
         raise HTTPException(
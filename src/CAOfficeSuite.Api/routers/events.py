@@ -0,0 +1,66 @@
+"""
+Live Updates API Router
+Server-Sent Events stream of client and engagement changes
+"""
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from uuid import UUID
+
+from ..services.events import event_broadcaster, sse_stream
+from ..config import get_settings
+
+router = APIRouter(prefix="/events", tags=["events"])
+settings = get_settings()
+
+# Entities accepted by the entities query parameter
+EVENT_ENTITIES = {"clients", "engagements"}
+
+
+@router.get("")
+async def stream_events(
+    entities: str = Query("clients,engagements", description="Comma-separated: clients, engagements"),
+    client_id: Optional[UUID] = Query(None, description="Only changes to this client and its engagements"),
+    status: Optional[str] = Query(None, description="Only rows with this status"),
+    senior: Optional[str] = Query(None, description="Only engagements of this senior (partial match)")
+):
+    """
+    Stream client and engagement changes as Server-Sent Events.
+    
+    Query Parameters:
+    - **entities**: Which entities to receive (default: both)
+    - **client_id**, **status**, **senior**: Only events for matching rows;
+      a filter only applies to entities that have that field
+    
+    Each event is named after its entity, and its data is JSON with `op`
+    (created, updated, deleted or bulk), the row's `id` and its filter fields.
+    Refetch what the dashboard shows when an event arrives. A `bulk` event
+    covers many rows at once. A `resync` event means events were dropped,
+    because this reader fell behind or the server lost its listener. Catch up
+    with the change feeds, and do the same after a reconnect.
+    """
+    selected = {part.strip() for part in entities.split(",") if part.strip()}
+    unknown = selected - EVENT_ENTITIES
+    if unknown or not selected:
+        # The `status` query parameter shadows fastapi.status in this handler
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown entities: {', '.join(sorted(unknown)) or '(none)'}"
+        )
+    
+    if event_broadcaster.subscriber_count >= settings.events_max_subscribers:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many live update subscribers; retry later"
+        )
+    
+    filters = {"client_id": str(client_id) if client_id else None, "status": status, "senior": senior}
+    filters = {name: value for name, value in filters.items() if value is not None}
+    
+    return StreamingResponse(
+        sse_stream(event_broadcaster, selected, filters, settings.events_heartbeat_seconds),
+        media_type="text/event-stream",
+        # Proxies must neither cache nor buffer the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,31 @@
+"""
+Staff API Router
+Endpoints for the staff engagements are assigned to
+"""
+
+from fastapi import APIRouter, Depends, Query
+from typing import Optional
+
+from ..database import get_read_session, DbSession
+from ..services.async_services import AsyncStaffService
+from ..schemas.staff import StaffRead, StaffList
+from ..responses import page_response, rows_as_dicts
+
+router = APIRouter(prefix="/staff", tags=["staff"])
+
+
+@router.get("", response_model=StaffList)
+async def list_staff(
+    search: Optional[str] = Query(None, description="Part of the staff name"),
+    db: DbSession = Depends(get_read_session)
+):
+    """
+    Get staff members ordered by name.
+    
+    Query Parameters:
+    - **search**: Only names containing this text (case-insensitive)
+    
+    Use an `id` as senior_id or assistant_id to filter engagements exactly.
+    """
+    staff = await AsyncStaffService.get_staff(db, search)
+    return page_response(StaffList, items=rows_as_dicts(staff, list(StaffRead.model_fields)))
@@ -2,6 +2,7 @@
 
 from .client import (
     ClientCreate,
+    ClientBulkItem,
     ClientUpdate,
     ClientRead,
     ClientWithEngagements,
@@ -10,20 +11,36 @@ from .client import (
 from .engagement import (
     EngagementCreate,
     EngagementUpdate,
+    EngagementStatusFilter,
+    EngagementBulkStatusUpdate,
     EngagementRead,
     EngagementWithClient,
+    EngagementBulkStatusResult,
     PaginatedEngagements
 )
+from .bulk import BulkItemResult, BulkUpsertResponse
+from .staff import StaffRead, StaffList
+from .analytics import EngagementSummaryGroup, EngagementSummaryResponse
 
 __all__ = [
     "ClientCreate",
+    "ClientBulkItem",
     "ClientUpdate",
     "ClientRead",
     "ClientWithEngagements",
     "PaginatedClients",
     "EngagementCreate",
     "EngagementUpdate",
+    "EngagementStatusFilter",
+    "EngagementBulkStatusUpdate",
     "EngagementRead",
     "EngagementWithClient",
+    "EngagementBulkStatusResult",
     "PaginatedEngagements",
+    "BulkItemResult",
+    "BulkUpsertResponse",
+    "StaffRead",
+    "StaffList",
+    "EngagementSummaryGroup",
+    "EngagementSummaryResponse",
 ]
@@ -0,0 +1,29 @@
+"""
+Analytics Pydantic Schemas
+Defines response models for reporting endpoints
+"""
+
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from uuid import UUID
+
+
+# ============================================================================
+# Engagement Summary Schemas
+# ============================================================================
+
+class EngagementSummaryGroup(BaseModel):
+    """Engagement count for one group; only the grouped dimensions are returned."""
+    status: Optional[str] = None
+    type: Optional[str] = None
+    senior: Optional[str] = Field(None, description="Senior staff (null: none assigned)")
+    client_id: Optional[UUID] = None
+    client_name: Optional[str] = None
+    count: int = Field(..., description="Number of engagements")
+
+
+class EngagementSummaryResponse(BaseModel):
+    """Engagement counts grouped by the requested dimensions, largest first."""
+    group_by: List[str] = Field(..., description="Dimensions the groups are keyed by")
+    total: int = Field(..., description="Engagements matching the filters")
+    groups: List[EngagementSummaryGroup]
@@ -0,0 +1,24 @@
+"""
+Bulk Operation Pydantic Schemas
+Defines per-record results returned by bulk endpoints
+"""
+
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from uuid import UUID
+
+
+class BulkItemResult(BaseModel):
+    """Outcome for one record of a bulk request."""
+    index: int = Field(..., description="Zero-based position of the record in the request")
+    status: str = Field(..., description="created, updated or error")
+    id: Optional[UUID] = Field(None, description="ID of the written row")
+    errors: List[str] = Field(default_factory=list, description="Validation errors for rejected records")
+
+
+class BulkUpsertResponse(BaseModel):
+    """Summary and per-record results of a bulk upsert."""
+    created: int = Field(..., description="Number of rows inserted")
+    updated: int = Field(..., description="Number of existing rows updated")
+    failed: int = Field(..., description="Number of records rejected")
+    results: List[BulkItemResult]
@@ -4,7 +4,7 @@ Defines request/response models for client endpoints
 """
 
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, List
+from typing import Optional, List, Union
 from datetime import datetime
 from uuid import UUID
 
@@ -32,6 +32,11 @@ class ClientCreate(ClientBase):
     pass
 
 
+class ClientBulkItem(ClientCreate):
+    """Schema for one record of a bulk client upsert."""
+    id: Optional[UUID] = Field(None, description="Existing client UUID to update; omit to create")
+
+
 class ClientUpdate(BaseModel):
     """Schema for updating a client (all fields optional)."""
     name: Optional[str] = Field(None, min_length=1, max_length=255)
@@ -65,11 +70,31 @@ class ClientWithEngagements(ClientRead):
 # ============================================================================
 
 class PaginatedClients(BaseModel):
-    """Paginated list of clients."""
-    items: List[ClientRead]
-    total: int = Field(..., description="Total number of items")
+    """Paginated list of clients (with engagement counts when requested)."""
+    items: List[Union[ClientRead, ClientWithEngagements]]
+    total: Optional[int] = Field(..., description="Total number of items (null when count=none)")
     page: int = Field(..., description="Current page number")
     page_size: int = Field(..., description="Number of items per page")
-    total_pages: int = Field(..., description="Total number of pages")
+    total_pages: Optional[int] = Field(..., description="Total number of pages (null when count=none)")
+    count_mode: str = Field("exact", description="How total was produced: exact, estimated or none")
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for the next page (cursor pagination only)")
     
     model_config = ConfigDict(from_attributes=True)
+
+
+# ============================================================================
+# Change Feed Schema
+# ============================================================================
+
+class ClientTombstone(BaseModel):
+    """A deleted client."""
+    id: UUID
+    deleted_at: datetime
+
+
+class ClientChanges(BaseModel):
+    """Clients written and deleted since a watermark, oldest first."""
+    items: List[ClientRead] = Field(..., description="Clients created or updated since the watermark")
+    deleted: List[ClientTombstone] = Field(..., description="Clients deleted since the watermark")
+    watermark: str = Field(..., description="Pass back as updated_since to fetch the next changes")
+    has_more: bool = Field(..., description="More changes are waiting; fetch again with the new watermark")
@@ -45,6 +45,23 @@ class EngagementUpdate(BaseModel):
     status: Optional[str] = Field(None, min_length=1, max_length=100)
 
 
+class EngagementStatusFilter(BaseModel):
+    """Filters selecting engagements for a bulk status change."""
+    client_id: Optional[UUID] = None
+    status: Optional[str] = Field(None, description="Current engagement status")
+    type: Optional[str] = None
+    senior: Optional[str] = Field(None, description="Senior staff name (partial match)")
+    senior_id: Optional[int] = Field(None, description="Senior staff ID")
+    assistant_id: Optional[int] = Field(None, description="Assistant staff ID")
+
+
+class EngagementBulkStatusUpdate(BaseModel):
+    """Schema for moving many engagements to a new status."""
+    status: str = Field(..., min_length=1, max_length=100, description="New engagement status")
+    ids: Optional[List[UUID]] = Field(None, description="Engagement IDs to update")
+    filter: Optional[EngagementStatusFilter] = Field(None, description="Filters selecting engagements to update")
+
+
 # ============================================================================
 # Response Schemas
 # ============================================================================
@@ -52,6 +69,8 @@ class EngagementUpdate(BaseModel):
 class EngagementRead(EngagementBase):
     """Schema for reading engagement data."""
     id: UUID
+    senior_id: Optional[int] = Field(None, description="Staff ID of the senior")
+    assistant_id: Optional[int] = Field(None, description="Staff ID of the assistant")
     created_at: datetime
     updated_at: datetime
     
@@ -66,6 +85,12 @@ class EngagementWithClient(EngagementRead):
     model_config = ConfigDict(from_attributes=True)
 
 
+class EngagementBulkStatusResult(BaseModel):
+    """Result of a bulk status change."""
+    updated: int = Field(..., description="Number of engagements updated")
+    ids: List[UUID] = Field(..., description="IDs of the updated engagements")
+
+
 # ============================================================================
 # Pagination Schema
 # ============================================================================
@@ -73,9 +98,30 @@ class EngagementWithClient(EngagementRead):
 class PaginatedEngagements(BaseModel):
     """Paginated list of engagements."""
     items: List[EngagementRead]
-    total: int = Field(..., description="Total number of items")
+    total: Optional[int] = Field(..., description="Total number of items (null when count=none)")
     page: int = Field(..., description="Current page number")
     page_size: int = Field(..., description="Number of items per page")
-    total_pages: int = Field(..., description="Total number of pages")
+    total_pages: Optional[int] = Field(..., description="Total number of pages (null when count=none)")
+    count_mode: str = Field("exact", description="How total was produced: exact, estimated or none")
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for the next page (cursor pagination only)")
     
     model_config = ConfigDict(from_attributes=True)
+
+
+# ============================================================================
+# Change Feed Schema
+# ============================================================================
+
+class EngagementTombstone(BaseModel):
+    """A deleted engagement (including those removed with their client)."""
+    id: UUID
+    client_id: UUID
+    deleted_at: datetime
+
+
+class EngagementChanges(BaseModel):
+    """Engagements written and deleted since a watermark, oldest first."""
+    items: List[EngagementRead] = Field(..., description="Engagements created or updated since the watermark")
+    deleted: List[EngagementTombstone] = Field(..., description="Engagements deleted since the watermark")
+    watermark: str = Field(..., description="Pass back as updated_since to fetch the next changes")
+    has_more: bool = Field(..., description="More changes are waiting; fetch again with the new watermark")
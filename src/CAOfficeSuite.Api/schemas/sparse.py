@@ -0,0 +1,26 @@
+"""
+Sparse Response Schemas
+Slimmed response models for requests that select a subset of fields
+"""
+
+from pydantic import BaseModel, ConfigDict, create_model
+from functools import lru_cache
+from typing import Tuple, Type
+
+
+@lru_cache(maxsize=256)
+def sparse_model(base: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """
+    Response model with only `fields` of `base`, keeping their types and
+    descriptions. Models are cached per (base, fields) combination.
+    """
+    definitions = {
+        name: (base.model_fields[name].annotation, base.model_fields[name])
+        for name in fields
+    }
+    return create_model(
+        f"{base.__name__}Sparse",
+        __config__=ConfigDict(from_attributes=True),
+        **definitions
+    )
+
@@ -0,0 +1,22 @@
+"""
+Staff Pydantic Schemas
+Defines response models for staff endpoints
+"""
+
+from pydantic import BaseModel, Field
+from typing import List
+
+
+# ============================================================================
+# Response Schemas
+# ============================================================================
+
+class StaffRead(BaseModel):
+    """A staff member engagements can be assigned to."""
+    id: int = Field(..., description="Staff ID, as used by senior_id and assistant_id")
+    name: str
+
+
+class StaffList(BaseModel):
+    """All staff members, ordered by name."""
+    items: List[StaffRead]
@@ -0,0 +1,101 @@
+"""
+Analytics Service
+Dashboard aggregates read from the trigger-maintained summary tables
+"""
+
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select, text
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from ..models.client import Client
+from ..models.engagement_summary import EngagementSummary, EngagementClientSummary, REBUILD_SUMMARIES
+
+# Dimensions accepted by the group_by query parameter
+SUMMARY_DIMENSIONS = ("status", "type", "senior", "client_id")
+
+
+class AnalyticsService:
+    """Service class for reporting aggregates."""
+
+    @staticmethod
+    def _summary_table(group_by: Sequence[str], filters: Dict[str, Any]):
+        """
+        Pick the summary answering a grouping and filter set. Per-client counts
+        are kept by status only.
+        """
+        dimensions = set(group_by) | set(filters)
+        if "client_id" not in dimensions:
+            return EngagementSummary
+        unsupported = dimensions - {"client_id", "status"}
+        if unsupported:
+            raise ValueError(
+                f"client_id cannot be combined with {', '.join(sorted(unsupported))}; "
+                "per-client counts are kept by status only"
+            )
+        return EngagementClientSummary
+
+    @staticmethod
+    def get_engagement_summary(
+        db: Session,
+        group_by: Sequence[str] = ("status", "type", "senior"),
+        client_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+        type: Optional[str] = None,
+        senior: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Engagement counts per group, largest first, from the summary tables:
+        cost grows with the number of groups, not the number of engagements.
+        A senior of None means no senior is assigned.
+
+        Returns:
+            Tuple of (groups, total engagements matching the filters)
+
+        Raises:
+            ValueError: for an unknown dimension or an unsupported combination
+        """
+        unknown = [name for name in group_by if name not in SUMMARY_DIMENSIONS]
+        if unknown:
+            raise ValueError(
+                f"Invalid group_by: {', '.join(unknown)}. Allowed: {', '.join(SUMMARY_DIMENSIONS)}"
+            )
+        filters = {
+            name: value for name, value in
+            (("client_id", client_id), ("status", status), ("type", type), ("senior", senior))
+            if value is not None
+        }
+        summary = AnalyticsService._summary_table(group_by, filters)
+
+        where = [getattr(summary, name) == value for name, value in filters.items()]
+        count = func.sum(summary.engagements)
+        total = db.execute(select(func.coalesce(count, 0)).where(*where)).scalar()
+
+        keys = [getattr(summary, name) for name in group_by]
+        columns = [
+            func.nullif(key, "").label("senior") if key.key == "senior" else key
+            for key in keys
+        ]
+        statement = select(*columns, count.label("count")).where(*where)
+        if "client_id" in group_by:
+            # Names come from clients; the summary itself only holds ids
+            statement = statement.add_columns(
+                select(Client.name).where(Client.id == summary.client_id).scalar_subquery().label("client_name")
+            )
+        statement = statement.group_by(*keys).order_by(count.desc(), *keys)
+        if limit is not None:
+            statement = statement.limit(limit)
+
+        groups = [dict(row._mapping) for row in db.execute(statement)]
+        return groups, int(total)
+
+    @staticmethod
+    def rebuild_summaries(db: Session) -> None:
+        """
+        Recompute the summary tables from engagements, e.g. after restoring a
+        backup taken without them. The triggers keep them current otherwise.
+        """
+        for statement in REBUILD_SUMMARIES:
+            db.execute(text(statement))
+        db.commit()
@@ -0,0 +1,61 @@
+"""
+Async Services
+Awaitable versions of the service classes for async route handlers
+"""
+
+from functools import wraps
+
+from ..database import run_db
+from .client_service import ClientService
+from .engagement_service import EngagementService
+from .analytics import AnalyticsService
+from .staff_service import StaffService
+
+
+def _awaitable(fn):
+    """
+    Wrap a sync service method so it can be awaited with either session type.
+    The business logic stays in one place; only the I/O path differs.
+    """
+    @wraps(fn)
+    async def wrapper(db, *args, **kwargs):
+        return await run_db(db, fn, *args, **kwargs)
+    return staticmethod(wrapper)
+
+
+class AsyncClientService:
+    """Awaitable ClientService for use with AsyncSession or Session."""
+
+    get_clients = _awaitable(ClientService.get_clients)
+    get_clients_keyset = _awaitable(ClientService.get_clients_keyset)
+    get_changes = _awaitable(ClientService.get_changes)
+    get_engagement_counts = _awaitable(ClientService.get_engagement_counts)
+    get_client_by_id = _awaitable(ClientService.get_client_by_id)
+    create_client = _awaitable(ClientService.create_client)
+    update_client = _awaitable(ClientService.update_client)
+    delete_client = _awaitable(ClientService.delete_client)
+    get_client_engagements = _awaitable(ClientService.get_client_engagements)
+
+
+class AsyncEngagementService:
+    """Awaitable EngagementService for use with AsyncSession or Session."""
+
+    get_engagements = _awaitable(EngagementService.get_engagements)
+    get_engagements_keyset = _awaitable(EngagementService.get_engagements_keyset)
+    get_changes = _awaitable(EngagementService.get_changes)
+    get_engagement_by_id = _awaitable(EngagementService.get_engagement_by_id)
+    create_engagement = _awaitable(EngagementService.create_engagement)
+    update_engagement = _awaitable(EngagementService.update_engagement)
+    delete_engagement = _awaitable(EngagementService.delete_engagement)
+
+
+class AsyncStaffService:
+    """Awaitable StaffService for use with AsyncSession or Session."""
+
+    get_staff = _awaitable(StaffService.get_staff)
+
+
+class AsyncAnalyticsService:
+    """Awaitable AnalyticsService for use with AsyncSession or Session."""
+
+    get_engagement_summary = _awaitable(AnalyticsService.get_engagement_summary)
@@ -0,0 +1,153 @@
+"""
+Bulk Write Helpers
+Request body parsing and dialect-aware multi-row upserts for bulk endpoints
+"""
+
+from sqlalchemy.orm import Session
+from sqlalchemy import Table, func
+from pydantic import BaseModel, ValidationError
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Sequence, Tuple, Type
+import json
+
+from ..schemas.bulk import BulkItemResult, BulkUpsertResponse
+
+
+def parse_bulk_body(body: bytes, content_type: str) -> List[Any]:
+    """
+    Parse a bulk request body into a list of raw records.
+
+    Accepts a JSON array, or NDJSON (one JSON object per line) when the
+    content type is application/x-ndjson or application/jsonl.
+    Raises ValueError if the body cannot be parsed.
+    """
+    media_type = (content_type or "").split(";")[0].strip().lower()
+
+    try:
+        if media_type in ("application/x-ndjson", "application/ndjson", "application/jsonl"):
+            return [json.loads(line) for line in body.splitlines() if line.strip()]
+        records = json.loads(body or b"[]")
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise ValueError(f"Malformed request body: {e}")
+
+    if not isinstance(records, list):
+        raise ValueError("Request body must be a JSON array of records")
+    return records
+
+
+def validate_records(
+    records: List[Any],
+    schema: Type[BaseModel],
+    key: Optional[Callable[[BaseModel], Optional[Hashable]]] = None
+) -> Tuple[List[Tuple[int, BaseModel]], Dict[int, List[str]]]:
+    """
+    Validate every raw record against `schema` before anything is written.
+
+    When `key` is given, a record whose key repeats an earlier record in the
+    batch is rejected, since one upsert statement cannot touch a row twice.
+
+    Returns: ([(index, item), ...] for valid records, {index: error_messages})
+    """
+    valid = []
+    errors = {}
+    seen = set()
+
+    for index, record in enumerate(records):
+        try:
+            item = schema.model_validate(record)
+        except ValidationError as e:
+            errors[index] = [
+                f"{'.'.join(str(part) for part in err['loc']) or 'record'}: {err['msg']}"
+                for err in e.errors()
+            ]
+            continue
+
+        item_key = key(item) if key else None
+        if item_key is not None:
+            if item_key in seen:
+                errors[index] = ["Duplicate record in request"]
+                continue
+            seen.add(item_key)
+
+        valid.append((index, item))
+
+    return valid, errors
+
+
+def chunked(items: Sequence, size: int) -> Iterator[Sequence]:
+    """Yield consecutive slices of at most `size` items."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _dialect_insert(db: Session):
+    """The insert() construct with ON CONFLICT support for the session's database."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise ValueError(f"Bulk upsert is not supported on {dialect}")
+    return insert
+
+
+def upsert_statement(
+    db: Session,
+    table: Table,
+    rows: List[Dict[str, Any]],
+    conflict_columns: Sequence[str],
+    update_columns: Sequence[str]
+):
+    """
+    Build one multi-row INSERT ... ON CONFLICT DO UPDATE ... RETURNING id.
+
+    Conflicting rows get `update_columns` from the incoming values and a fresh
+    updated_at; created_at is left untouched. Supports PostgreSQL and SQLite.
+    """
+    stmt = _dialect_insert(db)(table).values(rows)
+    update_set = {column: stmt.excluded[column] for column in update_columns}
+    update_set["updated_at"] = func.now()
+
+    return stmt.on_conflict_do_update(
+        index_elements=list(conflict_columns),
+        set_=update_set
+    ).returning(table.c.id)
+
+
+def insert_missing_statement(
+    db: Session,
+    table: Table,
+    rows: List[Dict[str, Any]],
+    conflict_columns: Sequence[str]
+):
+    """Build one multi-row INSERT ... ON CONFLICT DO NOTHING: existing rows are kept as they are."""
+    return _dialect_insert(db)(table).values(rows).on_conflict_do_nothing(
+        index_elements=list(conflict_columns)
+    )
+
+
+def build_bulk_response(
+    record_count: int,
+    errors: Dict[int, List[str]],
+    written: Dict[int, Tuple[Any, bool]]
+) -> BulkUpsertResponse:
+    """
+    Assemble per-record results in request order.
+
+    `written` maps a record index to (row_id, created) for every stored record.
+    """
+    results = []
+    for index in range(record_count):
+        if index in errors:
+            results.append(BulkItemResult(index=index, status="error", errors=errors[index]))
+        else:
+            row_id, created = written[index]
+            results.append(BulkItemResult(index=index, status="created" if created else "updated", id=row_id))
+
+    created = sum(1 for result in results if result.status == "created")
+    return BulkUpsertResponse(
+        created=created,
+        updated=len(results) - created - len(errors),
+        failed=len(errors),
+        results=results
+    )
@@ -0,0 +1,353 @@
+"""
+Response Cache
+Cached GET list/detail bodies with write-driven, filter-aware invalidation
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+import threading
+import time
+
+import orjson
+
+from ..config import get_settings
+
+# A cache filter: (row fields it reads, predicate(row, filter_value) -> bool)
+CacheFilter = Tuple[Tuple[str, ...], Callable[[Mapping[str, Any], Any], bool]]
+
+
+def _plain(value: Any) -> Any:
+    """Key/metadata friendly form of a parameter or column value."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [_plain(item) for item in value]
+    return str(value)
+
+
+def filters_match(
+    registered: Mapping[str, CacheFilter],
+    filters: Mapping[str, Any],
+    row: Mapping[str, Any],
+    changed: Sequence[str] = ()
+) -> bool:
+    """
+    True when a written `row` may match every filter in `filters`.
+
+    Filters without a registered predicate compare the same-named field.
+    A filter reading a field the write changed, or one missing from `row`,
+    counts as matching: its old value is unknown.
+    """
+    for name, value in filters.items():
+        fields, predicate = registered.get(name, ((name,), lambda r, v, n=name: _plain(r[n]) == v))
+        if any(field in changed or field not in row for field in fields):
+            continue  # Old value unknown: assume it matched
+        if not predicate(row, value):
+            return False
+    return True
+
+
+# ============================================================================
+# Backends
+# ============================================================================
+
+class MemoryCacheBackend:
+    """Bounded LRU of cached bodies with a TTL, local to this process."""
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, bytes, dict]]" = OrderedDict()
+        self._generations: Dict[str, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, body, _ = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return body
+
+    def set(self, key: str, body: bytes, meta: dict) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), body, meta)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def entries(self) -> List[Tuple[str, dict]]:
+        with self._lock:
+            return [(key, meta) for key, (_, _, meta) in self._entries.items()]
+
+    def delete(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def generation(self, entity: str) -> Tuple[int, float]:
+        with self._lock:
+            return self._generations.get(entity, (0, 0.0))
+
+    def bump(self, entity: str) -> None:
+        with self._lock:
+            counter, _ = self._generations.get(entity, (0, 0.0))
+            self._generations[entity] = (counter + 1, time.time())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisCacheBackend:
+    """
+    Cached bodies in Redis, shared by every API process.
+
+    Bodies are stored with SET ... EX ttl. Entry metadata lives in one hash
+    so invalidation can evaluate filters without scanning the keyspace; its
+    fields are pruned when their body has expired.
+    """
+
+    def __init__(self, client, ttl_seconds: float = 30.0, prefix: str = "caos:cache"):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self._meta_key = f"{prefix}:meta"
+
+    def _body_key(self, key: str) -> str:
+        return f"{self.prefix}:body:{key}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self._body_key(key))
+
+    def set(self, key: str, body: bytes, meta: dict) -> None:
+        pipe = self.client.pipeline()
+        pipe.set(self._body_key(key), body, ex=max(1, int(self.ttl_seconds)))
+        pipe.hset(self._meta_key, key, orjson.dumps(meta))
+        pipe.execute()
+
+    def entries(self) -> List[Tuple[str, dict]]:
+        metas = [
+            (key.decode() if isinstance(key, bytes) else key, meta)
+            for key, meta in self.client.hgetall(self._meta_key).items()
+        ]
+        if not metas:
+            return []
+
+        pipe = self.client.pipeline()
+        for key, _ in metas:
+            pipe.exists(self._body_key(key))
+        alive = pipe.execute()
+
+        expired = [key for (key, _), exists in zip(metas, alive) if not exists]
+        if expired:
+            self.client.hdel(self._meta_key, *expired)
+        return [
+            (key, orjson.loads(meta))
+            for (key, meta), exists in zip(metas, alive) if exists
+        ]
+
+    def delete(self, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        if not keys:
+            return
+        pipe = self.client.pipeline()
+        pipe.delete(*[self._body_key(key) for key in keys])
+        pipe.hdel(self._meta_key, *keys)
+        pipe.execute()
+
+    def generation(self, entity: str) -> Tuple[int, float]:
+        counter, changed_at = self.client.hmget(f"{self.prefix}:gen:{entity}", "counter", "changed_at")
+        return int(counter or 0), float(changed_at or 0.0)
+
+    def bump(self, entity: str) -> None:
+        key = f"{self.prefix}:gen:{entity}"
+        pipe = self.client.pipeline()
+        pipe.hincrby(key, "counter", 1)
+        pipe.hset(key, "changed_at", time.time())
+        pipe.execute()
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(f"{self.prefix}:*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+# ============================================================================
+# Response Cache
+# ============================================================================
+
+class ResponseCache:
+    """
+    Cache of rendered GET responses keyed on normalized parameters.
+
+    Every entry records the entity it shows, the filters it was computed
+    with, and optionally the ids on the page plus the related entities whose
+    rows point at those ids (e.g. engagement counts on a client page).
+    Writes report the rows they touched, and only entries those rows can
+    affect are dropped:
+
+    - an entry whose filters all match the row (new row values on create and
+      update, deleted row values on delete)
+    - an entry filtering on a field the write changed, since the old value
+      is not known
+    - an entry depending on a related entity whose rows point at its ids
+
+    A per-entity generation stops a response computed before an invalidation
+    from being stored after it. With read replicas, nothing is stored for
+    `settle_seconds` after a write, so a lagging replica is not cached.
+    """
+
+    def __init__(self, backend=None, settle_seconds: float = 0.0):
+        self.backend = backend
+        self.settle_seconds = settle_seconds
+        self._filters: Dict[str, Dict[str, CacheFilter]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def register_filters(self, entity: str, filters: Dict[str, CacheFilter]) -> None:
+        """Register how an entity's list filters are evaluated against rows."""
+        self._filters[entity] = filters
+
+    @staticmethod
+    def key(entity: str, view: str, **params: Any) -> str:
+        """Normalized cache key; parameter order and unset (None) values do not matter."""
+        normalized = sorted((name, _plain(value)) for name, value in params.items() if value is not None)
+        return f"{entity}:{view}:" + orjson.dumps(normalized).decode()
+
+    def get(self, key: str) -> Optional[Tuple[bytes, Optional[str]]]:
+        """Return a cached (body, etag), or None."""
+        if not self.enabled:
+            return None
+        stored = self.backend.get(key)
+        if stored is None:
+            return None
+        etag, _, body = stored.partition(b"\n")
+        return body, etag.decode() or None
+
+    def generation(self, *entities: str) -> Tuple:
+        """Current generations of the entities a response is built from."""
+        if not self.enabled:
+            return ()
+        return tuple(self.backend.generation(entity) for entity in entities)
+
+    def set(
+        self,
+        key: str,
+        body: bytes,
+        generation: Tuple,
+        entity: str,
+        filters: Optional[Dict[str, Any]] = None,
+        ids: Iterable[Any] = (),
+        depends: Optional[Dict[str, str]] = None,
+        etag: Optional[str] = None
+    ) -> None:
+        """
+        Store a rendered body (and its ETag) unless an entity it reads changed
+        since `generation`.
+
+        `depends` maps a related entity to its column referencing `ids`
+        (e.g. {"engagements": "client_id"}).
+        """
+        if not self.enabled:
+            return
+
+        entities = [entity, *(depends or {})]
+        current = self.generation(*entities)
+        if current != generation:
+            return
+        if self.settle_seconds and any(
+            time.time() - changed_at < self.settle_seconds for _, changed_at in current
+        ):
+            return
+
+        meta = {
+            "entity": entity,
+            "filters": {name: _plain(value) for name, value in (filters or {}).items() if value is not None},
+            "ids": [_plain(row_id) for row_id in ids],
+            "depends": depends or {},
+        }
+        # ETags never contain a newline, so the body follows the first one
+        self.backend.set(key, (etag or "").encode() + b"\n" + body, meta)
+
+    def _matches(self, entity: str, filters: dict, row: Mapping[str, Any], changed: Sequence[str]) -> bool:
+        """True when `row` may belong to a result computed with `filters`."""
+        return filters_match(self._filters.get(entity, {}), filters, row, changed)
+
+    def invalidate(
+        self,
+        entity: str,
+        rows: Iterable[Mapping[str, Any]],
+        changed: Sequence[str] = ()
+    ) -> None:
+        """
+        Drop entries affected by writes to `rows` of `entity`.
+
+        Rows are dicts of column values: the new values for creates and
+        updates, the old values for deletes. `changed` names the fields an
+        update modified. Missing fields are treated as unknown.
+        """
+        if not self.enabled:
+            return
+        self.backend.bump(entity)
+
+        rows = list(rows)
+        stale = []
+        for key, meta in self.backend.entries():
+            if meta["entity"] == entity:
+                if any(self._matches(entity, meta["filters"], row, changed) for row in rows):
+                    stale.append(key)
+            elif entity in meta["depends"]:
+                column = meta["depends"][entity]
+                ids = set(meta["ids"])
+                if any(column not in row or _plain(row[column]) in ids for row in rows):
+                    stale.append(key)
+        self.backend.delete(stale)
+
+    def invalidate_all(self, entity: str) -> None:
+        """Drop every entry showing or depending on `entity` (bulk writes)."""
+        if not self.enabled:
+            return
+        self.backend.bump(entity)
+        self.backend.delete(
+            key for key, meta in self.backend.entries()
+            if meta["entity"] == entity or entity in meta["depends"]
+        )
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+        if self.enabled:
+            self.backend.clear()
+
+
+def _build_response_cache() -> ResponseCache:
+    """Create the cache for the configured backend (memory, redis or none)."""
+    settings = get_settings()
+    backend_name = settings.response_cache_backend.lower()
+
+    if backend_name == "none":
+        backend = None
+    elif backend_name == "redis":
+        import redis  # Optional dependency, only needed for the shared backend
+        backend = RedisCacheBackend(
+            redis.Redis.from_url(settings.redis_url),
+            ttl_seconds=settings.response_cache_ttl_seconds
+        )
+    else:
+        backend = MemoryCacheBackend(
+            max_entries=settings.response_cache_max_entries,
+            ttl_seconds=settings.response_cache_ttl_seconds
+        )
+
+    # A write can reach the primary before the replicas; don't cache their lag
+    settle_seconds = settings.read_your_writes_seconds if settings.database_replica_urls else 0.0
+    return ResponseCache(backend, settle_seconds=settle_seconds)
+
+
+response_cache = _build_response_cache()
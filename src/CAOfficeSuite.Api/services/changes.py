@@ -0,0 +1,149 @@
+"""
+Change Feeds
+Rows written and rows deleted since a watermark, for clients keeping a local copy in sync
+"""
+
+from sqlalchemy import Select, insert, literal, select, tuple_
+from sqlalchemy.orm import Session
+from typing import Any, List, Optional, Sequence, Tuple
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+import base64
+import json
+
+from ..models.deletion import Deletion
+from .fields import select_columns
+from .versioning import version_of, updated_at_of
+
+# A feed position: (version of the last row's timestamp, last row's id or None).
+# With a None id every row at that timestamp has been seen.
+Position = Optional[Tuple[int, Any]]
+
+
+def encode_watermark(rows: Position, deletions: Position) -> str:
+    """Encode the positions of both feeds as an opaque watermark."""
+    def plain(position):
+        return None if position is None else [position[0], None if position[1] is None else str(position[1])]
+
+    raw = json.dumps({"u": plain(rows), "d": plain(deletions)}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_watermark(updated_since: Optional[str]) -> Tuple[Position, Position]:
+    """
+    Decode an updated_since value: a watermark from a previous response, or
+    an ISO-8601 timestamp (naive = UTC) to start from. None starts from the
+    beginning. Raises ValueError if it is neither.
+    """
+    if not updated_since:
+        return None, None
+
+    try:
+        since = datetime.fromisoformat(updated_since)
+    except ValueError:
+        pass
+    else:
+        position = (version_of(since), None)
+        return position, position
+
+    try:
+        padded = updated_since + "=" * (-len(updated_since) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        rows, deletions = payload["u"], payload["d"]
+        return (
+            None if rows is None else (int(rows[0]), None if rows[1] is None else UUID(rows[1])),
+            None if deletions is None else (int(deletions[0]), None if deletions[1] is None else int(deletions[1])),
+        )
+    except (ValueError, KeyError, TypeError, IndexError):
+        raise ValueError("Invalid updated_since: expected a watermark or an ISO-8601 timestamp")
+
+
+def _seek(
+    db: Session,
+    statement: Select,
+    time_column,
+    id_column,
+    position: Position,
+    limit: int,
+    settled_before: Optional[datetime],
+    id_key: str = "id"
+) -> Tuple[List[Any], Position, bool]:
+    """
+    Read up to `limit` rows after `position` in (time_column, id_column) order.
+    `id_key` names id_column in the statement's SELECT list.
+
+    Returns: (rows, position after the last row, more_rows_waiting)
+    """
+    if position is not None:
+        boundary = updated_at_of(position[0])
+        if position[1] is None:
+            statement = statement.where(time_column > boundary)
+        else:
+            # Typed literals: a bare tuple_() would not bind them as the columns store them
+            statement = statement.where(tuple_(time_column, id_column) > tuple_(
+                literal(boundary, time_column.type), literal(position[1], id_column.type)
+            ))
+    if settled_before is not None:
+        statement = statement.where(time_column <= settled_before)
+
+    # Fetch one extra row to learn whether another page exists
+    statement = statement.order_by(time_column.asc(), id_column.asc()).limit(limit + 1)
+    rows = db.execute(statement).all()
+    items = rows[:limit]
+
+    if items:
+        last = items[-1]._mapping
+        position = (version_of(last[time_column.key]), last[id_key])
+    return items, position, len(rows) > limit
+
+
+def read_changes(
+    db: Session,
+    model,
+    entity: str,
+    fields: Sequence[str],
+    updated_since: Optional[str] = None,
+    limit: int = 500,
+    lag_seconds: float = 0.0,
+    where: Sequence[Any] = (),
+    deletions_where: Sequence[Any] = ()
+) -> Tuple[List[Any], List[Any], str, bool]:
+    """
+    Rows of `model` created or updated, and tombstones of rows deleted, after
+    the `updated_since` watermark, oldest first. Tombstones carry id,
+    client_id (engagements) and deleted_at.
+
+    Rows written in the last `lag_seconds` are held back: a timestamp is set
+    when its transaction starts, so a slow transaction can commit a row older
+    than rows already returned. The lag must cover the longest write
+    transaction (plus replica lag when reading from a replica).
+
+    Returns: (rows, tombstones, watermark, has_more)
+    """
+    rows_position, deletions_position = decode_watermark(updated_since)
+    settled_before = datetime.now(timezone.utc) - timedelta(seconds=lag_seconds) if lag_seconds > 0 else None
+
+    statement = select_columns(model, fields, "updated_at").where(*where)
+    rows, rows_position, rows_more = _seek(
+        db, statement, model.updated_at, model.id, rows_position, limit, settled_before
+    )
+
+    statement = select(
+        Deletion.id.label("seq"), Deletion.entity_id.label("id"), Deletion.client_id, Deletion.deleted_at
+    ).where(Deletion.entity == entity, *deletions_where)
+    tombstones, deletions_position, deletions_more = _seek(
+        db, statement, Deletion.deleted_at, Deletion.id, deletions_position, limit, settled_before,
+        id_key="seq"
+    )
+
+    watermark = encode_watermark(rows_position, deletions_position)
+    return rows, tombstones, watermark, rows_more or deletions_more
+
+
+def record_deletions(db: Session, entity: str, id_column, client_id_column, *where: Any) -> None:
+    """
+    Write tombstones for the rows matching `where` with one INSERT ... SELECT.
+    Run it in the deleting transaction, before the DELETE.
+    """
+    rows = select(literal(entity), id_column, client_id_column).where(*where)
+    db.execute(insert(Deletion).from_select(["entity", "entity_id", "client_id"], rows))
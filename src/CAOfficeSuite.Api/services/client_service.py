@@ -4,19 +4,103 @@ Business logic for client operations
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
-from typing import Optional, List, Tuple
+from sqlalchemy import Row, func, update, delete, null
+from typing import Optional, List, Tuple, Dict, Iterable, Sequence
+from datetime import datetime
 from uuid import UUID
 import math
+import uuid
 
 from ..models.client import Client
 from ..models.engagement import Engagement
-from ..schemas.client import ClientCreate, ClientUpdate
+from ..schemas.client import ClientCreate, ClientUpdate, ClientBulkItem
+from .pagination import resolve_sort_column, apply_sort, paginate_keyset
+from .search import search_filter, search_rank, search_matches
+from .fields import project, select_columns
+from .counting import count_rows, count_cache
+from .cache import response_cache
+from .versioning import StaleWriteError, version_matches
+from .changes import read_changes, record_deletions
+from .events import event_broadcaster
+from .bulk import chunked, upsert_statement
+from .engagement_service import ENGAGEMENT_READ_FIELDS
+
+# Fields accepted by the sort_by query parameter
+CLIENT_SORT_FIELDS = (
+    "name", "pan", "email", "phone", "status", "created_at", "updated_at"
+)
+
+# Fields written by create/update requests
+CLIENT_WRITABLE_FIELDS = ("name", "pan", "email", "phone", "address", "status")
+
+# Fields selectable with the fields query parameter
+CLIENT_READ_FIELDS = (
+    "id", "name", "pan", "email", "phone", "address", "status", "created_at", "updated_at"
+)
+
+# How cached client lists are matched against written rows
+response_cache.register_filters("clients", {
+    "search": (
+        ("name", "pan", "email"),
+        lambda row, term: search_matches(term, row["name"], row["pan"], row["email"])
+    ),
+    "status": (("status",), lambda row, value: row["status"] == value),
+})
+
+# What live update events carry, and how subscriber filters match them
+event_broadcaster.register("clients", ("id", "status"), {
+    "client_id": (("id",), lambda row, value: row["id"] == value),
+    "status": (("status",), lambda row, value: row["status"] == value),
+})
+
+
+def _row_values(client) -> Dict[str, object]:
+    """Column values of a written client, for cache invalidation."""
+    return {field: getattr(client, field) for field in CLIENT_READ_FIELDS}
 
 
 class ClientService:
     """Service class for client-related operations."""
     
+    @staticmethod
+    def _filter_clauses(
+        search: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> list:
+        """Build WHERE clauses for the client list filters."""
+        clauses = []
+        
+        # Apply search filter
+        if search:
+            clauses.append(search_filter(search))
+        
+        # Apply status filter
+        if status:
+            clauses.append(Client.status == status)
+        
+        return clauses
+    
+    @staticmethod
+    def _filtered_query(
+        db: Session,
+        search: Optional[str] = None,
+        status: Optional[str] = None
+    ):
+        """Build the client ORM query with search and status filters applied."""
+        return db.query(Client).filter(*ClientService._filter_clauses(search, status))
+    
+    @staticmethod
+    def _filtered_select(
+        fields: Sequence[str],
+        search: Optional[str] = None,
+        status: Optional[str] = None,
+        *extra: str
+    ):
+        """Build the lean Core select() of `fields` with list filters applied."""
+        return select_columns(Client, fields, *extra).where(
+            *ClientService._filter_clauses(search, status)
+        )
+    
     @staticmethod
     def get_clients(
         db: Session,
@@ -25,90 +109,271 @@ class ClientService:
         search: Optional[str] = None,
         status: Optional[str] = None,
         sort_by: str = "name",
-        sort_order: str = "asc"
-    ) -> Tuple[List[Client], int]:
+        sort_order: str = "asc",
+        count_mode: str = "exact",
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[List[Row], Optional[int]]:
         """
         Get paginated list of clients with optional filtering and sorting.
+        Rows are read-only Core rows of `fields` (default: every readable field).
         
-        Returns: (clients_list, total_count)
+        Returns: (client_rows, total_count); total_count is None when count_mode is "none"
         """
-        query = db.query(Client)
-        
-        # Apply search filter
-        if search:
-            search_pattern = f"%{search}%"
-            query = query.filter(
-                or_(
-                    Client.name.ilike(search_pattern),
-                    Client.pan.ilike(search_pattern),
-                    Client.email.ilike(search_pattern)
-                )
-            )
+        # Relevance only means something with a search term
+        if sort_by == "relevance" and not search:
+            sort_by = "name"
+        if sort_by != "relevance":
+            sort_column = resolve_sort_column(Client, sort_by, CLIENT_SORT_FIELDS)
         
-        # Apply status filter
-        if status:
-            query = query.filter(Client.status == status)
+        # updated_at is always selected; the page ETag is built from it
+        statement = ClientService._filtered_select(
+            fields or CLIENT_READ_FIELDS, search, status, "updated_at"
+        )
         
         # Get total count before pagination
-        total = query.count()
+        total = count_rows(db, statement, count_mode, ("clients", search, status))
         
         # Apply sorting
-        if sort_order.lower() == "desc":
-            query = query.order_by(getattr(Client, sort_by).desc())
+        if sort_by == "relevance":
+            # Best matches first; sort_order does not apply to relevance
+            statement = statement.order_by(search_rank(db, search).desc(), Client.name.asc(), Client.id.asc())
         else:
-            query = query.order_by(getattr(Client, sort_by).asc())
+            statement = apply_sort(statement, sort_column, Client.id, sort_order)
         
         # Apply pagination
         offset = (page - 1) * page_size
-        clients = query.offset(offset).limit(page_size).all()
+        clients = db.execute(statement.offset(offset).limit(page_size)).all()
         
         return clients, total
     
     @staticmethod
-    def get_client_by_id(db: Session, client_id: UUID) -> Optional[Client]:
-        """Get a single client by ID."""
-        return db.query(Client).filter(Client.id == client_id).first()
+    def get_clients_keyset(
+        db: Session,
+        page_size: int = 50,
+        cursor: Optional[str] = None,
+        search: Optional[str] = None,
+        status: Optional[str] = None,
+        sort_by: str = "name",
+        sort_order: str = "asc",
+        count_mode: str = "exact",
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[List[Row], Optional[int], Optional[str]]:
+        """
+        Get a page of clients by seeking past an opaque cursor.
+        Cost stays flat however deep the caller scrolls.
+        
+        Returns: (client_rows, total_count, next_cursor)
+        """
+        sort_column = resolve_sort_column(Client, sort_by, CLIENT_SORT_FIELDS)
+        # The sort column and updated_at are always selected for the cursor and ETag
+        statement = ClientService._filtered_select(
+            fields or CLIENT_READ_FIELDS, search, status, sort_by, "updated_at"
+        )
+        
+        total = count_rows(db, statement, count_mode, ("clients", search, status))
+        
+        clients, next_cursor = paginate_keyset(
+            db, statement, sort_column, Client.id, sort_by, sort_order, page_size, cursor
+        )
+        
+        return clients, total, next_cursor
+    
+    @staticmethod
+    def get_export_query(
+        db: Session,
+        search: Optional[str] = None,
+        status: Optional[str] = None,
+        sort_by: str = "name",
+        sort_order: str = "asc"
+    ):
+        """
+        Build the query for exporting every client that matches the list filters.
+        Rows are not loaded here; the caller streams them.
+        """
+        sort_column = resolve_sort_column(Client, sort_by, CLIENT_SORT_FIELDS)
+        query = ClientService._filtered_query(db, search, status)
+        return apply_sort(query, sort_column, Client.id, sort_order)
+    
+    @staticmethod
+    def get_changes(
+        db: Session,
+        updated_since: Optional[str] = None,
+        limit: int = 500,
+        lag_seconds: float = 0.0
+    ) -> Tuple[List[Row], List[Row], str, bool]:
+        """
+        Get clients created or updated, and tombstones of clients deleted,
+        after a watermark (see services.changes.read_changes).
+        
+        Returns: (client_rows, tombstones, watermark, has_more)
+        """
+        return read_changes(
+            db, Client, "clients", CLIENT_READ_FIELDS, updated_since, limit, lag_seconds
+        )
+    
+    @staticmethod
+    def get_engagement_counts(db: Session, client_ids: Iterable[UUID]) -> Dict[UUID, int]:
+        """
+        Count engagements for a page of clients with one grouped query.
+        
+        Returns: {client_id: engagement_count}; clients without engagements are omitted
+        """
+        client_ids = list(client_ids)
+        if not client_ids:
+            return {}
+        
+        rows = (
+            db.query(Engagement.client_id, func.count(Engagement.id))
+            .filter(Engagement.client_id.in_(client_ids))
+            .group_by(Engagement.client_id)
+            .all()
+        )
+        return {client_id: count for client_id, count in rows}
+    
+    @staticmethod
+    def get_client_by_id(
+        db: Session,
+        client_id: UUID,
+        fields: Optional[Sequence[str]] = None
+    ) -> Optional[Client]:
+        """Get a single client by ID, selecting only `fields` (and updated_at) when given."""
+        query = project(db.query(Client), Client, fields, "updated_at")
+        return query.filter(Client.id == client_id).first()
     
     @staticmethod
     def create_client(db: Session, client_data: ClientCreate) -> Client:
         """Create a new client."""
         client = Client(**client_data.model_dump())
         db.add(client)
+        db.flush()
+        event_broadcaster.publish(db, "clients", "created", [client])
         db.commit()
+        count_cache.invalidate("clients")
         db.refresh(client)
+        response_cache.invalidate("clients", [_row_values(client)])
         return client
     
+    @staticmethod
+    def bulk_upsert_clients(
+        db: Session,
+        items: List[ClientBulkItem],
+        chunk_size: int = 1000
+    ) -> List[Tuple[UUID, bool]]:
+        """
+        Insert or update many clients with one multi-row upsert per chunk.
+        Items with an id update that client if it exists; the rest are created.
+        All chunks are committed together.
+        
+        Returns: [(client_id, created), ...] in the order of `items`
+        """
+        rows = []
+        for item in items:
+            row = item.model_dump()
+            row["id"] = row["id"] or uuid.uuid4()
+            rows.append(row)
+        
+        results = []
+        try:
+            for chunk in chunked(rows, chunk_size):
+                ids = [row["id"] for row in chunk]
+                existing = {
+                    client_id for (client_id,) in
+                    db.query(Client.id).filter(Client.id.in_(ids))
+                }
+                stmt = upsert_statement(db, Client.__table__, chunk, ["id"], CLIENT_WRITABLE_FIELDS)
+                written = set(db.execute(stmt).scalars())
+                results.extend(
+                    (client_id, client_id not in existing)
+                    for client_id in ids if client_id in written
+                )
+            event_broadcaster.publish_bulk(db, "clients", len(results))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        
+        count_cache.invalidate("clients")
+        response_cache.invalidate_all("clients")
+        return results
+    
     @staticmethod
     def update_client(
         db: Session,
         client_id: UUID,
-        client_data: ClientUpdate
+        client_data: ClientUpdate,
+        expected_updated_at: Optional[List[datetime]] = None
     ) -> Optional[Client]:
-        """Update an existing client."""
-        client = db.query(Client).filter(Client.id == client_id).first()
-        
-        if not client:
-            return None
+        """
+        Update an existing client with one UPDATE ... RETURNING statement.
         
+        With `expected_updated_at` (from If-Match) the row is only written
+        while its updated_at is one of those values; otherwise StaleWriteError
+        is raised. Returns None when the client does not exist.
+        """
         # Update only provided fields
         update_data = client_data.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(client, field, value)
+        if not update_data:
+            client = ClientService.get_client_by_id(db, client_id)
+            if client and expected_updated_at is not None and not version_matches(client.updated_at, expected_updated_at):
+                raise StaleWriteError(f"Client {client_id} was modified")
+            return client
         
+        clauses = [Client.id == client_id]
+        if expected_updated_at is not None:
+            clauses.append(Client.updated_at.in_(expected_updated_at))
+        
+        stmt = (
+            update(Client)
+            .where(*clauses)
+            .values(**update_data)
+            .returning(Client)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        client = db.execute(stmt).scalar_one_or_none()
+        
+        if not client:
+            db.rollback()
+            if expected_updated_at is not None and ClientService.get_client_by_id(db, client_id, ("id",)):
+                raise StaleWriteError(f"Client {client_id} was modified")
+            return None
+        
+        event_broadcaster.publish(db, "clients", "updated", [client], changed=list(update_data))
+        # Detach so commit does not expire the RETURNING values (no refresh SELECT)
+        db.expunge(client)
         db.commit()
-        db.refresh(client)
+        count_cache.invalidate("clients")
+        response_cache.invalidate("clients", [_row_values(client)], changed=list(update_data))
         return client
     
     @staticmethod
     def delete_client(db: Session, client_id: UUID) -> bool:
-        """Delete a client (cascades to engagements)."""
-        client = db.query(Client).filter(Client.id == client_id).first()
+        """
+        Delete a client with one DELETE ... RETURNING statement.
+        Engagements are removed by the ON DELETE CASCADE foreign key, not loaded.
+        Tombstones for the client and its engagements are written first, with
+        INSERT ... SELECT, in the same transaction.
+        """
+        record_deletions(
+            db, "engagements", Engagement.id, Engagement.client_id, Engagement.client_id == client_id
+        )
+        record_deletions(db, "clients", Client.id, null(), Client.id == client_id)
         
-        if not client:
+        stmt = delete(Client).where(Client.id == client_id).returning(
+            Client.id, Client.name, Client.pan, Client.email, Client.status
+        )
+        deleted = db.execute(stmt.execution_options(synchronize_session=False)).one_or_none()
+        
+        if deleted is None:
+            db.rollback()
             return False
         
-        db.delete(client)
+        event_broadcaster.publish(db, "clients", "deleted", [deleted._mapping])
+        event_broadcaster.publish(db, "engagements", "deleted", [{"client_id": client_id}])
         db.commit()
+        count_cache.invalidate("clients", "engagements")
+        response_cache.invalidate("clients", [deleted._mapping])
+        # Cascaded engagements are not loaded; only their client_id is known
+        response_cache.invalidate("engagements", [{"client_id": client_id}])
         return True
     
     @staticmethod
@@ -116,14 +381,18 @@ class ClientService:
         db: Session,
         client_id: UUID,
         page: int = 1,
-        page_size: int = 50
-    ) -> Tuple[List[Engagement], int]:
-        """Get paginated engagements for a specific client."""
-        query = db.query(Engagement).filter(Engagement.client_id == client_id)
+        page_size: int = 50,
+        count_mode: str = "exact"
+    ) -> Tuple[List[Row], Optional[int]]:
+        """Get paginated engagements for a specific client as read-only Core rows."""
+        statement = select_columns(Engagement, ENGAGEMENT_READ_FIELDS).where(
+            Engagement.client_id == client_id
+        )
         
-        total = query.count()
+        total = count_rows(db, statement, count_mode, ("engagements", client_id, None, None, None, None, None))
         
         offset = (page - 1) * page_size
-        engagements = query.order_by(Engagement.file_number.asc()).offset(offset).limit(page_size).all()
+        statement = statement.order_by(Engagement.file_number.asc())
+        engagements = db.execute(statement.offset(offset).limit(page_size)).all()
         
         return engagements, total
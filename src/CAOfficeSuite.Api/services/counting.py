@@ -0,0 +1,136 @@
+"""
+Total Counts
+Exact, estimated and skipped row counts for paginated list endpoints
+"""
+
+from sqlalchemy.orm import Session
+from sqlalchemy import Select, func, select
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from sqlalchemy.ext.compiler import compiles
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+import threading
+import time
+
+from ..config import get_settings
+
+COUNT_MODES = ("exact", "estimated", "none")
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) wrapper that keeps the inner statement's bind params."""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+class CountCache:
+    """
+    Bounded, TTL-limited cache of per-filter row counts.
+
+    Keys are tuples whose first element is the entity name ("clients",
+    "engagements"). Writes call invalidate(entity) to drop every cached count
+    for that entity. A per-entity generation number stops a count computed
+    before an invalidation from being stored after it.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple, Tuple[float, int]]" = OrderedDict()
+        self._generations: dict = {}
+        self._lock = threading.Lock()
+
+    def generation(self, entity: str) -> int:
+        """Current generation for an entity; bumped on every invalidation."""
+        with self._lock:
+            return self._generations.get(entity, 0)
+
+    def get(self, key: Tuple) -> Optional[int]:
+        """Return a fresh cached count, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, total = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return total
+
+    def set(self, key: Tuple, total: int, generation: int) -> None:
+        """Store a count unless its entity was invalidated since `generation`."""
+        with self._lock:
+            if self._generations.get(key[0], 0) != generation:
+                return
+            self._entries[key] = (time.monotonic(), total)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *entities: str) -> None:
+        """Drop all cached counts for the given entities."""
+        with self._lock:
+            for entity in entities:
+                self._generations[entity] = self._generations.get(entity, 0) + 1
+            for key in [k for k in self._entries if k[0] in entities]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop every cached count."""
+        with self._lock:
+            self._entries.clear()
+
+
+_settings = get_settings()
+count_cache = CountCache(
+    max_entries=_settings.count_cache_max_entries,
+    ttl_seconds=_settings.count_cache_ttl_seconds
+)
+
+
+def _exact_count(db: Session, statement: Select) -> int:
+    """COUNT(*) over the filtered statement."""
+    subquery = statement.order_by(None).subquery()
+    return db.execute(select(func.count()).select_from(subquery)).scalar_one()
+
+
+def _planner_estimate(db: Session, statement: Select) -> int:
+    """Row estimate from the PostgreSQL planner for the filtered statement."""
+    plan = db.execute(_Explain(statement.order_by(None))).scalar()
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_rows(db: Session, statement: Select, count_mode: str, cache_key: Tuple[Hashable, ...]) -> Optional[int]:
+    """
+    Count rows matched by a list statement according to count_mode.
+
+    - exact: COUNT(*) on every call
+    - estimated: cached per filter set until a write invalidates it; on a miss
+      PostgreSQL answers from planner statistics, other engines count exactly
+    - none: skip counting and return None
+    """
+    if count_mode == "none":
+        return None
+
+    if count_mode == "exact":
+        return _exact_count(db, statement)
+
+    total = count_cache.get(cache_key)
+    if total is not None:
+        return total
+
+    generation = count_cache.generation(cache_key[0])
+    if db.get_bind().dialect.name == "postgresql":
+        total = _planner_estimate(db, statement)
+    else:
+        total = _exact_count(db, statement)
+    count_cache.set(cache_key, total, generation)
+    return total
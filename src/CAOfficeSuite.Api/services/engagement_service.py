@@ -4,17 +4,133 @@ Business logic for engagement operations
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from typing import Optional, List, Tuple
+from sqlalchemy import Row, and_, or_, select, update, delete, tuple_
+from typing import Optional, List, Tuple, Set, Dict, Iterable, Sequence
+from datetime import datetime
 from uuid import UUID
 
+from ..models.client import Client
 from ..models.engagement import Engagement
+from ..models.deletion import Deletion
+from ..models.staff import Staff
 from ..schemas.engagement import EngagementCreate, EngagementUpdate
+from .pagination import resolve_sort_column, apply_sort, paginate_keyset
+from .counting import count_rows, count_cache
+from .cache import response_cache
+from .versioning import StaleWriteError, version_matches
+from .changes import read_changes, record_deletions
+from .events import event_broadcaster
+from .fields import project, select_columns
+from .bulk import chunked, upsert_statement
+from .staff_service import StaffService, normalize_staff_name, staff_key
+
+# Fields accepted by the sort_by query parameter
+ENGAGEMENT_SORT_FIELDS = (
+    "file_number", "file_number_as_per", "type", "type2", "senior",
+    "assistant", "status", "client_id", "created_at", "updated_at"
+)
+
+# Fields overwritten when a bulk upsert hits an existing (client_id, file_number)
+ENGAGEMENT_UPSERT_FIELDS = (
+    "file_number_as_per", "type", "type2", "senior", "assistant",
+    "senior_id", "assistant_id", "status"
+)
+
+# Fields selectable with the fields query parameter
+ENGAGEMENT_READ_FIELDS = (
+    "id", "client_id", "file_number", "file_number_as_per", "type", "type2",
+    "senior", "assistant", "senior_id", "assistant_id", "status", "created_at", "updated_at"
+)
+
+
+def _senior_matches(row, term: str) -> bool:
+    """
+    Python twin of the senior filter (see EngagementService._filter_clauses).
+    A linked engagement's senior is its staff member's stored name, so the
+    name text stands for both the staff and the unlinked-name branch.
+    """
+    term = normalize_staff_name(term)
+    if term is None:
+        return True
+    return staff_key(term) in (row["senior"] or "").lower()
+
+
+# How cached engagement lists (and live update subscribers) are matched against written rows
+ENGAGEMENT_FILTERS = {
+    "client_id": (("client_id",), lambda row, value: str(row["client_id"]) == value),
+    "status": (("status",), lambda row, value: row["status"] == value),
+    "type": (("type",), lambda row, value: row["type"] == value),
+    "senior": (("senior",), _senior_matches),
+    "senior_id": (("senior_id",), lambda row, value: row["senior_id"] == value),
+    "assistant_id": (("assistant_id",), lambda row, value: row["assistant_id"] == value),
+}
+response_cache.register_filters("engagements", ENGAGEMENT_FILTERS)
+event_broadcaster.register(
+    "engagements", ("id", "client_id", "status", "type", "senior", "senior_id"), ENGAGEMENT_FILTERS
+)
+
+
+def _row_values(engagement) -> Dict[str, object]:
+    """Column values of a written engagement, for cache invalidation."""
+    return {field: getattr(engagement, field) for field in ENGAGEMENT_READ_FIELDS}
 
 
 class EngagementService:
     """Service class for engagement-related operations."""
     
+    @staticmethod
+    def _filter_clauses(
+        client_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+        type: Optional[str] = None,
+        senior: Optional[str] = None,
+        senior_id: Optional[int] = None,
+        assistant_id: Optional[int] = None
+    ) -> list:
+        """Build WHERE clauses for the engagement list filters."""
+        clauses = []
+        
+        if client_id:
+            clauses.append(Engagement.client_id == client_id)
+        
+        if status:
+            clauses.append(Engagement.status == status)
+        
+        if type:
+            clauses.append(Engagement.type == type)
+        
+        senior = normalize_staff_name(senior)
+        if senior:
+            # Match names in the small staff table, then use the indexed
+            # senior_id; names never linked to staff (rows written before
+            # add_staff_table.py ran) are matched on their text
+            clauses.append(or_(
+                Engagement.senior_id.in_(
+                    select(Staff.id).where(Staff.name_key.contains(staff_key(senior), autoescape=True))
+                ),
+                and_(Engagement.senior_id.is_(None), Engagement.senior.icontains(senior, autoescape=True)),
+            ))
+        
+        if senior_id is not None:
+            clauses.append(Engagement.senior_id == senior_id)
+        
+        if assistant_id is not None:
+            clauses.append(Engagement.assistant_id == assistant_id)
+        
+        return clauses
+    
+    @staticmethod
+    def _filtered_query(db: Session, **filters):
+        """Build the engagement query with list filters (see _filter_clauses) applied."""
+        clauses = EngagementService._filter_clauses(**filters)
+        return db.query(Engagement).filter(*clauses)
+    
+    @staticmethod
+    def _filtered_select(fields: Sequence[str], *extra: str, **filters):
+        """Build the lean Core select() of `fields` (and `extra`) with list filters applied."""
+        clauses = EngagementService._filter_clauses(**filters)
+        return select_columns(Engagement, fields, *extra).where(*clauses)
+    
     @staticmethod
     def get_engagements(
         db: Session,
@@ -24,87 +140,314 @@ class EngagementService:
         status: Optional[str] = None,
         type: Optional[str] = None,
         senior: Optional[str] = None,
+        senior_id: Optional[int] = None,
+        assistant_id: Optional[int] = None,
         sort_by: str = "file_number",
-        sort_order: str = "asc"
-    ) -> Tuple[List[Engagement], int]:
+        sort_order: str = "asc",
+        count_mode: str = "exact",
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[List[Row], Optional[int]]:
         """
         Get paginated list of engagements with optional filtering and sorting.
+        Rows are read-only Core rows of `fields` (default: every readable field).
         
-        Returns: (engagements_list, total_count)
+        Returns: (engagement_rows, total_count); total_count is None when count_mode is "none"
         """
-        query = db.query(Engagement)
-        
-        # Apply filters
-        if client_id:
-            query = query.filter(Engagement.client_id == client_id)
-        
-        if status:
-            query = query.filter(Engagement.status == status)
-        
-        if type:
-            query = query.filter(Engagement.type == type)
-        
-        if senior:
-            query = query.filter(Engagement.senior.ilike(f"%{senior}%"))
+        sort_column = resolve_sort_column(Engagement, sort_by, ENGAGEMENT_SORT_FIELDS)
+        # updated_at is always selected; the page ETag is built from it
+        statement = EngagementService._filtered_select(
+            fields or ENGAGEMENT_READ_FIELDS, "updated_at", client_id=client_id, status=status,
+            type=type, senior=senior, senior_id=senior_id, assistant_id=assistant_id
+        )
         
         # Get total count before pagination
-        total = query.count()
+        total = count_rows(
+            db, statement, count_mode,
+            ("engagements", client_id, status, type, senior, senior_id, assistant_id)
+        )
         
         # Apply sorting
-        if sort_order.lower() == "desc":
-            query = query.order_by(getattr(Engagement, sort_by).desc())
-        else:
-            query = query.order_by(getattr(Engagement, sort_by).asc())
+        statement = apply_sort(statement, sort_column, Engagement.id, sort_order)
         
         # Apply pagination
         offset = (page - 1) * page_size
-        engagements = query.offset(offset).limit(page_size).all()
+        engagements = db.execute(statement.offset(offset).limit(page_size)).all()
         
         return engagements, total
     
     @staticmethod
-    def get_engagement_by_id(db: Session, engagement_id: UUID) -> Optional[Engagement]:
-        """Get a single engagement by ID."""
-        return db.query(Engagement).filter(Engagement.id == engagement_id).first()
+    def get_engagements_keyset(
+        db: Session,
+        page_size: int = 50,
+        cursor: Optional[str] = None,
+        client_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+        type: Optional[str] = None,
+        senior: Optional[str] = None,
+        senior_id: Optional[int] = None,
+        assistant_id: Optional[int] = None,
+        sort_by: str = "file_number",
+        sort_order: str = "asc",
+        count_mode: str = "exact",
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[List[Row], Optional[int], Optional[str]]:
+        """
+        Get a page of engagements by seeking past an opaque cursor.
+        Cost stays flat however deep the caller scrolls.
+        
+        Returns: (engagement_rows, total_count, next_cursor)
+        """
+        sort_column = resolve_sort_column(Engagement, sort_by, ENGAGEMENT_SORT_FIELDS)
+        # The sort column and updated_at are always selected for the cursor and ETag
+        statement = EngagementService._filtered_select(
+            fields or ENGAGEMENT_READ_FIELDS, sort_by, "updated_at", client_id=client_id, status=status,
+            type=type, senior=senior, senior_id=senior_id, assistant_id=assistant_id
+        )
+        
+        total = count_rows(
+            db, statement, count_mode,
+            ("engagements", client_id, status, type, senior, senior_id, assistant_id)
+        )
+        
+        engagements, next_cursor = paginate_keyset(
+            db, statement, sort_column, Engagement.id, sort_by, sort_order, page_size, cursor
+        )
+        
+        return engagements, total, next_cursor
+    
+    @staticmethod
+    def get_changes(
+        db: Session,
+        updated_since: Optional[str] = None,
+        limit: int = 500,
+        lag_seconds: float = 0.0,
+        client_id: Optional[UUID] = None
+    ) -> Tuple[List[Row], List[Row], str, bool]:
+        """
+        Get engagements created or updated, and tombstones of engagements
+        deleted, after a watermark, optionally for one client only
+        (see services.changes.read_changes).
+        
+        Returns: (engagement_rows, tombstones, watermark, has_more)
+        """
+        where, deletions_where = (), ()
+        if client_id:
+            where = (Engagement.client_id == client_id,)
+            deletions_where = (Deletion.client_id == client_id,)
+        return read_changes(
+            db, Engagement, "engagements", ENGAGEMENT_READ_FIELDS, updated_since, limit, lag_seconds,
+            where, deletions_where
+        )
+    
+    @staticmethod
+    def get_export_query(
+        db: Session,
+        client_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+        type: Optional[str] = None,
+        senior: Optional[str] = None,
+        senior_id: Optional[int] = None,
+        assistant_id: Optional[int] = None,
+        sort_by: str = "file_number",
+        sort_order: str = "asc"
+    ):
+        """
+        Build the query for exporting every engagement that matches the list filters.
+        Rows are not loaded here; the caller streams them.
+        """
+        sort_column = resolve_sort_column(Engagement, sort_by, ENGAGEMENT_SORT_FIELDS)
+        query = EngagementService._filtered_query(
+            db, client_id=client_id, status=status, type=type, senior=senior,
+            senior_id=senior_id, assistant_id=assistant_id
+        )
+        return apply_sort(query, sort_column, Engagement.id, sort_order)
+    
+    @staticmethod
+    def get_engagement_by_id(
+        db: Session,
+        engagement_id: UUID,
+        fields: Optional[Sequence[str]] = None
+    ) -> Optional[Engagement]:
+        """Get a single engagement by ID, selecting only `fields` (and updated_at) when given."""
+        query = project(db.query(Engagement), Engagement, fields, "updated_at")
+        return query.filter(Engagement.id == engagement_id).first()
     
     @staticmethod
     def create_engagement(db: Session, engagement_data: EngagementCreate) -> Engagement:
         """Create a new engagement."""
-        engagement = Engagement(**engagement_data.model_dump())
+        values = engagement_data.model_dump()
+        StaffService.assign(db, [values])
+        engagement = Engagement(**values)
         db.add(engagement)
+        db.flush()
+        event_broadcaster.publish(db, "engagements", "created", [engagement])
         db.commit()
+        count_cache.invalidate("engagements")
         db.refresh(engagement)
+        response_cache.invalidate("engagements", [_row_values(engagement)])
         return engagement
     
+    @staticmethod
+    def get_existing_client_ids(db: Session, client_ids: Iterable[UUID]) -> Set[UUID]:
+        """Return which of the given client IDs exist."""
+        client_ids = list(client_ids)
+        if not client_ids:
+            return set()
+        return {client_id for (client_id,) in db.query(Client.id).filter(Client.id.in_(client_ids))}
+    
+    @staticmethod
+    def bulk_upsert_engagements(
+        db: Session,
+        items: List[EngagementCreate],
+        chunk_size: int = 1000
+    ) -> List[Tuple[UUID, bool]]:
+        """
+        Insert or update many engagements with one multi-row upsert per chunk.
+        Rows are matched on the unique (client_id, file_number) constraint.
+        All chunks are committed together.
+        
+        Returns: [(engagement_id, created), ...] in the order of `items`
+        """
+        rows = [item.model_dump() for item in items]
+        
+        results = []
+        try:
+            StaffService.assign(db, rows)
+            for chunk in chunked(rows, chunk_size):
+                keys = [(row["client_id"], row["file_number"]) for row in chunk]
+                existing = {
+                    (client_id, file_number) for client_id, file_number in
+                    db.query(Engagement.client_id, Engagement.file_number)
+                    .filter(tuple_(Engagement.client_id, Engagement.file_number).in_(keys))
+                }
+                stmt = upsert_statement(
+                    db, Engagement.__table__, chunk,
+                    ["client_id", "file_number"], ENGAGEMENT_UPSERT_FIELDS
+                ).returning(Engagement.client_id, Engagement.file_number)
+                written = {(client_id, file_number): engagement_id for engagement_id, client_id, file_number in db.execute(stmt)}
+                results.extend((written[key], key not in existing) for key in keys if key in written)
+            event_broadcaster.publish_bulk(db, "engagements", len(results))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        
+        count_cache.invalidate("engagements")
+        response_cache.invalidate_all("engagements")
+        return results
+    
+    @staticmethod
+    def bulk_update_status(
+        db: Session,
+        new_status: str,
+        ids: Optional[List[UUID]] = None,
+        client_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+        type: Optional[str] = None,
+        senior: Optional[str] = None,
+        senior_id: Optional[int] = None,
+        assistant_id: Optional[int] = None
+    ) -> List[UUID]:
+        """
+        Move every engagement matching the ids and/or filters to `new_status`
+        with one UPDATE ... RETURNING statement.
+        
+        Returns: IDs of the updated engagements
+        """
+        clauses = EngagementService._filter_clauses(
+            client_id, status, type, senior, senior_id, assistant_id
+        )
+        if ids is not None:
+            clauses.append(Engagement.id.in_(ids))
+        
+        stmt = (
+            update(Engagement)
+            .where(*clauses)
+            .values(status=new_status)
+            .returning(Engagement.id)
+            .execution_options(synchronize_session=False)
+        )
+        updated_ids = list(db.execute(stmt).scalars())
+        event_broadcaster.publish_bulk(db, "engagements", len(updated_ids))
+        db.commit()
+        
+        count_cache.invalidate("engagements")
+        response_cache.invalidate_all("engagements")
+        return updated_ids
+    
     @staticmethod
     def update_engagement(
         db: Session,
         engagement_id: UUID,
-        engagement_data: EngagementUpdate
+        engagement_data: EngagementUpdate,
+        expected_updated_at: Optional[List[datetime]] = None
     ) -> Optional[Engagement]:
-        """Update an existing engagement."""
-        engagement = db.query(Engagement).filter(Engagement.id == engagement_id).first()
-        
-        if not engagement:
-            return None
+        """
+        Update an existing engagement with one UPDATE ... RETURNING statement.
         
+        With `expected_updated_at` (from If-Match) the row is only written
+        while its updated_at is one of those values; otherwise StaleWriteError
+        is raised. Returns None when the engagement does not exist.
+        """
         # Update only provided fields
         update_data = engagement_data.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(engagement, field, value)
+        if not update_data:
+            engagement = EngagementService.get_engagement_by_id(db, engagement_id)
+            if engagement and expected_updated_at is not None and not version_matches(engagement.updated_at, expected_updated_at):
+                raise StaleWriteError(f"Engagement {engagement_id} was modified")
+            return engagement
+        
+        StaffService.assign(db, [update_data])
+        
+        clauses = [Engagement.id == engagement_id]
+        if expected_updated_at is not None:
+            clauses.append(Engagement.updated_at.in_(expected_updated_at))
+        
+        stmt = (
+            update(Engagement)
+            .where(*clauses)
+            .values(**update_data)
+            .returning(Engagement)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        engagement = db.execute(stmt).scalar_one_or_none()
+        
+        if not engagement:
+            db.rollback()
+            if expected_updated_at is not None and EngagementService.get_engagement_by_id(db, engagement_id, ("id",)):
+                raise StaleWriteError(f"Engagement {engagement_id} was modified")
+            return None
         
+        event_broadcaster.publish(db, "engagements", "updated", [engagement], changed=list(update_data))
+        # Detach so commit does not expire the RETURNING values (no refresh SELECT)
+        db.expunge(engagement)
         db.commit()
-        db.refresh(engagement)
+        count_cache.invalidate("engagements")
+        response_cache.invalidate("engagements", [_row_values(engagement)], changed=list(update_data))
         return engagement
     
     @staticmethod
     def delete_engagement(db: Session, engagement_id: UUID) -> bool:
-        """Delete an engagement."""
-        engagement = db.query(Engagement).filter(Engagement.id == engagement_id).first()
+        """
+        Delete an engagement with one DELETE ... RETURNING statement, writing
+        its tombstone in the same transaction.
+        """
+        record_deletions(
+            db, "engagements", Engagement.id, Engagement.client_id, Engagement.id == engagement_id
+        )
         
-        if not engagement:
+        stmt = delete(Engagement).where(Engagement.id == engagement_id).returning(
+            Engagement.id, Engagement.client_id, Engagement.status, Engagement.type, Engagement.senior,
+            Engagement.senior_id, Engagement.assistant_id
+        )
+        deleted = db.execute(stmt.execution_options(synchronize_session=False)).one_or_none()
+        
+        if deleted is None:
+            db.rollback()
             return False
         
-        db.delete(engagement)
+        event_broadcaster.publish(db, "engagements", "deleted", [deleted._mapping])
         db.commit()
+        count_cache.invalidate("engagements")
+        response_cache.invalidate("engagements", [deleted._mapping])
         return True
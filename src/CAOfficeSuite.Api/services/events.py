@@ -0,0 +1,299 @@
+"""
+Live Update Events
+Fan-out of client and engagement change events to Server-Sent Event subscribers
+"""
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+from typing import Any, AsyncIterator, Dict, Iterable, List, Mapping, Optional, Sequence, Set
+import asyncio
+import select as _select
+import threading
+
+import orjson
+
+from ..config import get_settings
+from .cache import CacheFilter, filters_match
+
+# Session.info key holding events written in the open transaction
+_PENDING = "caos_pending_events"
+
+RESYNC_FRAME = b"event: resync\ndata: {}\n\n"
+HEARTBEAT_FRAME = b": keep-alive\n\n"
+
+
+# ============================================================================
+# Subscribers
+# ============================================================================
+
+class Subscription:
+    """
+    One live-update subscriber: the entities and filters it asked for and a
+    bounded queue of SSE frames, drained by its response on its event loop.
+    """
+
+    def __init__(self, entities: Iterable[str], filters: Dict[str, Any], queue_size: int):
+        self.entities = set(entities)
+        self.filters = filters
+        self.loop = asyncio.get_running_loop()
+        self.queue: "asyncio.Queue[bytes]" = asyncio.Queue(maxsize=queue_size)
+        self.resyncs = 0
+
+    def push(self, frame: bytes) -> None:
+        """
+        Queue a frame (on the subscriber's loop). A reader that falls a full
+        queue behind loses its backlog and gets one resync event instead, so
+        a slow tab never holds up writers or grows memory without bound.
+        """
+        if self.queue.full():
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.resyncs += 1
+            frame = RESYNC_FRAME
+        self.queue.put_nowait(frame)
+
+    async def next_frame(self, timeout: float) -> Optional[bytes]:
+        """Next queued frame, or None after `timeout` seconds without one."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+# ============================================================================
+# Broadcaster
+# ============================================================================
+
+class EventBroadcaster:
+    """
+    Per-process fan-out of change events to live-update subscribers.
+
+    Services publish the rows they write within the writing transaction.
+    Events are dispatched once it commits (rolled-back writes send nothing),
+    encoded once, and handed to every subscriber whose filters the row may
+    match. With a relay, events travel through the database instead, so
+    subscribers on every worker see writes made by any worker.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self.relay: Optional["PostgresEventRelay"] = None
+        self._subscribers: Set[Subscription] = set()
+        self._lock = threading.Lock()
+        self._fields: Dict[str, Sequence[str]] = {}
+        self._filters: Dict[str, Dict[str, CacheFilter]] = {}
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def register(self, entity: str, fields: Sequence[str], filters: Dict[str, CacheFilter]) -> None:
+        """Register the row fields an entity's events carry and how filters match them."""
+        self._fields[entity] = fields
+        self._filters[entity] = filters
+
+    def subscribe(self, entities: Iterable[str], filters: Dict[str, Any]) -> Subscription:
+        """Add a subscriber; call from the event loop that will drain it."""
+        subscription = Subscription(entities, filters, self.queue_size)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def _event(self, entity: str, op: str, row: Any) -> Dict[str, Any]:
+        values = row if isinstance(row, Mapping) else None
+        payload = {"entity": entity, "op": op}
+        for field in self._fields.get(entity, ("id",)):
+            if values is None:
+                payload[field] = getattr(row, field)
+            elif field in values:
+                payload[field] = values[field]
+        return payload
+
+    def publish(
+        self,
+        db: Session,
+        entity: str,
+        op: str,
+        rows: Iterable[Any],
+        changed: Sequence[str] = ()
+    ) -> None:
+        """
+        Publish created/updated/deleted `rows` (ORM objects, Core rows or
+        dicts; missing fields are unknown to filters) before `db` commits.
+        `changed` names the fields an update modified.
+        """
+        if self.relay is None and not self._subscribers:
+            return
+        events = [{**self._event(entity, op, row), "changed": list(changed)} for row in rows]
+        self._queue(db, events)
+
+    def publish_bulk(self, db: Session, entity: str, count: int) -> None:
+        """Publish one event for a bulk write; it reaches every subscriber of `entity`."""
+        if self.relay is None and not self._subscribers:
+            return
+        self._queue(db, [{"entity": entity, "op": "bulk", "count": count}])
+
+    def _queue(self, db: Session, events: List[Dict[str, Any]]) -> None:
+        if self.relay is not None:
+            self.relay.notify(db, events)
+        else:
+            db.info.setdefault(_PENDING, []).extend(events)
+
+    def dispatch(self, event: Dict[str, Any]) -> None:
+        """Encode a committed event once and hand it to each matching subscriber."""
+        payload = orjson.dumps(event)
+        # Match on the JSON form so relayed and local events compare alike
+        row = orjson.loads(payload)
+        entity = row["entity"]
+        frame = b"event: " + entity.encode() + b"\ndata: " + payload + b"\n\n"
+
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            if entity not in subscription.entities:
+                continue
+            if filters_match(self._filters.get(entity, {}), subscription.filters, row, row.get("changed", ())):
+                self._deliver(subscription, frame)
+
+    def _deliver(self, subscription: Subscription, frame: bytes) -> None:
+        try:
+            subscription.loop.call_soon_threadsafe(subscription.push, frame)
+        except RuntimeError:  # Its event loop has closed
+            self.unsubscribe(subscription)
+
+    def resync_all(self) -> None:
+        """Tell every subscriber it may have missed events (e.g. the relay reconnected)."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            self._deliver(subscription, RESYNC_FRAME)
+
+    def start(self) -> None:
+        if self.relay is not None:
+            self.relay.start()
+
+    def stop(self) -> None:
+        if self.relay is not None:
+            self.relay.stop()
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_committed(session: Session) -> None:
+    for pending in session.info.pop(_PENDING, ()):
+        event_broadcaster.dispatch(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session) -> None:
+    session.info.pop(_PENDING, None)
+
+
+async def sse_stream(
+    broadcaster: EventBroadcaster,
+    entities: Iterable[str],
+    filters: Dict[str, Any],
+    heartbeat_seconds: float = 15.0
+) -> AsyncIterator[bytes]:
+    """
+    Server-Sent Events body for one subscriber. Comments keep idle proxies
+    from closing the stream. The subscription starts with the body, so a
+    client gone before the first frame leaves nothing behind, and it is
+    removed when the client disconnects.
+    """
+    subscription = broadcaster.subscribe(entities, filters)
+    try:
+        yield b"retry: 5000\n\n"
+        while True:
+            frame = await subscription.next_frame(heartbeat_seconds)
+            yield HEARTBEAT_FRAME if frame is None else frame
+    finally:
+        broadcaster.unsubscribe(subscription)
+
+
+# ============================================================================
+# PostgreSQL Relay
+# ============================================================================
+
+class PostgresEventRelay:
+    """
+    Carries events between API workers with PostgreSQL LISTEN/NOTIFY.
+
+    Writers send NOTIFY in their own transaction, so PostgreSQL delivers it
+    on commit and drops it on rollback. Each worker holds one listening
+    connection, however many subscribers it serves.
+    """
+
+    channel = "caos_events"
+
+    def __init__(self, broadcaster: EventBroadcaster, engine, reconnect_seconds: float = 5.0):
+        self.broadcaster = broadcaster
+        self.engine = engine
+        self.reconnect_seconds = reconnect_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def notify(self, db: Session, events: List[Dict[str, Any]]) -> None:
+        for pending in events:
+            # NOTIFY payloads are limited to 8000 bytes; events carry ids and filter fields only
+            db.execute(select(func.pg_notify(self.channel, orjson.dumps(pending).decode())))
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="event-relay", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.reconnect_seconds)
+            self._thread = None
+
+    def _run(self) -> None:
+        connected_before = False
+        while not self._stop.is_set():
+            try:
+                connection = self.engine.raw_connection()
+            except Exception:
+                self._stop.wait(self.reconnect_seconds)
+                continue
+            try:
+                listener = connection.driver_connection
+                listener.autocommit = True
+                listener.cursor().execute(f"LISTEN {self.channel}")
+                if connected_before:
+                    # Events sent while disconnected are lost
+                    self.broadcaster.resync_all()
+                connected_before = True
+                self._listen(listener)
+            except Exception:
+                self._stop.wait(self.reconnect_seconds)
+            finally:
+                connection.invalidate()
+
+    def _listen(self, listener) -> None:
+        while not self._stop.is_set():
+            readable, _, _ = _select.select([listener], [], [], 1.0)
+            if not readable:
+                continue
+            listener.poll()
+            while listener.notifies:
+                notification = listener.notifies.pop(0)
+                self.broadcaster.dispatch(orjson.loads(notification.payload))
+
+
+def _build_event_broadcaster() -> EventBroadcaster:
+    """Create the broadcaster for the configured backend (memory or postgres)."""
+    settings = get_settings()
+    broadcaster = EventBroadcaster(queue_size=settings.events_queue_size)
+    if settings.events_backend.lower() == "postgres":
+        from ..database import engine
+        broadcaster.relay = PostgresEventRelay(broadcaster, engine)
+    return broadcaster
+
+
+event_broadcaster = _build_event_broadcaster()
@@ -0,0 +1,55 @@
+"""
+Sparse Fieldsets
+Parsing of the fields query parameter and column projection for list/detail reads
+"""
+
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Query, load_only
+from typing import Iterable, Optional, Sequence, Tuple
+
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a comma-separated fields parameter against the readable fields.
+
+    `id` is always included so rows stay addressable. Returns None when no
+    fields were requested (full records), otherwise the requested fields in
+    the order of `allowed`. Raises ValueError for unknown fields.
+    """
+    if not fields:
+        return None
+
+    requested = {part.strip() for part in fields.split(",") if part.strip()}
+    if not requested:
+        return None
+
+    unknown = requested - set(allowed)
+    if unknown:
+        raise ValueError(
+            f"Unknown field(s): {', '.join(sorted(unknown))}. Allowed: {', '.join(allowed)}"
+        )
+
+    requested.add("id")
+    return tuple(field for field in allowed if field in requested)
+
+
+def project(query: Query, model, fields: Optional[Iterable[str]], *extra: str) -> Query:
+    """
+    Narrow an ORM query's SELECT list to `fields` (plus `extra`); unrequested
+    columns are never read from the database. A None `fields` leaves the
+    query unchanged.
+    """
+    if fields is None:
+        return query
+    columns = dict.fromkeys([*fields, *extra])
+    return query.options(load_only(*(getattr(model, column) for column in columns)))
+
+
+def select_columns(model, fields: Iterable[str], *extra: str) -> Select:
+    """
+    Core SELECT of just `fields` (plus `extra`) for the lean list read path.
+    Rows come back as lightweight Row tuples: no ORM instances, identity map
+    entries or attribute instrumentation.
+    """
+    columns = dict.fromkeys([*fields, *extra])
+    return select(*(getattr(model, column) for column in columns))
@@ -0,0 +1,115 @@
+"""
+Pagination Helpers
+Sort-field whitelisting and opaque keyset cursors shared by list services
+"""
+
+from sqlalchemy import DateTime, Select, tuple_
+from sqlalchemy.orm import Session
+from typing import Any, Iterable, Optional, Tuple
+from datetime import datetime
+from uuid import UUID
+import base64
+import json
+import math
+
+
+def total_pages_for(total: Optional[int], page_size: int) -> Optional[int]:
+    """Number of pages for a total, or None when the total was not counted."""
+    if total is None:
+        return None
+    return math.ceil(total / page_size) if total > 0 else 0
+
+
+def resolve_sort_column(model, sort_by: str, allowed: Iterable[str]):
+    """
+    Resolve a whitelisted sort field to its model column.
+    Raises ValueError for fields that are not sortable.
+    """
+    if sort_by not in allowed:
+        raise ValueError(
+            f"Invalid sort field '{sort_by}'. Allowed: {', '.join(sorted(allowed))}"
+        )
+    return getattr(model, sort_by)
+
+
+def apply_sort(query, sort_column, id_column, sort_order: str):
+    """
+    Order by the sort column with the primary key as a stable tiebreaker.
+    Works on ORM queries and Core select() statements alike.
+    """
+    if sort_order.lower() == "desc":
+        return query.order_by(sort_column.desc(), id_column.desc())
+    return query.order_by(sort_column.asc(), id_column.asc())
+
+
+def encode_cursor(sort_by: str, sort_order: str, value: Any, row_id: UUID) -> str:
+    """Encode the position of the last row on a page as an opaque cursor."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = {"s": sort_by, "o": sort_order.lower(), "v": value, "id": str(row_id)}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, sort_order: str, sort_column) -> Tuple[Any, UUID]:
+    """
+    Decode a cursor produced by encode_cursor.
+    Raises ValueError if the cursor is malformed or was issued for a different sort.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        value, row_id = payload["v"], UUID(payload["id"])
+        issued_for = (payload["s"], payload["o"])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+
+    if issued_for != (sort_by, sort_order.lower()):
+        raise ValueError("Cursor does not match the requested sort_by/sort_order")
+
+    if isinstance(sort_column.type, DateTime) and value is not None:
+        value = datetime.fromisoformat(value)
+
+    return value, row_id
+
+
+def paginate_keyset(
+    db: Session,
+    statement: Select,
+    sort_column,
+    id_column,
+    sort_by: str,
+    sort_order: str,
+    page_size: int,
+    cursor: Optional[str] = None
+) -> Tuple[list, Optional[str]]:
+    """
+    Fetch one page by seeking past the cursor position instead of using OFFSET.
+    The sort column must be NOT NULL so (sort_column, id) is a strict total order,
+    and must be in the statement's SELECT list so the next cursor can be built.
+
+    Returns: (rows, next_cursor)
+    """
+    if sort_column.nullable:
+        raise ValueError(f"Cursor pagination is not supported for nullable field '{sort_by}'")
+
+    descending = sort_order.lower() == "desc"
+
+    if cursor:
+        value, row_id = decode_cursor(cursor, sort_by, sort_order, sort_column)
+        position = tuple_(sort_column, id_column)
+        boundary = tuple_(value, row_id)
+        statement = statement.where(position < boundary if descending else position > boundary)
+
+    statement = apply_sort(statement, sort_column, id_column, sort_order)
+
+    # Fetch one extra row to learn whether another page exists
+    rows = db.execute(statement.limit(page_size + 1)).all()
+    items = rows[:page_size]
+
+    next_cursor = None
+    if len(rows) > page_size:
+        last = items[-1]
+        next_cursor = encode_cursor(sort_by, sort_order, getattr(last, sort_column.key), last.id)
+
+    return items, next_cursor
@@ -0,0 +1,56 @@
+"""
+Client Search
+Indexed substring search and relevance ranking over the clients search column
+"""
+
+from sqlalchemy.orm import Session
+from sqlalchemy import case, func
+from typing import Optional
+
+from ..models.client import Client
+
+
+def _is_postgres(db: Session) -> bool:
+    """Return True when the session is bound to PostgreSQL."""
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def search_filter(term: str):
+    """
+    Build the search predicate for a user-supplied term.
+
+    Matches against the generated `search_document` column (lowercased name,
+    PAN and email). On PostgreSQL the GIN trigram index serves this LIKE, so
+    typeahead does not fall back to a sequential scan. Wildcards typed by the
+    user are escaped.
+    """
+    return Client.search_document.contains(term.strip().lower(), autoescape=True)
+
+
+def search_matches(term: str, name: str, pan: str, email: Optional[str]) -> bool:
+    """
+    Python twin of search_filter for a single row's values, kept in step with
+    the search_document expression. Used to decide which cached lists a write
+    can affect.
+    """
+    document = f"{name} {pan} {email or ''}".lower()
+    return term.strip().lower() in document
+
+
+def search_rank(db: Session, term: str):
+    """
+    Build a relevance expression for ordering search results (higher is better).
+
+    PostgreSQL ranks by pg_trgm word similarity. Other engines (SQLite in
+    tests) use a coarse ranking: exact PAN, then name prefix, then any match.
+    """
+    needle = term.strip().lower()
+
+    if _is_postgres(db):
+        return func.word_similarity(needle, Client.search_document)
+
+    return case(
+        (func.lower(Client.pan) == needle, 2),
+        (func.lower(Client.name).startswith(needle, autoescape=True), 1),
+        else_=0
+    )
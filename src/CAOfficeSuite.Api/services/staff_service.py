@@ -0,0 +1,86 @@
+"""
+Staff Service
+Resolves staff names to staff rows and lists staff
+"""
+
+from sqlalchemy.orm import Session
+from sqlalchemy import Row, select
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..models.staff import Staff
+from .bulk import insert_missing_statement
+
+# Engagement columns holding a staff name, and the id column each resolves to
+STAFF_ROLES = (("senior", "senior_id"), ("assistant", "assistant_id"))
+
+
+def normalize_staff_name(name: Optional[str]) -> Optional[str]:
+    """Trim and collapse whitespace; blank names become None."""
+    if name is None:
+        return None
+    return " ".join(name.split()) or None
+
+
+def staff_key(name: str) -> str:
+    """Identity of a normalized name: the same person whatever the letter case."""
+    return name.lower()
+
+
+class StaffService:
+    """Service class for staff operations."""
+
+    @staticmethod
+    def get_staff(db: Session, search: Optional[str] = None) -> List[Row]:
+        """Get staff (id, name) ordered by name, optionally matching part of the name."""
+        statement = select(Staff.id, Staff.name)
+        term = normalize_staff_name(search)
+        if term:
+            statement = statement.where(Staff.name_key.contains(staff_key(term), autoescape=True))
+        return db.execute(statement.order_by(Staff.name_key)).all()
+
+    @staticmethod
+    def resolve(db: Session, names: Iterable[Optional[str]]) -> Dict[str, Tuple[int, str]]:
+        """
+        Find or create the staff members with these names, in the caller's
+        transaction. New names are inserted with one statement; a name that
+        already exists under another spelling resolves to that member.
+
+        Returns: {name_key: (staff_id, name as stored)}
+        """
+        wanted = {}
+        for name in names:
+            name = normalize_staff_name(name)
+            if name is not None:
+                wanted.setdefault(staff_key(name), name)
+        if not wanted:
+            return {}
+
+        def lookup():
+            rows = db.execute(select(Staff.name_key, Staff.id, Staff.name).where(Staff.name_key.in_(wanted)))
+            return {key: (staff_id, name) for key, staff_id, name in rows}
+
+        found = lookup()
+        missing = [{"name": name, "name_key": key} for key, name in wanted.items() if key not in found]
+        if missing:
+            # Concurrent writers may add the same names; theirs are kept
+            db.execute(insert_missing_statement(db, Staff.__table__, missing, ["name_key"]))
+            found = lookup()
+        return found
+
+    @staticmethod
+    def assign(db: Session, rows: List[Dict[str, Any]]) -> None:
+        """
+        Point engagement value dicts at staff rows: every senior/assistant
+        name present is replaced by the stored spelling and its id is set
+        alongside (None for blank names).
+        """
+        names = [row[column] for row in rows for column, _ in STAFF_ROLES if column in row]
+        staff = StaffService.resolve(db, names)
+
+        for row in rows:
+            for column, id_column in STAFF_ROLES:
+                if column not in row:
+                    continue
+                name = normalize_staff_name(row[column])
+                staff_id, row[column] = staff[staff_key(name)] if name is not None else (None, None)
+                row[id_column] = staff_id
@@ -0,0 +1,30 @@
+"""
+Row Versions
+updated_at-based row versions for ETags and optimistic concurrency
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class StaleWriteError(Exception):
+    """Raised when a conditional write finds the row at a different version."""
+
+
+def version_of(updated_at: datetime) -> int:
+    """Row version: updated_at as whole microseconds since the epoch (naive = UTC)."""
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    return (updated_at - _EPOCH) // timedelta(microseconds=1)
+
+
+def updated_at_of(version: int) -> datetime:
+    """Inverse of version_of, exact to the microsecond."""
+    return _EPOCH + timedelta(microseconds=version)
+
+
+def version_matches(updated_at: datetime, expected: Iterable[datetime]) -> bool:
+    """True when `updated_at` is one of `expected`, compared as versions."""
+    return version_of(updated_at) in {version_of(value) for value in expected}
@@ -4,6 +4,7 @@ Pytest configuration and fixtures for FastAPI tests
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -15,6 +16,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from main import app
 from database import get_db, Base
+from services.cache import response_cache
 
 # Test database URL (in-memory SQLite for testing)
 TEST_DATABASE_URL = "sqlite:///:memory:"
@@ -30,6 +32,14 @@ engine = create_engine(
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    """Each test starts with an empty response cache (tests share one process)."""
+    response_cache.clear()
+    yield
+    response_cache.clear()
+
+
 @pytest.fixture(scope="function")
 def db_session():
     """Create a fresh database session for each test."""
@@ -57,6 +67,28 @@ def client(db_session):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(scope="function")
+def async_client():
+    """Create a test client whose routes run on an aiosqlite AsyncSession."""
+    async_engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        poolclass=StaticPool,
+    )
+    AsyncTestingSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_db():
+        async with async_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncTestingSessionLocal() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    with TestClient(app) as test_client:
+        yield test_client
+        test_client.portal.call(async_engine.dispose)
+    app.dependency_overrides.clear()
+
+
 @pytest.fixture
 def sample_client_data():
     """Sample client data for testing."""
@@ -0,0 +1,70 @@
+"""
+Tests for the engagement summary endpoint and its trigger-maintained tables
+"""
+from fastapi import status
+
+SUMMARY_URL = "/api/v1/analytics/engagements/summary"
+
+
+def create_engagements(client, sample_client_data, sample_engagement_data):
+    """Create one client with engagements in three status/type/senior groups."""
+    created = client.post("/api/v1/clients", json=sample_client_data).json()
+    variants = [
+        {"type": "ITR", "senior": "Senior CA", "status": "active"},
+        {"type": "ITR", "senior": "Senior CA", "status": "active"},
+        {"type": "GST", "senior": None, "status": "active"},
+        {"type": "GST", "senior": None, "status": "completed"},
+    ]
+    engagements = []
+    for number, variant in enumerate(variants, start=1):
+        response = client.post("/api/v1/engagements", json={
+            **sample_engagement_data, **variant, "client_id": created["id"], "file_number": number
+        })
+        engagements.append(response.json())
+    return created, engagements
+
+
+def test_summary_groups_follow_writes(client, sample_client_data, sample_engagement_data):
+    """Test that counts track creates, updates and deletes."""
+    created, engagements = create_engagements(client, sample_client_data, sample_engagement_data)
+
+    data = client.get(SUMMARY_URL).json()
+    assert data["total"] == 4
+    assert data["groups"][0] == {"status": "active", "type": "ITR", "senior": "Senior CA", "count": 2}
+    assert {"status": "completed", "type": "GST", "senior": None, "count": 1} in data["groups"]
+
+    client.put(f"/api/v1/engagements/{engagements[0]['id']}", json={"status": "completed"})
+    client.delete(f"/api/v1/engagements/{engagements[2]['id']}")
+
+    data = client.get(f"{SUMMARY_URL}?group_by=status").json()
+    assert data["groups"] == [{"status": "completed", "count": 2}, {"status": "active", "count": 1}]
+
+    # Deleting the client cascades to its engagements; empty groups disappear
+    client.delete(f"/api/v1/clients/{created['id']}")
+    data = client.get(SUMMARY_URL).json()
+    assert data == {"group_by": ["status", "type", "senior"], "total": 0, "groups": []}
+
+
+def test_summary_by_client(client, sample_client_data, sample_engagement_data):
+    """Test per-client counts, filters and bulk status changes."""
+    created, engagements = create_engagements(client, sample_client_data, sample_engagement_data)
+
+    client.patch("/api/v1/engagements/bulk-status", json={
+        "status": "completed", "ids": [engagements[0]["id"], engagements[1]["id"]]
+    })
+
+    data = client.get(f"{SUMMARY_URL}?group_by=client_id&status=completed").json()
+    assert data["total"] == 3
+    assert data["groups"] == [{"client_id": created["id"], "client_name": "Test Client", "count": 3}]
+
+    data = client.get(f"{SUMMARY_URL}?group_by=type&senior=Senior CA").json()
+    assert data["groups"] == [{"type": "ITR", "count": 2}]
+
+
+def test_summary_rejects_unsupported_grouping(client):
+    """Test that unknown dimensions and client/type combinations are rejected."""
+    response = client.get(f"{SUMMARY_URL}?group_by=assistant")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = client.get(f"{SUMMARY_URL}?group_by=client_id,type")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
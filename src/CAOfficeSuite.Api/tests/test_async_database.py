@@ -0,0 +1,42 @@
+"""
+Tests for API routes running on the async database path
+"""
+from fastapi import status
+
+
+def test_async_client_crud(async_client, sample_client_data):
+    """Test client create, read, update and delete through an AsyncSession."""
+    response = async_client.post("/api/v1/clients", json=sample_client_data)
+    assert response.status_code == status.HTTP_201_CREATED
+    client_id = response.json()["id"]
+
+    response = async_client.get(f"/api/v1/clients/{client_id}")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["name"] == sample_client_data["name"]
+
+    response = async_client.put(f"/api/v1/clients/{client_id}", json={"name": "Async Client"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["name"] == "Async Client"
+
+    response = async_client.delete(f"/api/v1/clients/{client_id}")
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert async_client.get(f"/api/v1/clients/{client_id}").status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_async_list_with_engagement_counts(async_client, sample_client_data, sample_engagement_data):
+    """Test list endpoints and engagement counts through an AsyncSession."""
+    client_id = async_client.post("/api/v1/clients", json=sample_client_data).json()["id"]
+    for file_number in (1, 2):
+        engagement_data = {**sample_engagement_data, "client_id": client_id, "file_number": file_number}
+        response = async_client.post("/api/v1/engagements", json=engagement_data)
+        assert response.status_code == status.HTTP_201_CREATED
+
+    response = async_client.get("/api/v1/clients?include=engagement_count&pagination=cursor")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["items"][0]["engagement_count"] == 2
+
+    response = async_client.get(f"/api/v1/clients/{client_id}/engagements")
+    assert response.json()["total"] == 2
+
+    response = async_client.get("/api/v1/engagements?sort_order=desc")
+    assert [item["file_number"] for item in response.json()["items"]] == [2, 1]
@@ -1,8 +1,15 @@
 """
 Tests for client API endpoints
 """
+import gzip
+import json
+
 import pytest
 from fastapi import status
+from sqlalchemy import event
+
+from models.client import Client
+from models.engagement import Engagement
 
 
 def test_create_client(client, sample_client_data):
@@ -137,3 +144,299 @@ def test_get_clients_filtering(client, sample_client_data):
     assert data["total"] == 1
     assert data["items"][0]["status"] == "active"
 
+
+
+def test_get_clients_cursor_pagination(client, sample_client_data):
+    """Test walking clients with keyset cursors."""
+    for i in range(5):
+        client_data = {**sample_client_data, "name": f"Client {i}", "pan": f"ABCDE123{i}F"}
+        client.post("/api/v1/clients", json=client_data)
+
+    names = []
+    response = client.get("/api/v1/clients?pagination=cursor&page_size=2")
+    while True:
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        names.extend(item["name"] for item in data["items"])
+        if not data["next_cursor"]:
+            break
+        response = client.get(f"/api/v1/clients?page_size=2&cursor={data['next_cursor']}")
+
+    assert names == [f"Client {i}" for i in range(5)]
+
+
+def test_get_clients_cursor_sort_mismatch(client, sample_client_data):
+    """Test that a cursor is rejected when the sort changes."""
+    for i in range(3):
+        client_data = {**sample_client_data, "name": f"Client {i}", "pan": f"ABCDE123{i}F"}
+        client.post("/api/v1/clients", json=client_data)
+
+    response = client.get("/api/v1/clients?pagination=cursor&page_size=1")
+    next_cursor = response.json()["next_cursor"]
+
+    response = client.get(f"/api/v1/clients?page_size=1&sort_order=desc&cursor={next_cursor}")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_get_clients_invalid_sort_field(client):
+    """Test that non-whitelisted sort fields are rejected."""
+    response = client.get("/api/v1/clients?sort_by=__table__")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_search_clients_relevance(client, sample_client_data):
+    """Test searching clients across name, PAN and email with relevance ranking."""
+    clients = [
+        {**sample_client_data, "name": "Ravi Traders", "pan": "ABCDE1111F", "email": "ravi@example.com"},
+        {**sample_client_data, "name": "Sri Ravi Associates", "pan": "ABCDE2222F", "email": "accounts@sri.in"},
+        {**sample_client_data, "name": "Tech Solutions", "pan": "RAVIX3333F", "email": "info@tech.in"},
+        {**sample_client_data, "name": "Unrelated Co", "pan": "ABCDE4444F", "email": "x@y.in"},
+    ]
+    for client_data in clients:
+        client.post("/api/v1/clients", json=client_data)
+
+    response = client.get("/api/v1/clients?search=RAVI&sort_by=relevance")
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["total"] == 3
+    assert data["items"][0]["name"] == "Ravi Traders"
+
+    response = client.get("/api/v1/clients?search=abcde2222f")
+    assert [item["name"] for item in response.json()["items"]] == ["Sri Ravi Associates"]
+
+
+def test_search_clients_escapes_wildcards(client, sample_client_data):
+    """Test that LIKE wildcards in the search term are matched literally."""
+    client.post("/api/v1/clients", json=sample_client_data)
+
+    response = client.get("/api/v1/clients?search=%25")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["total"] == 0
+
+
+def test_get_clients_count_modes(client, sample_client_data):
+    """Test exact, estimated and skipped totals."""
+    for i in range(2):
+        client_data = {**sample_client_data, "name": f"Client {i}", "pan": f"ABCDE123{i}F"}
+        client.post("/api/v1/clients", json=client_data)
+
+    data = client.get("/api/v1/clients?count=none").json()
+    assert data["total"] is None
+    assert data["total_pages"] is None
+    assert data["count_mode"] == "none"
+    assert len(data["items"]) == 2
+
+    data = client.get("/api/v1/clients?count=estimated").json()
+    assert data["total"] == 2
+    assert data["count_mode"] == "estimated"
+
+    # Writes invalidate cached estimates
+    client.post("/api/v1/clients", json={**sample_client_data, "name": "Client 2", "pan": "ABCDE1232F"})
+    data = client.get("/api/v1/clients?count=estimated").json()
+    assert data["total"] == 3
+    assert data["total_pages"] == 1
+
+
+def test_get_clients_include_engagement_count(client, sample_client_data, sample_engagement_data):
+    """Test listing clients with engagement counts."""
+    busy = client.post("/api/v1/clients", json={**sample_client_data, "name": "Busy Client"}).json()
+    client.post("/api/v1/clients", json={**sample_client_data, "name": "Idle Client", "pan": "ABCDE1235F"})
+
+    for file_number in (1, 2, 3):
+        engagement_data = {**sample_engagement_data, "client_id": busy["id"], "file_number": file_number}
+        client.post("/api/v1/engagements", json=engagement_data)
+
+    response = client.get("/api/v1/clients?include=engagement_count")
+    assert response.status_code == status.HTTP_200_OK
+    counts = {item["name"]: item["engagement_count"] for item in response.json()["items"]}
+    assert counts == {"Busy Client": 3, "Idle Client": 0}
+
+    # Counts are only returned when requested
+    response = client.get("/api/v1/clients")
+    assert "engagement_count" not in response.json()["items"][0]
+
+    response = client.get("/api/v1/clients?include=invoices")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_get_clients_sparse_fields(client, db_session, sample_client_data):
+    """Test that fields narrows both the SELECT list and the response."""
+    created = client.post("/api/v1/clients", json=sample_client_data).json()
+
+    statements = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db_session.get_bind(), "before_cursor_execute", record)
+    try:
+        response = client.get("/api/v1/clients?fields=name,status&count=none")
+    finally:
+        event.remove(db_session.get_bind(), "before_cursor_execute", record)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["items"] == [{"id": created["id"], "name": "Test Client", "status": "active"}]
+    selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    assert selects and not any("address" in s for s in selects)
+
+    # Cursor pagination and engagement counts work with a sparse selection
+    response = client.get("/api/v1/clients?fields=pan&pagination=cursor&include=engagement_count")
+    assert response.json()["items"] == [
+        {"id": created["id"], "pan": sample_client_data["pan"], "engagement_count": 0}
+    ]
+
+    response = client.get(f"/api/v1/clients/{created['id']}?fields=email")
+    assert response.json() == {"id": created["id"], "email": sample_client_data["email"]}
+
+    response = client.get("/api/v1/clients?fields=name,secret")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_get_clients_reads_rows_without_orm_instances(client, sample_client_data, sample_engagement_data):
+    """Test that list reads build no ORM instances and return the same payload."""
+    created = client.post("/api/v1/clients", json=sample_client_data).json()
+    client.post("/api/v1/engagements", json={**sample_engagement_data, "client_id": created["id"]})
+
+    loaded = []
+    def record(target, context):
+        loaded.append(target)
+
+    event.listen(Client, "load", record)
+    event.listen(Engagement, "load", record)
+    try:
+        clients = client.get("/api/v1/clients").json()["items"]
+        cursor_page = client.get("/api/v1/clients?pagination=cursor").json()["items"]
+        engagements = client.get("/api/v1/engagements").json()["items"]
+    finally:
+        event.remove(Client, "load", record)
+        event.remove(Engagement, "load", record)
+
+    assert loaded == []
+    assert clients == cursor_page == [created]
+    assert engagements[0]["client_id"] == created["id"]
+
+
+def test_bulk_upsert_clients(client, sample_client_data):
+    """Test creating and updating clients in bulk with per-record results."""
+    existing = client.post("/api/v1/clients", json=sample_client_data).json()
+
+    records = [
+        {**sample_client_data, "id": existing["id"], "name": "Renamed Client"},
+        {**sample_client_data, "name": "New Client", "pan": "ABCDE1235F"},
+        {**sample_client_data, "name": "Bad PAN", "pan": "INVALID"},
+    ]
+    response = client.post("/api/v1/clients/bulk", json=records)
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert (data["created"], data["updated"], data["failed"]) == (1, 1, 1)
+    assert [result["status"] for result in data["results"]] == ["updated", "created", "error"]
+    assert data["results"][0]["id"] == existing["id"]
+    assert "pan" in data["results"][2]["errors"][0]
+
+    renamed = client.get(f"/api/v1/clients/{existing['id']}").json()
+    assert renamed["name"] == "Renamed Client"
+    assert renamed["created_at"] == existing["created_at"]
+    assert client.get("/api/v1/clients").json()["total"] == 2
+
+
+def test_bulk_upsert_clients_ndjson(client, sample_client_data):
+    """Test bulk client creation from an NDJSON body."""
+    lines = [
+        json.dumps({**sample_client_data, "name": f"Client {i}", "pan": f"ABCDE123{i}F"})
+        for i in range(3)
+    ]
+    response = client.post(
+        "/api/v1/clients/bulk",
+        content="\n".join(lines),
+        headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["created"] == 3
+
+    response = client.post("/api/v1/clients/bulk", content="{not json", headers={"Content-Type": "application/json"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_export_clients_csv(client, sample_client_data):
+    """Test streaming clients as CSV with the list filters applied."""
+    client.post("/api/v1/clients", json=sample_client_data)
+    client.post("/api/v1/clients", json={**sample_client_data, "name": "Inactive Client", "pan": "ABCDE1235F", "status": "inactive"})
+
+    response = client.get("/api/v1/clients/export?status=active")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/csv")
+    lines = response.text.strip().splitlines()
+    assert lines[0].split(",")[:2] == ["name", "pan"]
+    assert len(lines) == 2
+    assert lines[1].startswith("Test Client,ABCDE1234F")
+
+
+def test_export_clients_ndjson_gzip(client, sample_client_data):
+    """Test streaming clients as gzipped NDJSON."""
+    for i in range(3):
+        client.post("/api/v1/clients", json={**sample_client_data, "name": f"Client {i}", "pan": f"ABCDE123{i}F"})
+
+    response = client.get("/api/v1/clients/export?format=ndjson&gzip=true")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/gzip"
+    records = [json.loads(line) for line in gzip.decompress(response.content).decode().splitlines()]
+    assert [record["name"] for record in records] == ["Client 0", "Client 1", "Client 2"]
+
+
+def test_delete_client_cascades_to_engagements(client, sample_client_data, sample_engagement_data):
+    """Test that deleting a client removes its engagements via the foreign key."""
+    client_id = client.post("/api/v1/clients", json=sample_client_data).json()["id"]
+    engagement_id = client.post(
+        "/api/v1/engagements", json={**sample_engagement_data, "client_id": client_id}
+    ).json()["id"]
+
+    response = client.delete(f"/api/v1/clients/{client_id}")
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    assert client.get(f"/api/v1/engagements/{engagement_id}").status_code == status.HTTP_404_NOT_FOUND
+    assert client.delete(f"/api/v1/clients/{client_id}").status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.fixture
+def settled_changes(monkeypatch):
+    """Serve change feeds without holding back recent writes."""
+    from config import get_settings
+    monkeypatch.setattr(get_settings(), "change_feed_lag_seconds", 0.0)
+
+
+def test_client_change_feed(client, sample_client_data, settled_changes):
+    """Test paging through client changes and tombstones with the watermark."""
+    ids = [
+        client.post("/api/v1/clients", json={**sample_client_data, "pan": f"ABCDE{i:04d}F"}).json()["id"]
+        for i in range(3)
+    ]
+    client.put(f"/api/v1/clients/{ids[1]}", json={"name": "Renamed"})
+    client.delete(f"/api/v1/clients/{ids[2]}")
+
+    items, deleted, watermark = {}, [], None
+    while True:
+        params = {"limit": 1, **({"updated_since": watermark} if watermark else {})}
+        response = client.get("/api/v1/clients/changes", params=params)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        items.update((item["id"], item) for item in data["items"])
+        deleted += [tombstone["id"] for tombstone in data["deleted"]]
+        watermark = data["watermark"]
+        if not data["has_more"]:
+            break
+
+    assert set(items) == set(ids[:2])
+    assert items[ids[1]]["name"] == "Renamed"
+    assert deleted == [ids[2]]
+
+    # Nothing new since the last watermark
+    data = client.get("/api/v1/clients/changes", params={"updated_since": watermark}).json()
+    assert (data["items"], data["deleted"], data["watermark"]) == ([], [], watermark)
+
+
+def test_client_change_feed_invalid_watermark(client):
+    """Test that an unreadable watermark is rejected."""
+    response = client.get("/api/v1/clients/changes", params={"updated_since": "not-a-watermark"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = client.get("/api/v1/clients/changes", params={"updated_since": "2030-01-01T00:00:00Z"})
+    assert response.json()["items"] == []
@@ -3,6 +3,10 @@ Tests for engagement API endpoints
 """
 import pytest
 from fastapi import status
+from sqlalchemy import update
+
+from models.engagement import Engagement
+from services.engagement_service import _senior_matches
 
 
 def test_create_engagement(client, db_session, sample_client_data, sample_engagement_data):
@@ -86,3 +90,206 @@ def test_delete_engagement(client, db_session, sample_client_data, sample_engage
     get_response = client.get(f"/api/v1/engagements/{engagement_id}")
     assert get_response.status_code == status.HTTP_404_NOT_FOUND
 
+
+
+def test_get_engagements_cursor_pagination_desc(client, db_session, sample_client_data, sample_engagement_data):
+    """Test walking engagements with keyset cursors in descending order."""
+    client_response = client.post("/api/v1/clients", json=sample_client_data)
+    client_id = client_response.json()["id"]
+
+    for file_number in range(1, 6):
+        engagement_data = {**sample_engagement_data, "client_id": client_id, "file_number": file_number}
+        client.post("/api/v1/engagements", json=engagement_data)
+
+    file_numbers = []
+    cursor = None
+    while True:
+        url = "/api/v1/engagements?pagination=cursor&page_size=2&sort_order=desc"
+        if cursor:
+            url += f"&cursor={cursor}"
+        response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        file_numbers.extend(item["file_number"] for item in data["items"])
+        cursor = data["next_cursor"]
+        if not cursor:
+            break
+
+    assert file_numbers == [5, 4, 3, 2, 1]
+
+
+def test_bulk_upsert_engagements(client, db_session, sample_client_data, sample_engagement_data):
+    """Test bulk engagement upsert keyed on (client_id, file_number)."""
+    client_id = client.post("/api/v1/clients", json=sample_client_data).json()["id"]
+    existing = client.post(
+        "/api/v1/engagements", json={**sample_engagement_data, "client_id": client_id}
+    ).json()
+
+    records = [
+        {**sample_engagement_data, "client_id": client_id, "status": "Filed"},
+        {**sample_engagement_data, "client_id": client_id, "file_number": 1002},
+        {**sample_engagement_data, "client_id": "00000000-0000-0000-0000-000000000000", "file_number": 1},
+        {**sample_engagement_data, "client_id": client_id, "file_number": 1002},
+    ]
+    response = client.post("/api/v1/engagements/bulk", json=records)
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [result["status"] for result in data["results"]] == ["updated", "created", "error", "error"]
+    assert data["results"][0]["id"] == existing["id"]
+
+    engagement = client.get(f"/api/v1/engagements/{existing['id']}").json()
+    assert engagement["status"] == "Filed"
+
+
+def test_bulk_update_engagement_status(client, db_session, sample_client_data, sample_engagement_data):
+    """Test moving engagements to a new status by filter and by ids."""
+    client_id = client.post("/api/v1/clients", json=sample_client_data).json()["id"]
+    ids = []
+    for file_number, engagement_status in ((1, "Pending for Tax payment"), (2, "Pending for Tax payment"), (3, "Details Received")):
+        engagement_data = {**sample_engagement_data, "client_id": client_id, "file_number": file_number, "status": engagement_status}
+        ids.append(client.post("/api/v1/engagements", json=engagement_data).json()["id"])
+
+    response = client.patch(
+        "/api/v1/engagements/bulk-status",
+        json={"status": "Filed", "filter": {"status": "Pending for Tax payment"}}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["updated"] == 2
+    assert sorted(data["ids"]) == sorted(ids[:2])
+
+    response = client.patch("/api/v1/engagements/bulk-status", json={"status": "Filed", "ids": [ids[2]]})
+    assert response.json()["ids"] == [ids[2]]
+    assert client.get("/api/v1/engagements?status=Filed").json()["total"] == 3
+
+    # Refuse to update every engagement by accident
+    response = client.patch("/api/v1/engagements/bulk-status", json={"status": "Filed"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_export_engagements_filtered(client, db_session, sample_client_data, sample_engagement_data):
+    """Test streaming engagements as CSV filtered by status."""
+    client_id = client.post("/api/v1/clients", json=sample_client_data).json()["id"]
+    for file_number, engagement_status in ((1, "Filed"), (2, "Pending"), (3, "Filed")):
+        engagement_data = {**sample_engagement_data, "client_id": client_id, "file_number": file_number, "status": engagement_status}
+        client.post("/api/v1/engagements", json=engagement_data)
+
+    response = client.get("/api/v1/engagements/export?status=Filed&sort_order=desc")
+    assert response.status_code == status.HTTP_200_OK
+    lines = response.text.strip().splitlines()
+    assert len(lines) == 3
+    header = lines[0].split(",")
+    file_numbers = [line.split(",")[header.index("file_number")] for line in lines[1:]]
+    assert file_numbers == ["3", "1"]
+
+    response = client.get("/api/v1/engagements/export?sort_by=bogus")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_update_engagement_not_found(client):
+    """Test updating and deleting a non-existent engagement."""
+    missing = "00000000-0000-0000-0000-000000000000"
+    response = client.put(f"/api/v1/engagements/{missing}", json={"status": "Filed"})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    response = client.delete(f"/api/v1/engagements/{missing}")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_get_engagements_sparse_fields(client, db_session, sample_client_data, sample_engagement_data):
+    """Test selecting a subset of engagement fields on list and detail."""
+    client_id = client.post("/api/v1/clients", json=sample_client_data).json()["id"]
+    engagement_data = {**sample_engagement_data, "client_id": client_id}
+    engagement_id = client.post("/api/v1/engagements", json=engagement_data).json()["id"]
+
+    response = client.get("/api/v1/engagements?fields=file_number,status")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["items"] == [{
+        "id": engagement_id,
+        "file_number": sample_engagement_data["file_number"],
+        "status": sample_engagement_data["status"]
+    }]
+
+    response = client.get(f"/api/v1/engagements/{engagement_id}?fields=type")
+    assert response.json() == {"id": engagement_id, "type": sample_engagement_data["type"]}
+
+
+def test_engagement_change_feed_reports_cascaded_deletes(client, sample_client_data, sample_engagement_data, monkeypatch):
+    """Test that engagements removed with their client appear as tombstones."""
+    from config import get_settings
+    monkeypatch.setattr(get_settings(), "change_feed_lag_seconds", 0.0)
+
+    created = client.post("/api/v1/clients", json=sample_client_data).json()
+    engagement = client.post(
+        "/api/v1/engagements", json={**sample_engagement_data, "client_id": created["id"]}
+    ).json()
+
+    data = client.get("/api/v1/engagements/changes", params={"client_id": created["id"]}).json()
+    assert [item["id"] for item in data["items"]] == [engagement["id"]]
+
+    client.delete(f"/api/v1/clients/{created['id']}")
+    data = client.get("/api/v1/engagements/changes", params={"updated_since": data["watermark"]}).json()
+    assert data["items"] == []
+    assert [(t["id"], t["client_id"]) for t in data["deleted"]] == [(engagement["id"], created["id"])]
+
+
+def test_staff_names_resolve_to_one_member(client, db_session, sample_client_data, sample_engagement_data):
+    """Test that spelling variants of a staff name share one staff id and filter exactly."""
+    created_client = client.post("/api/v1/clients", json=sample_client_data).json()
+    engagement_data = {**sample_engagement_data, "client_id": created_client["id"], "senior": "Ajay "}
+    first = client.post("/api/v1/engagements", json=engagement_data).json()
+    client.post("/api/v1/engagements/bulk", json=[
+        {**engagement_data, "file_number": 1002, "senior": "ajay", "assistant": "  Ravi  Kumar"},
+        {**engagement_data, "file_number": 1003, "senior": "Meena", "assistant": " "},
+    ])
+    
+    staff = client.get("/api/v1/staff").json()["items"]
+    assert [member["name"] for member in staff] == ["Ajay", "Assistant Name", "Meena", "Ravi Kumar"]
+    ajay = staff[0]["id"]
+    assert first["senior"] == "Ajay" and first["senior_id"] == ajay
+    
+    data = client.get(f"/api/v1/engagements?senior_id={ajay}").json()
+    assert sorted(item["file_number"] for item in data["items"]) == [1001, 1002]
+    assert {item["senior"] for item in data["items"]} == {"Ajay"}
+    assert client.get("/api/v1/engagements?senior=aja").json()["total"] == 2
+    
+    meena = client.get("/api/v1/engagements?senior=Meena").json()["items"][0]
+    assert meena["assistant"] is None and meena["assistant_id"] is None
+    
+    # Reassigning moves the engagement between staff filters
+    client.put(f"/api/v1/engagements/{first['id']}", json={"senior": "MEENA"})
+    assert client.get(f"/api/v1/engagements?senior_id={ajay}").json()["total"] == 1
+    assert client.get("/api/v1/staff?search=ee").json()["items"] == [staff[2]]
+
+
+def test_senior_filter_matches_unlinked_names_and_escapes_wildcards(
+    client, db_session, sample_client_data, sample_engagement_data
+):
+    """Test that names without a staff link still match and that % and _ match literally."""
+    created_client = client.post("/api/v1/clients", json=sample_client_data).json()
+    engagement_data = {**sample_engagement_data, "client_id": created_client["id"]}
+    client.post("/api/v1/engagements/bulk", json=[
+        {**engagement_data, "file_number": 1, "senior": "Ajay"},
+        {**engagement_data, "file_number": 2, "senior": "Meena"},
+        {**engagement_data, "file_number": 3, "senior": "R_K 100%"},
+    ])
+    # As left by an import before add_staff_table.py ran
+    db_session.execute(
+        update(Engagement).where(Engagement.file_number == 2).values(senior="Meena  Iyer", senior_id=None)
+    )
+    db_session.commit()
+
+    def file_numbers(term):
+        data = client.get("/api/v1/engagements", params={"senior": term}).json()
+        return sorted(item["file_number"] for item in data["items"])
+
+    assert file_numbers("aja") == [1]
+    assert file_numbers("MEENA") == [2]
+    assert file_numbers("%") == [3]
+    assert file_numbers("_") == [3]
+    assert file_numbers("a%") == []
+
+    # Cache and live update matching agree with the SQL filter
+    rows = [{"senior": "Ajay"}, {"senior": "Meena  Iyer"}, {"senior": "R_K 100%"}]
+    for term in ("aja", "MEENA", "%", "_", "a%", "  Ajay "):
+        assert [n + 1 for n, row in enumerate(rows) if _senior_matches(row, term)] == file_numbers(term)
@@ -0,0 +1,86 @@
+"""
+Tests for live update events and their Server-Sent Events stream
+"""
+import orjson
+from fastapi import status
+
+from schemas.client import ClientCreate, ClientUpdate
+from services.client_service import ClientService
+from routers.events import stream_events
+from services.events import RESYNC_FRAME, Subscription, event_broadcaster, sse_stream
+
+
+def event_data(frame):
+    """Decode the JSON data line of an SSE frame."""
+    return orjson.loads(frame.split(b"data: ", 1)[1])
+
+
+async def test_events_follow_committed_writes(db_session, sample_client_data):
+    """Test that subscribers get committed writes matching their filters."""
+    subscription = event_broadcaster.subscribe({"clients"}, {"status": "inactive"})
+    try:
+        # An active client never matches status=inactive
+        client = ClientService.create_client(db_session, ClientCreate(**sample_client_data))
+        assert await subscription.next_frame(0.05) is None
+
+        # Leaving or entering the filtered set is always reported
+        ClientService.update_client(db_session, client.id, ClientUpdate(status="inactive"))
+        frame = await subscription.next_frame(1)
+        assert frame.startswith(b"event: clients\n")
+        assert event_data(frame) == {
+            "entity": "clients", "op": "updated", "id": str(client.id),
+            "status": "inactive", "changed": ["status"]
+        }
+
+        ClientService.delete_client(db_session, client.id)
+        assert event_data(await subscription.next_frame(1))["op"] == "deleted"
+    finally:
+        event_broadcaster.unsubscribe(subscription)
+
+
+async def test_rolled_back_writes_send_nothing(db_session):
+    """Test that events are only dispatched once their transaction commits."""
+    subscription = event_broadcaster.subscribe({"clients", "engagements"}, {})
+    try:
+        event_broadcaster.publish(db_session, "clients", "created", [{"id": "x", "status": "active"}])
+        db_session.rollback()
+        assert await subscription.next_frame(0.05) is None
+    finally:
+        event_broadcaster.unsubscribe(subscription)
+
+
+async def test_slow_subscriber_gets_resync():
+    """Test that a full queue is replaced by a single resync event."""
+    subscription = Subscription({"clients"}, {}, queue_size=2)
+    for frame in (b"1", b"2", b"3"):
+        subscription.push(frame)
+
+    assert await subscription.next_frame(0.05) == RESYNC_FRAME
+    assert await subscription.next_frame(0.05) is None
+    assert subscription.resyncs == 1
+
+
+async def test_sse_stream_heartbeat_and_unsubscribe():
+    """Test the stream's retry hint, heartbeats and cleanup on disconnect."""
+    stream = sse_stream(event_broadcaster, {"clients"}, {}, heartbeat_seconds=0.01)
+
+    assert await stream.__anext__() == b"retry: 5000\n\n"
+    assert event_broadcaster.subscriber_count == 1
+    assert await stream.__anext__() == b": keep-alive\n\n"
+    await stream.aclose()
+    assert event_broadcaster.subscriber_count == 0
+
+
+async def test_event_stream_disconnect_before_first_frame_leaves_no_subscriber():
+    """Test that a response whose body never starts does not hold a subscription."""
+    response = await stream_events(entities="clients", client_id=None, status=None, senior="Ajay")
+    assert event_broadcaster.subscriber_count == 0
+
+    await response.body_iterator.aclose()
+    assert event_broadcaster.subscriber_count == 0
+
+
+def test_event_stream_rejects_unknown_entities(client):
+    """Test that the stream validates its entities parameter."""
+    response = client.get("/api/v1/events?entities=clients,invoices")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
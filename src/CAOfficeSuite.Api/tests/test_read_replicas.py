@@ -0,0 +1,58 @@
+"""
+Tests for read-replica session routing
+"""
+import time
+
+from starlette.requests import Request
+
+from database import ReplicaRouter, wants_primary
+from config import get_settings
+
+
+def make_request(cookies: str = "") -> Request:
+    """Build a bare request carrying the given Cookie header."""
+    headers = [(b"cookie", cookies.encode())] if cookies else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def test_replica_router_round_robin(tmp_path):
+    """Test that successive sessions rotate across healthy replicas."""
+    urls = [f"sqlite:///{tmp_path / 'replica_a.db'}", f"sqlite:///{tmp_path / 'replica_b.db'}"]
+    router = ReplicaRouter(urls)
+
+    used = []
+    for _ in range(4):
+        db = router.open_session()
+        used.append(str(db.get_bind().url))
+        db.close()
+
+    assert used == [urls[0], urls[1], urls[0], urls[1]]
+
+
+def test_replica_router_skips_unreachable_replica(tmp_path):
+    """Test that a replica failing its connection check is marked down and skipped."""
+    good = f"sqlite:///{tmp_path / 'replica.db'}"
+    bad = f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"
+    router = ReplicaRouter([bad, good], retry_seconds=60)
+
+    db = router.open_session()
+    assert str(db.get_bind().url) == good
+    db.close()
+
+    assert [replica.url for replica in router.replicas_in_turn()] == [good]
+
+
+def test_replica_router_no_healthy_replica(tmp_path):
+    """Test that open_session returns None so callers fall back to the primary."""
+    router = ReplicaRouter([f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"])
+    assert router.open_session() is None
+
+
+def test_wants_primary_after_recent_write():
+    """Test read-your-writes stickiness from the last-write cookie."""
+    cookie = get_settings().read_your_writes_cookie
+
+    assert wants_primary(make_request(f"{cookie}={time.time()}"))
+    assert not wants_primary(make_request(f"{cookie}={time.time() - 3600}"))
+    assert not wants_primary(make_request(f"{cookie}=garbage"))
+    assert not wants_primary(make_request())
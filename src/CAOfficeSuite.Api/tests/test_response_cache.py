@@ -0,0 +1,190 @@
+"""
+Tests for the GET response cache and its write-driven invalidation
+"""
+import fnmatch
+import time
+from contextlib import contextmanager
+
+from fastapi import status
+from sqlalchemy import event
+
+from services.cache import MemoryCacheBackend, RedisCacheBackend, ResponseCache
+
+
+@contextmanager
+def count_queries(db_session):
+    """Collect the SQL statements run while the block executes."""
+    statements = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db_session.get_bind(), "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(db_session.get_bind(), "before_cursor_execute", record)
+
+
+def test_list_is_served_from_cache(client, db_session, sample_client_data):
+    """Test that a repeated list request does not touch the database."""
+    client.post("/api/v1/clients", json=sample_client_data)
+    first = client.get("/api/v1/clients?status=active")
+
+    with count_queries(db_session) as statements:
+        # Same parameters in a different order, plus an explicit default
+        second = client.get("/api/v1/clients?sort_order=asc&status=active")
+
+    assert statements == []
+    assert second.json() == first.json()
+
+
+def test_writes_invalidate_only_matching_lists(client, db_session, sample_client_data):
+    """Test that a write drops the lists its row matches and keeps the rest."""
+    created = client.post("/api/v1/clients", json=sample_client_data).json()
+    client.get("/api/v1/clients?status=active")
+    client.get("/api/v1/clients?status=inactive")
+    client.get(f"/api/v1/clients/{created['id']}")
+
+    # A new active client cannot appear in the inactive list
+    client.post("/api/v1/clients", json={**sample_client_data, "pan": "ABCDE1235F"})
+    with count_queries(db_session) as statements:
+        client.get("/api/v1/clients?status=inactive")
+        client.get(f"/api/v1/clients/{created['id']}")
+    assert statements == []
+
+    assert client.get("/api/v1/clients?status=active").json()["total"] == 2
+
+    # Changing status leaves both lists and the detail stale
+    client.put(f"/api/v1/clients/{created['id']}", json={"status": "inactive"})
+    assert client.get("/api/v1/clients?status=active").json()["total"] == 1
+    assert client.get("/api/v1/clients?status=inactive").json()["total"] == 1
+    assert client.get(f"/api/v1/clients/{created['id']}").json()["status"] == "inactive"
+
+    client.delete(f"/api/v1/clients/{created['id']}")
+    assert client.get("/api/v1/clients?status=inactive").json()["total"] == 0
+    assert client.get(f"/api/v1/clients/{created['id']}").status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_engagement_writes_invalidate_dependent_client_lists(client, sample_client_data, sample_engagement_data):
+    """Test that engagement counts on a cached client page follow engagement writes."""
+    created = client.post("/api/v1/clients", json=sample_client_data).json()
+    url = "/api/v1/clients?include=engagement_count"
+    assert client.get(url).json()["items"][0]["engagement_count"] == 0
+
+    client.post("/api/v1/engagements", json={**sample_engagement_data, "client_id": created["id"]})
+    assert client.get(url).json()["items"][0]["engagement_count"] == 1
+    assert client.get(f"/api/v1/clients/{created['id']}/engagements").json()["total"] == 1
+
+    # Deleting the client cascades to its engagements
+    client.delete(f"/api/v1/clients/{created['id']}")
+    assert client.get("/api/v1/engagements").json()["total"] == 0
+
+
+def test_cache_key_normalization():
+    """Test that parameter order and unset values do not change the key."""
+    assert ResponseCache.key("clients", "list", page=1, status=None, search="a") == \
+        ResponseCache.key("clients", "list", search="a", page=1)
+    assert ResponseCache.key("clients", "list", page=1) != ResponseCache.key("clients", "list", page=2)
+
+
+def test_stale_generation_is_not_stored():
+    """Test that a response computed before an invalidation is discarded."""
+    cache = ResponseCache(MemoryCacheBackend())
+    generation = cache.generation("clients")
+    cache.invalidate("clients", [{"id": "x", "status": "active"}])
+
+    cache.set("k", b"{}", generation, "clients")
+    assert cache.get("k") is None
+
+    cache.set("k", b"{}", cache.generation("clients"), "clients")
+    assert cache.get("k") == (b"{}", None)
+
+
+def test_memory_backend_ttl_and_lru():
+    """Test that entries expire and the oldest entry is evicted."""
+    backend = MemoryCacheBackend(max_entries=2, ttl_seconds=60)
+    for key in ("a", "b", "c"):
+        backend.set(key, key.encode(), {})
+    assert backend.get("a") is None
+    assert backend.get("c") == b"c"
+
+    backend.ttl_seconds = 0
+    time.sleep(0.01)
+    assert backend.get("c") is None
+
+
+class FakeRedis:
+    """Dict-backed stand-in for the redis client calls used by RedisCacheBackend."""
+
+    def __init__(self):
+        self.data = {}
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def exists(self, key):
+        return int(key in self.data)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def hset(self, name, key, value):
+        self.data.setdefault(name, {})[key.encode() if isinstance(key, str) else key] = value
+
+    def hgetall(self, name):
+        return dict(self.data.get(name, {}))
+
+    def hdel(self, name, *keys):
+        for key in keys:
+            self.data.get(name, {}).pop(key.encode(), None)
+
+    def hmget(self, name, *keys):
+        fields = self.data.get(name, {})
+        return [fields.get(key.encode()) for key in keys]
+
+    def hincrby(self, name, key, amount):
+        fields = self.data.setdefault(name, {})
+        fields[key.encode()] = int(fields.get(key.encode(), 0)) + amount
+
+    def scan_iter(self, pattern):
+        return [key for key in list(self.data) if fnmatch.fnmatch(key, pattern)]
+
+
+class FakePipeline:
+    """Queues calls and runs them on execute(), like a redis pipeline."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((getattr(self.redis, name), args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        return [method(*args, **kwargs) for method, args, kwargs in self.calls]
+
+
+def test_redis_backend_invalidation():
+    """Test filter-aware invalidation through the Redis backend."""
+    cache = ResponseCache(RedisCacheBackend(FakeRedis()))
+    cache.register_filters("clients", {"status": (("status",), lambda row, value: row["status"] == value)})
+
+    for value in ("active", "inactive"):
+        cache.set(value, value.encode(), cache.generation("clients"), "clients", filters={"status": value})
+
+    cache.invalidate("clients", [{"id": "x", "status": "active"}])
+    assert cache.get("active") is None
+    assert cache.get("inactive") == (b"inactive", None)
+
+    cache.invalidate_all("clients")
+    assert cache.get("inactive") is None
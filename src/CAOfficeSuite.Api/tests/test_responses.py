@@ -0,0 +1,152 @@
+"""
+Tests for JSON rendering, response compression and conditional requests
+"""
+import gzip
+
+import pytest
+from fastapi import status
+
+from middleware import choose_encoding, encoded_etag
+from responses import etag_matches, if_match_versions, row_etag
+from services.cache import response_cache
+
+
+def test_list_response_matches_schema(client, sample_client_data):
+    """Test that the orjson list path renders the documented response shape."""
+    created = client.post("/api/v1/clients", json=sample_client_data).json()
+
+    response = client.get("/api/v1/clients")
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert list(data) == ["items", "total", "page", "page_size", "total_pages", "count_mode", "next_cursor"]
+    assert data["items"] == [created]
+
+
+def test_large_responses_are_compressed(client, sample_client_data):
+    """Test that bodies over the threshold are gzipped and small ones are not."""
+    for i in range(20):
+        client.post("/api/v1/clients", json={**sample_client_data, "pan": f"ABCDE{i:04d}F"})
+
+    response = client.get("/api/v1/clients", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert len(response.json()["items"]) == 20
+
+    response = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+    response = client.get("/api/v1/clients", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+
+
+def test_compressed_bodies_get_their_own_etag(client, sample_client_data):
+    """Test that a gzip body's strong ETag is suffixed and still revalidates."""
+    for i in range(20):
+        client.post("/api/v1/clients", json={**sample_client_data, "pan": f"ABCDE{i:04d}F"})
+
+    identity = client.get("/api/v1/clients", headers={"Accept-Encoding": "identity"}).headers["etag"]
+    compressed = client.get("/api/v1/clients", headers={"Accept-Encoding": "gzip"}).headers["etag"]
+    assert compressed == identity[:-1] + '-gzip"'
+
+    response = client.get("/api/v1/clients", headers={"Accept-Encoding": "gzip", "If-None-Match": compressed})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["etag"] == compressed
+
+    response = client.get("/api/v1/clients", headers={"Accept-Encoding": "identity", "If-None-Match": compressed})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["etag"] == identity
+
+
+def test_exports_are_not_recompressed(client, sample_client_data):
+    """Test that streamed exports pass through the compression middleware."""
+    for i in range(20):
+        client.post("/api/v1/clients", json={**sample_client_data, "pan": f"ABCDE{i:04d}F"})
+
+    response = client.get("/api/v1/clients/export?gzip=true", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert gzip.decompress(response.content).count(b"\n") == 21
+
+
+def test_detail_not_modified(client, sample_client_data):
+    """Test that a detail read answers a matching If-None-Match with 304."""
+    created = client.post("/api/v1/clients", json=sample_client_data).json()
+    url = f"/api/v1/clients/{created['id']}"
+
+    etag = client.get(url).headers["etag"]
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+    # Same answer when the body is not cached
+    response_cache.clear()
+    assert client.get(url, headers={"If-None-Match": f"W/{etag}"}).status_code == status.HTTP_304_NOT_MODIFIED
+
+    # A sparse representation has its own ETag
+    sparse = client.get(f"{url}?fields=name", headers={"If-None-Match": etag})
+    assert sparse.status_code == status.HTTP_200_OK
+    assert sparse.headers["etag"] != etag
+
+
+def test_list_etag_follows_writes(client, sample_client_data):
+    """Test that a list ETag is stable until the page changes."""
+    client.post("/api/v1/clients", json=sample_client_data)
+    etag = client.get("/api/v1/clients").headers["etag"]
+    assert client.get("/api/v1/clients", headers={"If-None-Match": etag}).status_code == status.HTTP_304_NOT_MODIFIED
+
+    client.post("/api/v1/clients", json={**sample_client_data, "pan": "ABCDE1235F"})
+    response = client.get("/api/v1/clients", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["etag"] != etag
+    assert response.json()["total"] == 2
+
+
+def test_if_match_update(client, sample_client_data):
+    """Test that PUT with a stale If-Match is refused with 412."""
+    created = client.post("/api/v1/clients", json=sample_client_data).json()
+    url = f"/api/v1/clients/{created['id']}"
+    etag = client.get(url).headers["etag"]
+
+    response = client.put(url, json={"name": "Lost Update"}, headers={"If-Match": '"1"'})
+    assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+    assert client.get(url).json()["name"] == sample_client_data["name"]
+
+    # If-Match uses strong comparison
+    response = client.put(url, json={"name": "Weak"}, headers={"If-Match": f"W/{etag}"})
+    assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+
+    response = client.put(url, json={"name": "Renamed"}, headers={"If-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["name"] == "Renamed"
+    assert response.headers["etag"] == client.get(url).headers["etag"]
+
+    missing = "/api/v1/clients/00000000-0000-0000-0000-000000000000"
+    assert client.put(missing, json={"name": "x"}, headers={"If-Match": etag}).status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_etag_helpers():
+    """Test ETag formatting and If-None-Match / If-Match parsing."""
+    etag = row_etag(if_match_versions('"1700000000123456"')[0])
+    assert etag == '"1700000000123456"'
+    assert row_etag(if_match_versions(etag)[0], ("id", "name")).startswith('"1700000000123456-')
+
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert etag_matches(encoded_etag(etag, "br"), etag)
+    assert encoded_etag(f"W/{etag}", "gzip") == f"W/{etag}"
+
+    assert if_match_versions(None) is None
+    assert if_match_versions("*") is None
+    assert if_match_versions('W/"1", "p-abc"') == []
+
+
+@pytest.mark.parametrize("header,expected", [
+    ("gzip, deflate", "gzip"),
+    ("gzip;q=0, deflate", None),
+    ("identity", None),
+    ("", None),
+])
+def test_choose_encoding(header, expected):
+    """Test Accept-Encoding negotiation."""
+    assert choose_encoding(header) == expected
@@ -0,0 +1,281 @@
+"""
+Tests for the client CSV importer's streaming pipeline (no database needed)
+"""
+import csv
+import logging
+import sys
+from itertools import islice
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("psycopg2")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "tools" / "migrations"))
+
+import import_clients_csv as importer  # noqa: E402
+
+HEADER = "Serial Number,File_Number,File_Number_As_Per,Client_Name,PAN,Type,Type2,Senior,Assistant,Status"
+
+
+def csv_line(n, pan=None, file_number=None):
+    """One export row; `pan` and `file_number` override the valid defaults."""
+    serial = f"00000000-0000-4000-8000-{n:012d}"
+    pan = pan or f"ABCDE{n:04d}F"
+    file_number = file_number or str(n % 3 + 1)
+    return f'{serial},{file_number},F{n},"Client {n}",{pan},ITR,,Ravi,,Pending'
+
+
+def new_counts():
+    """Empty counters as import_csv passes them."""
+    return {"rows_read": 0, "rows_valid": 0, "rows_invalid": 0}
+
+
+def spooled(keys):
+    """The keys written to a KeySpool, in order."""
+    keys.file.seek(0)
+    return [tuple(key) for key in csv.reader(keys.file)]
+
+
+@pytest.fixture
+def export_csv(tmp_path):
+    """An export of 60 rows with blank lines and 6 invalid rows spread through it."""
+    lines = [HEADER]
+    for n in range(60):
+        if n % 11 == 5:
+            lines.append("")
+        if n % 13 == 7:
+            lines.append(csv_line(n, pan="BADPAN"))
+        elif n == 40:
+            lines.append(csv_line(n, file_number="x"))
+        else:
+            lines.append(csv_line(n))
+    path = tmp_path / "export.csv"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def sequential(path, position=None, normalize=False):
+    """validated_rows (or staging_records) over read_rows, with counts and invalid keys."""
+    counts = new_counts()
+    invalid_keys = importer.KeySpool()
+    rows = importer.validated_rows(importer.read_rows(path, position), counts, invalid_keys)
+    if normalize:
+        rows = importer.staging_records(rows)
+    return list(rows), counts, spooled(invalid_keys)
+
+
+def test_read_rows_numbers_rows_and_tracks_offset(export_csv):
+    """Test that rows are numbered from 2 past blank lines and the offset reaches the end."""
+    position = {}
+    rows = list(importer.read_rows(export_csv, position))
+
+    assert len(rows) == 60
+    assert [line for line, _ in rows] == list(range(2, 62))
+    assert rows[0][1]["Client_Name"] == "Client 0"
+    assert position == {"offset": export_csv.stat().st_size, "line": 61}
+
+
+def test_validated_rows_skips_logs_and_spools_invalid_rows(export_csv, caplog):
+    """Test that invalid rows are counted, logged with their line and spooled, not yielded."""
+    with caplog.at_level(logging.WARNING, logger=importer.logger.name):
+        rows, counts, invalid_keys = sequential(export_csv)
+
+    assert counts == {"rows_read": 60, "rows_valid": 54, "rows_invalid": 6}
+    assert len(rows) == 54
+    assert "Row 9: Invalid PAN format: BADPAN" in caplog.text
+    assert "Row 42: Invalid file number: x" in caplog.text
+    assert invalid_keys[0] == ("00000000-0000-4000-8000-000000000007", "2")
+    assert ("00000000-0000-4000-8000-000000000040", "x") in invalid_keys
+
+
+def test_key_spool_quotes_empty_keys():
+    """Test that empty key parts are quoted, so COPY reads them as '' instead of NULL."""
+    keys = importer.KeySpool()
+    keys.add(("", '1,"2'))
+    keys.file.seek(0)
+
+    assert keys.file.read() == '"","1,""2"\r\n'
+    assert keys.count == 1
+
+
+def test_staging_records_normalize_optional_fields():
+    """Test that blank optional fields become None and names are whitespace-normalized."""
+    row = next(csv.DictReader([HEADER, csv_line(3).replace(",Ravi,", ",  Ravi   Kumar ,")]))
+    row["Type2"] = "  "
+
+    assert importer.staging_record(4, row) == (
+        4, "00000000-0000-4000-8000-000000000003", "Client 3", "ABCDE0003F", 1,
+        "F3", "ITR", None, "Ravi Kumar", None, "Pending",
+    )
+
+
+def test_csv_chunks_batches_rows_and_writes_none_as_null():
+    """Test that records are encoded in batches and None becomes an empty (NULL) field."""
+    chunks = list(importer.csv_chunks(((n, None, "a,b") for n in range(5)), batch_rows=2))
+
+    assert chunks == ['0,,"a,b"\n1,,"a,b"\n', '2,,"a,b"\n3,,"a,b"\n', '4,,"a,b"\n']
+
+
+def parallel(path, position=None, normalize=False):
+    """parallel_rows with two workers and small byte ranges."""
+    counts = new_counts()
+    invalid_keys = importer.KeySpool()
+    rows = importer.parallel_rows(
+        path, 2, counts, normalize=normalize, position=position,
+        invalid_keys=invalid_keys, chunk_bytes=256
+    )
+    return list(rows), counts, spooled(invalid_keys)
+
+
+def test_byte_ranges_cover_file_at_line_breaks(export_csv):
+    """Test that ranges are contiguous, end at line breaks and stop at the file end."""
+    data = export_csv.read_bytes()
+    ranges = list(importer.byte_ranges(export_csv, chunk_bytes=256))
+
+    assert ranges[0][0] == len(HEADER) + 1
+    assert ranges[-1][1] == len(data)
+    assert len(ranges) > 2
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+    for _, end in ranges:
+        assert data[end - 1:end] == b"\n"
+
+
+@pytest.mark.parametrize("normalize", [False, True])
+def test_workers_match_sequential(export_csv, normalize):
+    """Test that --workers yields the same line numbers, rows, counts and invalid keys."""
+    assert parallel(export_csv, normalize=normalize) == sequential(export_csv, normalize=normalize)
+
+
+def test_workers_reject_line_breaks_in_quoted_fields(tmp_path):
+    """Test that a quoted multi-line field makes --workers fail instead of misnumbering rows."""
+    path = tmp_path / "multiline.csv"
+    path.write_text(HEADER + "\n" + csv_line(1).replace('"Client 1"', '"Client\n1"') + "\n", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="line breaks inside quoted fields"):
+        list(importer.parallel_rows(path, 2, new_counts()))
+
+
+def test_resume_from_checkpoint_matches_uninterrupted_run(export_csv):
+    """Test that resuming from a mid-file position continues the same stream."""
+    full, _, _ = sequential(export_csv)
+
+    position = {}
+    rows = importer.validated_rows(importer.read_rows(export_csv, position), new_counts())
+    head = list(islice(rows, 25))
+    checkpoint = dict(position)
+    assert checkpoint["line"] == head[-1][0]
+
+    tail, _, _ = sequential(export_csv, dict(checkpoint))
+    assert head + tail == full
+
+    tail, _, _ = parallel(export_csv, dict(checkpoint))
+    assert head + tail == full
+
+
+def test_workers_checkpoint_resumes_sequentially(export_csv):
+    """Test that a position saved by parallel_rows resumes the same stream without workers."""
+    full, _, _ = sequential(export_csv)
+
+    position = {}
+    rows = importer.parallel_rows(export_csv, 2, new_counts(), position=position, chunk_bytes=256)
+    head = list(islice(rows, 30))
+    checkpoint = dict(position)
+    rows.close()
+
+    tail, _, _ = sequential(export_csv, checkpoint)
+    assert head + tail == full
+
+
+class FakeConnection:
+    """Records commits; cursor() hands out itself as a context-managed placeholder."""
+
+    def __init__(self, events):
+        self.events = events
+
+    def cursor(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def commit(self):
+        self.events.append("commit")
+
+
+@pytest.mark.parametrize("total, chunks, checkpoints", [
+    (7, [3, 3, 1], [3, 6, 7]),
+    (6, [3, 3, 0], [3, 6, 6]),
+    (0, [0], [0]),
+])
+def test_chunked_import_commits_every_n_rows(total, chunks, checkpoints):
+    """Test that each chunk is checkpointed then committed, including when N divides the rows."""
+    events = []
+
+    def write(cursor, rows):
+        written = len(list(rows))
+        events.append(("write", written))
+        return {"rows": written}
+
+    def checkpoint(cursor, written):
+        events.append(("checkpoint", written))
+
+    rows = ((line, {}) for line in range(total))
+    stats = importer.chunked_import(FakeConnection(events), rows, write, 3, checkpoint)
+
+    assert stats == {"rows": total}
+    expected = []
+    for written, saved in zip(chunks, checkpoints):
+        expected += [("write", written), ("checkpoint", saved), "commit"]
+    assert events == expected
+
+
+@pytest.fixture
+def export_workbook(tmp_path):
+    """A workbook with a notes sheet, then two data sheets with offset headers and blank rows."""
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    notes = workbook.active
+    notes.title = "Notes"
+    for row in (["Exported from the control account"], ["Do not edit"], ["-"]):
+        notes.append(row)
+
+    def add_sheet(title, header_row, numbers):
+        sheet = workbook.create_sheet(title)
+        for column, name in enumerate(HEADER.split(","), start=2):
+            sheet.cell(row=header_row, column=column, value=name)
+        for row, n in enumerate(numbers, start=header_row + 1):
+            if n is None:
+                continue
+            for column, value in enumerate(next(csv.reader([csv_line(n)])), start=2):
+                sheet.cell(row=row, column=column, value=int(value) if value.isdigit() else value)
+
+    add_sheet("A", 3, [0, 1, None, 2])
+    add_sheet("B", 1, [3, None, 4])
+    path = tmp_path / "export.xlsx"
+    workbook.save(path)
+    return path
+
+
+def test_workbook_line_numbers_offset_across_sheets(export_workbook):
+    """Test that sheets without a header are skipped and later sheets' rows are offset."""
+    rows = list(importer.read_workbook_rows(export_workbook))
+
+    # Notes has 3 rows and A has 7 (header on row 3), so B's rows start after 10
+    assert [line for line, _ in rows] == [7, 8, 10, 12, 14]
+    assert [row["Client_Name"] for _, row in rows] == [f"Client {n}" for n in range(5)]
+    assert rows[0][1]["File_Number"] == "1"
+    assert "" not in rows[0][1]
+
+
+def test_workbook_resume_skips_through_checkpoint_line(export_workbook):
+    """Test that resuming a workbook skips rows up to the checkpoint line."""
+    full = list(importer.read_workbook_rows(export_workbook))
+    position = {}
+    head = list(islice(importer.read_workbook_rows(export_workbook, position), 3))
+    assert position == {"offset": 0, "line": 10}
+
+    assert head + list(importer.read_workbook_rows(export_workbook, dict(position))) == full
@@ -0,0 +1,141 @@
+"""
+Integration tests for docs/database/schema.sql against PostgreSQL
+
+Set TEST_DATABASE_URL to a PostgreSQL database to run them; each test
+applies the schema in a throwaway schema (search_path) and drops it after.
+"""
+import os
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+
+SCHEMA_SQL = Path(__file__).resolve().parents[1] / "docs" / "database" / "schema.sql"
+DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(not DATABASE_URL, reason="TEST_DATABASE_URL is not set")
+
+
+@pytest.fixture
+def cursor():
+    """A cursor whose search_path is a fresh schema with schema.sql applied."""
+    schema = f"schema_sql_{uuid.uuid4().hex[:12]}"
+    conn = psycopg2.connect(DATABASE_URL)
+    conn.autocommit = True
+    cur = conn.cursor()
+    cur.execute(f"CREATE SCHEMA {schema}")
+    try:
+        cur.execute(f"SET search_path TO {schema}, public")
+        cur.execute(SCHEMA_SQL.read_text(encoding="utf-8"))
+        yield cur
+    finally:
+        cur.execute(f"DROP SCHEMA {schema} CASCADE")
+        conn.close()
+
+
+def summaries(cur):
+    """Both summary tables as sorted row lists."""
+    cur.execute("SELECT status, type, senior, engagements FROM engagement_summary ORDER BY 1, 2, 3")
+    by_group = cur.fetchall()
+    cur.execute("SELECT client_id::text, status, engagements FROM engagement_client_summary ORDER BY 1, 2")
+    return by_group, cur.fetchall()
+
+
+def counted(cur):
+    """The summaries recomputed from engagements."""
+    cur.execute(
+        "SELECT status, type, coalesce(senior, ''), count(*)::int FROM engagements GROUP BY 1, 2, 3 ORDER BY 1, 2, 3"
+    )
+    by_group = cur.fetchall()
+    cur.execute("SELECT client_id::text, status, count(*)::int FROM engagements GROUP BY 1, 2 ORDER BY 1, 2")
+    return by_group, cur.fetchall()
+
+
+def add_clients(cur, count):
+    """Insert `count` clients and return their ids."""
+    ids = [str(uuid.uuid4()) for _ in range(count)]
+    for n, client_id in enumerate(ids):
+        cur.execute(
+            "INSERT INTO clients (id, name, pan) VALUES (%s, %s, %s)",
+            (client_id, f"Client {n}", f"ABCDE{n:04d}F"),
+        )
+    return ids
+
+
+def test_summary_triggers_follow_inserts_updates_and_deletes(cursor):
+    """Test that every kind of engagement write keeps the summaries equal to a recount."""
+    first, second = add_clients(cursor, 2)
+
+    # One multi-row statement: one delta per group
+    cursor.execute(
+        """
+        INSERT INTO engagements (client_id, file_number, type, senior, status) VALUES
+            (%(a)s, 1, 'ITR', 'Ajay', 'Pending'),
+            (%(a)s, 2, 'ITR', 'Ajay', 'Pending'),
+            (%(a)s, 3, 'AUDIT', NULL, 'Filed'),
+            (%(b)s, 1, 'ITR', 'Ravi', 'Pending')
+        """,
+        {"a": first, "b": second},
+    )
+    assert summaries(cursor) == counted(cursor)
+    assert ("ITR", "Ajay", 2) in [row[1:] for row in summaries(cursor)[0]]
+
+    cursor.execute("UPDATE engagements SET status = 'Filed' WHERE client_id = %s AND file_number = 1", (first,))
+    assert summaries(cursor) == counted(cursor)
+
+    cursor.execute("DELETE FROM engagements WHERE client_id = %s AND file_number = 2", (first,))
+    assert summaries(cursor) == counted(cursor)
+
+    # Client cascade; groups that reach zero are removed
+    cursor.execute("DELETE FROM clients WHERE id = %s", (second,))
+    assert summaries(cursor) == counted(cursor)
+    cursor.execute(
+        "SELECT count(*) FROM engagement_summary WHERE senior = 'Ravi' OR engagements <= 0"
+    )
+    assert cursor.fetchone()[0] == 0
+
+    cursor.execute("DELETE FROM engagements")
+    assert summaries(cursor) == ([], [])
+
+
+def test_summary_section_fills_from_existing_engagements(cursor):
+    """Test that applying the summary section to a database with engagements fills the summaries."""
+    (client_id,) = add_clients(cursor, 1)
+    cursor.execute(
+        "INSERT INTO engagements (client_id, file_number, type, status) VALUES (%s, 1, 'ITR', 'Pending'), "
+        "(%s, 2, 'ITR', 'Filed')",
+        (client_id, client_id),
+    )
+    cursor.execute("DROP TABLE engagement_summary, engagement_client_summary CASCADE")
+    for op in ("insert", "update", "delete"):
+        cursor.execute(f"DROP TRIGGER engagement_summary_{op} ON engagements")
+
+    schema = SCHEMA_SQL.read_text(encoding="utf-8")
+    start = schema.index("-- Engagement Summaries (reporting)")
+    end = schema.index("-- Sample Queries for Verification")
+    cursor.execute(schema[start:end])
+
+    assert summaries(cursor) == counted(cursor)
+    assert summaries(cursor)[1] == [(client_id, "Filed", 1), (client_id, "Pending", 1)]
+
+
+def test_import_progress_takes_importer_checkpoints(cursor):
+    """Test that the importer's checkpoints round-trip through schema.sql's import_progress."""
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "tools" / "migrations"))
+    import import_clients_csv as importer
+
+    cursor.execute(
+        "SELECT count(*) FROM information_schema.tables "
+        "WHERE table_schema = current_schema() AND table_name = 'import_progress'"
+    )
+    assert cursor.fetchone()[0] == 1
+
+    digest = "ab" * 32
+    importer.save_checkpoint(cursor, digest, Path("export.csv"), {"offset": 4096, "line": 51}, 48, False)
+    assert importer.load_checkpoint(cursor, digest) == (4096, 51, 48, False)
+
+    importer.save_checkpoint(cursor, digest, Path("export.csv"), {"offset": 8192, "line": 99}, 95, True)
+    assert importer.load_checkpoint(cursor, digest) == (8192, 99, 95, True)
@@ -6,10 +6,33 @@ Created: December 8, 2025
 
 Description:
     Imports client and engagement data from Clients_Control_Account_IT.csv
-    into PostgreSQL database. Validates data and creates proper relationships.
+    (or an Excel export of it) into PostgreSQL database. Validates data and
+    creates proper relationships.
 
 Usage:
-    python import_clients_csv.py
+    python import_clients_csv.py [--bulk] [--file PATH] [--workers N]
+                                 [--commit-every N [--resume]]
+                                 [--bulk [--dry-run] [--delete-missing]]
+
+Options:
+    --bulk       Load with COPY into staging tables and set-based merges
+                 (for large migrations) instead of statements per row
+    --file PATH  CSV file or .xlsx workbook to import
+                 (default: docs/Data/Clients_Control_Account_IT.csv)
+    --workers N  Validate and normalize byte-range chunks of the file in N
+                 processes; rows are still written in file order
+    --commit-every N
+                 Commit every N valid rows with a checkpoint (file hash,
+                 byte offset, row number) in import_progress instead of
+                 importing in one transaction
+    --resume     Continue after the last checkpoint of the same file
+    --dry-run    With --bulk: print how many clients and engagements would
+                 be inserted, updated, left unchanged, or are not in the
+                 file, and write nothing
+    --delete-missing
+                 With --bulk: delete clients and engagements that are not
+                 in the file (kept by default); refused while the file
+                 has invalid rows
 
 Environment Variables Required:
     DATABASE_URL - PostgreSQL connection string
@@ -20,30 +43,55 @@ Features:
     - Validates UUID format for Serial Number
     - Validates PAN format (5 letters + 4 digits + 1 letter)
     - Validates File_Number as integer
-    - Upserts clients (creates if not exists, updates if exists)
+    - Upserts clients (creates if not exists, updates if exists); rows
+      whose values did not change are not rewritten
     - Inserts engagements with foreign key relationships
+    - Links senior/assistant names to staff members (see add_staff_table.py)
     - Logs validation errors to tools/migrations/logs/import_errors.log
-    - Transaction-based import (all or nothing)
+      as they are found; invalid rows are skipped
+    - Streams the file through read -> validate -> normalize -> batch ->
+      write generators, so memory stays flat for any file size and database
+      writes overlap parsing
+    - Reads .xlsx workbooks in openpyxl's read-only streaming mode, every
+      sheet that has the import columns, through the same pipeline as CSV
+    - Transaction-based import (all or nothing), or chunked and resumable
+      with --commit-every
+    - Bulk mode: one COPY round trip for all rows, three merge statements,
+      and throughput statistics
 """
 
+import argparse
 import csv
+import hashlib
+import io
 import os
 import sys
+import tempfile
 import logging
+import multiprocessing
 import re
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Optional, Any
 from uuid import UUID
 
 try:
     import psycopg2
-    from psycopg2.extras import execute_values
 except ImportError:
     print("ERROR: psycopg2 is not installed.")
     print("Please install it with: pip install psycopg2-binary")
     sys.exit(1)
 
+try:
+    from openpyxl import load_workbook
+except ImportError:
+    load_workbook = None  # Only needed for .xlsx workbooks
+
 
 # ============================================================================
 # Configuration
@@ -55,26 +103,30 @@ CSV_FILE = REPO_ROOT / "docs" / "Data" / "Clients_Control_Account_IT.csv"
 LOG_DIR = Path(__file__).parent / "logs"
 LOG_FILE = LOG_DIR / f"import_errors_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
 
-# Ensure log directory exists
-LOG_DIR.mkdir(parents=True, exist_ok=True)
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
-
 logger = logging.getLogger(__name__)
 
 
+def configure_logging() -> None:
+    """Log to stdout and LOG_FILE. Called by the entry point only, so --workers processes create no log files."""
+    # Ensure log directory exists
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(LOG_FILE),
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
+
+
 # ============================================================================
 # Validation Functions
 # ============================================================================
 
+PAN_PATTERN = re.compile(r'^[A-Z]{5}[0-9]{4}[A-Z]$')
+
 def validate_uuid(value: str) -> Tuple[bool, Optional[str]]:
     """Validate UUID format."""
     try:
@@ -89,8 +141,7 @@ def validate_pan(value: str) -> Tuple[bool, Optional[str]]:
     if not value:
         return False, "PAN is empty"
     
-    pattern = r'^[A-Z]{5}[0-9]{4}[A-Z]$'
-    if re.match(pattern, value):
+    if PAN_PATTERN.match(value):
         return True, None
     return False, f"Invalid PAN format: {value} (expected: XXXXX9999X)"
 
@@ -104,34 +155,40 @@ def validate_file_number(value: Any) -> Tuple[bool, Optional[str], Optional[int]
         return False, f"Invalid file number: {value} (must be integer)", None
 
 
-def validate_row(row_num: int, row: Dict[str, str]) -> Tuple[bool, List[str]]:
-    """
-    Validate a single CSV row.
-    Returns: (is_valid, error_messages)
-    """
+def row_errors(row: Dict[str, str]) -> List[str]:
+    """Validation errors for a single CSV row, without the row number."""
     errors = []
     
     # Validate Serial Number (UUID)
     serial_valid, serial_error = validate_uuid(row.get('Serial Number', ''))
     if not serial_valid:
-        errors.append(f"Row {row_num}: {serial_error}")
+        errors.append(serial_error)
     
     # Validate PAN
     pan_valid, pan_error = validate_pan(row.get('PAN', ''))
     if not pan_valid:
-        errors.append(f"Row {row_num}: {pan_error}")
+        errors.append(pan_error)
     
     # Validate File_Number
     file_valid, file_error, _ = validate_file_number(row.get('File_Number', ''))
     if not file_valid:
-        errors.append(f"Row {row_num}: {file_error}")
+        errors.append(file_error)
     
     # Validate required fields
     required_fields = ['Client_Name', 'Type', 'Status']
     for field in required_fields:
         if not row.get(field, '').strip():
-            errors.append(f"Row {row_num}: Missing required field '{field}'")
+            errors.append(f"Missing required field '{field}'")
     
+    return errors
+
+
+def validate_row(row_num: int, row: Dict[str, str]) -> Tuple[bool, List[str]]:
+    """
+    Validate a single CSV row.
+    Returns: (is_valid, error_messages)
+    """
+    errors = [f"Row {row_num}: {error}" for error in row_errors(row)]
     return len(errors) == 0, errors
 
 
@@ -159,7 +216,8 @@ def get_db_connection():
 def upsert_client(cursor, client_id: str, name: str, pan: str) -> bool:
     """
     Upsert a client record.
-    If client_id exists, update the record. Otherwise, insert new.
+    If client_id exists, update the record when name or PAN changed.
+    Otherwise, insert new.
     """
     try:
         # Check if client exists
@@ -175,9 +233,9 @@ def upsert_client(cursor, client_id: str, name: str, pan: str) -> bool:
                 """
                 UPDATE clients 
                 SET name = %s, pan = %s, updated_at = CURRENT_TIMESTAMP
-                WHERE id = %s
+                WHERE id = %s AND (name, pan) IS DISTINCT FROM (%s, %s)
                 """,
-                (name, pan, client_id)
+                (name, pan, client_id, name, pan)
             )
             logger.debug(f"Updated client: {client_id} - {name}")
         else:
@@ -197,17 +255,41 @@ def upsert_client(cursor, client_id: str, name: str, pan: str) -> bool:
         return False
 
 
+def resolve_staff(cursor, name: Optional[str], cache: Dict[str, Tuple[int, str]]) -> Tuple[Optional[int], Optional[str]]:
+    """
+    Find or create the staff member for a name, matching the API: whitespace
+    collapsed, case ignored. Returns (staff_id, stored name), or (None, None)
+    for a blank name.
+    """
+    name = " ".join((name or "").split())
+    if not name:
+        return None, None
+    
+    key = name.lower()
+    if key not in cache:
+        cursor.execute(
+            """
+            INSERT INTO staff (name, name_key) VALUES (%s, %s)
+            ON CONFLICT (name_key) DO UPDATE SET name_key = EXCLUDED.name_key
+            RETURNING id, name
+            """,
+            (name, key)
+        )
+        cache[key] = cursor.fetchone()
+    return cache[key]
+
+
 def insert_engagement(cursor, client_id: str, engagement_data: Dict) -> bool:
-    """Insert an engagement record."""
+    """Insert an engagement record, or update it if any value changed."""
     try:
         cursor.execute(
-            """
+            f"""
             INSERT INTO engagements (
                 client_id, file_number, file_number_as_per,
-                type, type2, senior, assistant, status,
+                type, type2, senior, assistant, senior_id, assistant_id, status,
                 created_at, updated_at
             )
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
             ON CONFLICT (client_id, file_number) DO UPDATE
             SET 
                 file_number_as_per = EXCLUDED.file_number_as_per,
@@ -215,8 +297,12 @@ def insert_engagement(cursor, client_id: str, engagement_data: Dict) -> bool:
                 type2 = EXCLUDED.type2,
                 senior = EXCLUDED.senior,
                 assistant = EXCLUDED.assistant,
+                senior_id = EXCLUDED.senior_id,
+                assistant_id = EXCLUDED.assistant_id,
                 status = EXCLUDED.status,
                 updated_at = CURRENT_TIMESTAMP
+            WHERE {ENGAGEMENT_VALUES.format(alias='engagements')}
+                IS DISTINCT FROM {ENGAGEMENT_VALUES.format(alias='EXCLUDED')}
             """,
             (
                 client_id,
@@ -226,6 +312,8 @@ def insert_engagement(cursor, client_id: str, engagement_data: Dict) -> bool:
                 engagement_data['type2'],
                 engagement_data['senior'],
                 engagement_data['assistant'],
+                engagement_data['senior_id'],
+                engagement_data['assistant_id'],
                 engagement_data['status']
             )
         )
@@ -237,99 +325,951 @@ def insert_engagement(cursor, client_id: str, engagement_data: Dict) -> bool:
 
 
 # ============================================================================
-# Main Import Logic
+# Pipeline Stages
 # ============================================================================
+# read_rows -> validated_rows -> staging_records -> csv_chunks -> writer.
+# Each stage is a generator holding at most one row (or one batch), so memory
+# stays flat whatever the file size and rows reach the database as they are
+# parsed.
 
-def import_csv():
-    """Main function to import CSV data."""
-    
-    # Check if CSV file exists
-    if not CSV_FILE.exists():
-        logger.error(f"CSV file not found: {CSV_FILE}")
-        sys.exit(1)
+# Rows per CSV chunk handed to COPY
+BATCH_ROWS = 1000
+
+
+def read_rows(
+    csv_file: Path,
+    position: Optional[Dict[str, int]] = None
+) -> Iterator[Tuple[int, Dict[str, str]]]:
+    """
+    Yield (line number, row) for each CSV row; line 1 is the header.
     
-    logger.info(f"Starting import from: {CSV_FILE}")
-    logger.info(f"Log file: {LOG_FILE}")
+    `position` tracks the byte offset after the last row read and that row's
+    line number. When it already holds a checkpoint, reading resumes there.
+    """
+    position = position if position is not None else {}
+    with open(csv_file, 'rb') as f:
+        fieldnames = next(csv.reader([f.readline().decode('utf-8-sig')]), [])
+        if position:
+            f.seek(position['offset'])
+        else:
+            position.update(offset=f.tell(), line=1)
+        
+        def lines() -> Iterator[str]:
+            for raw in f:
+                position['offset'] += len(raw)
+                yield raw.decode('utf-8')
+        
+        for row in csv.DictReader(lines(), fieldnames=fieldnames):
+            position['line'] += 1
+            yield position['line'], row
+
+
+# Excel workbooks are read sheet by sheet instead of as CSV
+WORKBOOK_SUFFIXES = ('.xlsx', '.xlsm')
+
+# Columns that identify a sheet's header row, searched for in its first rows
+HEADER_COLUMNS = {'Serial Number', 'File_Number', 'Client_Name', 'PAN', 'Type', 'Status'}
+HEADER_SCAN_ROWS = 20
+
+
+def is_workbook(path: Path) -> bool:
+    """Whether a --file path is an Excel workbook rather than CSV."""
+    return path.suffix.lower() in WORKBOOK_SUFFIXES
+
+
+def cell_text(value: Any) -> str:
+    """A cell value as the CSV export would write it."""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def read_workbook_rows(
+    workbook_file: Path,
+    position: Optional[Dict[str, int]] = None
+) -> Iterator[Tuple[int, Dict[str, str]]]:
+    """
+    Yield (line number, row) for each data row of every sheet that has the
+    import columns, streaming the workbook in openpyxl's read-only mode.
+    Other sheets are skipped.
     
-    # Read and validate CSV
-    rows_data = []
-    validation_errors = []
+    A sheet's header may sit below blank rows or start in any column. Line
+    numbers are the sheet's row numbers, offset past all earlier sheets so
+    they keep increasing. `position` works as in read_rows, except that
+    resuming skips rows up to the checkpoint line (there is no byte offset).
+    """
+    position = position if position is not None else {}
+    resume_after = position.get('line', 0)
+    position.update(offset=0, line=resume_after)
     
+    workbook = load_workbook(workbook_file, read_only=True, data_only=True)
     try:
-        with open(CSV_FILE, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row_num, row in enumerate(reader, start=2):  # Start at 2 (row 1 is header)
-                is_valid, errors = validate_row(row_num, row)
-                if is_valid:
-                    rows_data.append(row)
-                else:
-                    validation_errors.extend(errors)
-    except Exception as e:
-        logger.error(f"Failed to read CSV file: {e}")
-        sys.exit(1)
+        base = 0
+        for sheet in workbook.worksheets:
+            header, last_row = None, 0
+            for row_number, values in enumerate(sheet.iter_rows(values_only=True), start=1):
+                last_row = row_number
+                if header is None:
+                    names = [cell_text(value).strip() for value in values]
+                    if HEADER_COLUMNS.issubset(names):
+                        header = names
+                        if base:
+                            logger.info(f"Sheet '{sheet.title}': row numbers below are offset by {base}")
+                    elif row_number >= HEADER_SCAN_ROWS:
+                        break
+                    continue
+                
+                line = base + row_number
+                if line <= resume_after or not any(value is not None and str(value).strip() for value in values):
+                    continue
+                position['line'] = line
+                yield line, {
+                    name: cell_text(value)
+                    for name, value in zip(header, values)
+                    if name
+                }
+            
+            if header is None:
+                logger.info(f"Skipping sheet '{sheet.title}': no header row with {', '.join(sorted(HEADER_COLUMNS))}")
+            base += last_row
+    finally:
+        workbook.close()
+
+
+def row_key(row: Dict[str, str]) -> Tuple[str, str]:
+    """
+    (Serial Number, File_Number) of a row as text comparable with the
+    database: lowercased UUID, file number without leading zeros. Used to
+    recognise existing rows behind invalid CSV rows.
+    """
+    file_valid, _, file_num = validate_file_number(row.get('File_Number', ''))
+    return (
+        (row.get('Serial Number') or '').strip().lower(),
+        str(file_num) if file_valid else (row.get('File_Number') or '').strip(),
+    )
+
+
+# Invalid-row keys kept in memory up to this size, then on disk
+SPOOL_BYTES = 1024 * 1024
+
+
+class KeySpool:
+    """
+    row_key of each invalid row, written to a temporary file as it is found
+    so memory stays flat however many rows are invalid. The keys cannot go
+    straight into the database: the bulk COPY holds the connection while
+    rows stream, so apply_missing copies them in once it has finished.
+    """
+    
+    def __init__(self):
+        self.file = tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES, mode='w+', newline='')
+        # Quote everything: in PostgreSQL's CSV format an unquoted empty field is NULL
+        self._writer = csv.writer(self.file, quoting=csv.QUOTE_ALL)
+        self.count = 0
+    
+    def add(self, key: Tuple[str, str]) -> None:
+        self._writer.writerow(key)
+        self.count += 1
+    
+    def close(self) -> None:
+        self.file.close()
+
+
+def validated_rows(
+    rows: Iterable[Tuple[int, Dict[str, str]]],
+    counts: Dict[str, int],
+    invalid_keys: Optional[KeySpool] = None
+) -> Iterator[Tuple[int, Dict[str, str]]]:
+    """
+    Pass valid rows through. Errors go to the log as they are found instead
+    of being collected; `counts` tracks rows read, valid and invalid, and
+    `invalid_keys` spools the row_key of each invalid row.
+    """
+    for row_num, row in rows:
+        counts['rows_read'] += 1
+        is_valid, errors = validate_row(row_num, row)
+        if is_valid:
+            counts['rows_valid'] += 1
+            yield row_num, row
+        else:
+            counts['rows_invalid'] += 1
+            if invalid_keys is not None:
+                invalid_keys.add(row_key(row))
+            for error in errors:
+                logger.warning(f"  {error}")
+
+
+def staging_record(line: int, row: Dict[str, str]) -> Tuple:
+    """
+    Staging table values for a validated row; blank optional fields become
+    NULL. Row mode writes the same values, so both modes store identical rows.
+    """
+    _, _, file_num = validate_file_number(row['File_Number'])
+    
+    def optional(field: str) -> Optional[str]:
+        return " ".join((row.get(field) or "").split()) or None
+    
+    return (
+        line,
+        row['Serial Number'].strip(),
+        row['Client_Name'],
+        row['PAN'],
+        file_num,
+        (row.get('File_Number_As_Per') or '').strip() or None,
+        row['Type'],
+        (row.get('Type2') or '').strip() or None,
+        optional('Senior'),
+        optional('Assistant'),
+        row['Status'],
+    )
+
+
+def staging_records(rows: Iterable[Tuple[int, Dict[str, str]]]) -> Iterator[Tuple]:
+    """Normalize validated rows into staging records."""
+    for line, row in rows:
+        yield staging_record(line, row)
+
+
+def csv_chunks(records: Iterable[Tuple], batch_rows: int = BATCH_ROWS) -> Iterator[str]:
+    """Encode records as CSV for COPY ... (FORMAT csv), `batch_rows` per chunk; None becomes NULL."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    pending = 0
+    for record in records:
+        writer.writerow(record)
+        pending += 1
+        if pending == batch_rows:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if pending:
+        yield buffer.getvalue()
+
+
+# ============================================================================
+# Parallel Validation (--workers)
+# ============================================================================
+# The file is cut into byte ranges on line boundaries; workers parse,
+# validate and normalize one range each and results are merged in file order.
+# Row numbers are relative inside a worker and made absolute while merging.
+
+# Bytes of CSV per worker task
+CHUNK_BYTES = 8 * 1024 * 1024
+
+
+def byte_ranges(
+    csv_file: Path,
+    start: Optional[int] = None,
+    chunk_bytes: int = CHUNK_BYTES
+) -> Iterator[Tuple[int, int]]:
+    """Yield (start, end) offsets covering the rows after the header (or after `start`), each ending at a line break."""
+    size = csv_file.stat().st_size
+    with open(csv_file, 'rb') as f:
+        f.readline()
+        start = start or f.tell()
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            f.readline()
+            end = f.tell()
+            yield start, end
+            start = end
+
+
+def validate_chunk(
+    csv_file: Path,
+    start: int,
+    end: int,
+    fieldnames: List[str],
+    normalize: bool
+) -> Tuple[int, List[Tuple], List[Tuple[int, List[str], Tuple[str, str]]]]:
+    """
+    Parse and validate the rows in one byte range (runs in a worker).
+    
+    Returns: (rows read, valid items, invalid rows) where a valid item is
+    (end offset, (index, row)), or (end offset, staging record) when
+    `normalize` is set, and an invalid row is (index, errors, row_key). Indexes count
+    rows within the range and stand in for line numbers until merged.
+    """
+    with open(csv_file, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    
+    offset, line_count = start, 0
+    
+    def lines() -> Iterator[str]:
+        nonlocal offset, line_count
+        for raw in io.BytesIO(data):
+            offset += len(raw)
+            line_count += 1
+            yield raw.decode('utf-8')
+    
+    valid, invalid = [], []
+    rows_read = records = 0
+    for record in csv.reader(lines()):
+        records += 1
+        if not record:
+            continue
+        row = dict(zip(fieldnames, record))
+        errors = row_errors(row)
+        if errors:
+            invalid.append((rows_read, errors, row_key(row)))
+        elif normalize:
+            valid.append((offset, staging_record(rows_read, row)))
+        else:
+            valid.append((offset, (rows_read, row)))
+        rows_read += 1
+    
+    # One record per line, or a quoted field holds a line break and the range
+    # boundaries may have cut through it
+    if records != line_count:
+        raise ValueError(
+            f"{csv_file} has line breaks inside quoted fields (bytes {start}-{end}); "
+            "import it without --workers"
+        )
+    return rows_read, valid, invalid
+
+
+def parallel_rows(
+    csv_file: Path,
+    workers: int,
+    counts: Dict[str, int],
+    normalize: bool = False,
+    position: Optional[Dict[str, int]] = None,
+    invalid_keys: Optional[KeySpool] = None,
+    chunk_bytes: int = CHUNK_BYTES
+) -> Iterator[Tuple]:
+    """
+    Same stream as validated_rows (or staging_records when `normalize` is
+    set), validated by a pool of `workers` processes in ranges of about
+    `chunk_bytes`. At most two ranges per worker are in flight, so memory
+    stays bounded. `position` works as in read_rows, `invalid_keys` as in
+    validated_rows.
+    """
+    position = position if position is not None else {}
+    with open(csv_file, 'r', encoding='utf-8-sig', newline='') as f:
+        fieldnames = next(csv.reader(f), [])
+    
+    line = position.get('line', 1) + 1
+    # Spawned, not forked: forked workers would share the open database
+    # connection and keep its transaction alive if this process is killed
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+        pending = deque()
+        for start, end in byte_ranges(csv_file, position.get('offset'), chunk_bytes):
+            pending.append(pool.submit(validate_chunk, csv_file, start, end, fieldnames, normalize))
+            if len(pending) < 2 * workers:
+                continue
+            line = yield from merge_chunk(pending.popleft().result(), line, counts, position, invalid_keys)
+        while pending:
+            line = yield from merge_chunk(pending.popleft().result(), line, counts, position, invalid_keys)
+
+
+def merge_chunk(
+    result: Tuple[int, List[Tuple], List[Tuple[int, List[str], Tuple[str, str]]]],
+    line: int,
+    counts: Dict[str, int],
+    position: Dict[str, int],
+    invalid_keys: Optional[KeySpool] = None
+) -> Iterator[Tuple]:
+    """Log a range's errors and yield its valid items with absolute line numbers starting at `line`."""
+    rows_read, valid, invalid = result
+    counts['rows_read'] += rows_read
+    counts['rows_valid'] += len(valid)
+    counts['rows_invalid'] += len(invalid)
+    for index, errors, key in invalid:
+        if invalid_keys is not None:
+            invalid_keys.add(key)
+        for error in errors:
+            logger.warning(f"  Row {line + index}: {error}")
+    for end, item in valid:
+        position.update(offset=end, line=line + item[0])
+        yield (line + item[0], *item[1:])
+    return line + rows_read
+
+
+# ============================================================================
+# Bulk Import (COPY + set-based merge)
+# ============================================================================
+
+# Staging table: one row per valid CSV row, dropped at commit
+CREATE_STAGING = """
+    CREATE TEMP TABLE import_rows (
+        line INTEGER NOT NULL,
+        client_id UUID NOT NULL,
+        client_name VARCHAR(255) NOT NULL,
+        pan VARCHAR(10) NOT NULL,
+        file_number INTEGER NOT NULL,
+        file_number_as_per VARCHAR(50),
+        type VARCHAR(100) NOT NULL,
+        type2 VARCHAR(100),
+        senior VARCHAR(100),
+        assistant VARCHAR(100),
+        status VARCHAR(100) NOT NULL
+    ) ON COMMIT DROP
+"""
+
+STAGING_COLUMNS = (
+    "line", "client_id", "client_name", "pan", "file_number", "file_number_as_per",
+    "type", "type2", "senior", "assistant", "status"
+)
+
+# Like the row-by-row import, a client's first row supplies its name and PAN
+STAGE_CLIENTS = """
+    CREATE TEMP TABLE import_clients ON COMMIT DROP AS
+    SELECT DISTINCT ON (client_id) client_id AS id, client_name AS name, pan
+    FROM import_rows
+    ORDER BY client_id, line
+"""
+
+CLIENT_CHANGED = "(c.name, c.pan) IS DISTINCT FROM (i.name, i.pan)"
+
+DIFF_CLIENTS = f"""
+    SELECT count(*) FILTER (WHERE c.id IS NULL),
+           count(*) FILTER (WHERE c.id IS NOT NULL AND {CLIENT_CHANGED}),
+           count(*) FILTER (WHERE NOT {CLIENT_CHANGED})
+    FROM import_clients i
+    LEFT JOIN clients c ON c.id = i.id
+"""
+
+# Only new and changed clients are written; unchanged rows keep updated_at
+MERGE_CLIENTS = f"""
+    INSERT INTO clients (id, name, pan, status, created_at, updated_at)
+    SELECT i.id, i.name, i.pan, 'active', CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+    FROM import_clients i
+    LEFT JOIN clients c ON c.id = i.id
+    WHERE {CLIENT_CHANGED}
+    ON CONFLICT (id) DO UPDATE
+    SET name = EXCLUDED.name, pan = EXCLUDED.pan, updated_at = CURRENT_TIMESTAMP
+    WHERE (clients.name, clients.pan) IS DISTINCT FROM (EXCLUDED.name, EXCLUDED.pan)
+"""
+
+# Staging names are already whitespace-normalized; the key ignores case
+MERGE_STAFF = """
+    INSERT INTO staff (name, name_key)
+    SELECT DISTINCT ON (lower(name)) name, lower(name)
+    FROM import_rows, LATERAL (VALUES (senior, line), (assistant, line)) AS v(name, seen_at)
+    WHERE name IS NOT NULL
+    ORDER BY lower(name), seen_at
+    ON CONFLICT (name_key) DO NOTHING
+"""
+
+# What MERGE_STAFF would insert (for --dry-run)
+NEW_STAFF = """
+    SELECT count(DISTINCT lower(v.name))
+    FROM import_rows, LATERAL (VALUES (senior), (assistant)) AS v(name)
+    WHERE v.name IS NOT NULL
+      AND NOT EXISTS (SELECT 1 FROM staff WHERE staff.name_key = lower(v.name))
+"""
+
+# Like the row-by-row import, the last row for a (client_id, file_number)
+# wins. Names not in staff yet (dry runs only) keep their staged spelling.
+STAGE_ENGAGEMENTS = """
+    CREATE TEMP TABLE import_engagements ON COMMIT DROP AS
+    SELECT DISTINCT ON (r.client_id, r.file_number)
+           r.client_id, r.file_number, r.file_number_as_per, r.type, r.type2,
+           coalesce(s.name, r.senior) AS senior, coalesce(a.name, r.assistant) AS assistant,
+           s.id AS senior_id, a.id AS assistant_id, r.status
+    FROM import_rows r
+    LEFT JOIN staff s ON s.name_key = lower(r.senior)
+    LEFT JOIN staff a ON a.name_key = lower(r.assistant)
+    ORDER BY r.client_id, r.file_number, r.line DESC
+"""
+
+ENGAGEMENT_VALUES = "({alias}.file_number_as_per, {alias}.type, {alias}.type2, {alias}.senior, " \
+                    "{alias}.assistant, {alias}.senior_id, {alias}.assistant_id, {alias}.status)"
+
+ENGAGEMENT_CHANGED = (
+    f"{ENGAGEMENT_VALUES.format(alias='e')} IS DISTINCT FROM {ENGAGEMENT_VALUES.format(alias='i')}"
+)
+
+DIFF_ENGAGEMENTS = f"""
+    SELECT count(*) FILTER (WHERE e.id IS NULL),
+           count(*) FILTER (WHERE e.id IS NOT NULL AND {ENGAGEMENT_CHANGED}),
+           count(*) FILTER (WHERE NOT {ENGAGEMENT_CHANGED})
+    FROM import_engagements i
+    LEFT JOIN engagements e ON e.client_id = i.client_id AND e.file_number = i.file_number
+"""
+
+MERGE_ENGAGEMENTS = f"""
+    INSERT INTO engagements (
+        client_id, file_number, file_number_as_per, type, type2,
+        senior, assistant, senior_id, assistant_id, status, created_at, updated_at
+    )
+    SELECT i.client_id, i.file_number, i.file_number_as_per, i.type, i.type2,
+           i.senior, i.assistant, i.senior_id, i.assistant_id, i.status, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+    FROM import_engagements i
+    LEFT JOIN engagements e ON e.client_id = i.client_id AND e.file_number = i.file_number
+    WHERE {ENGAGEMENT_CHANGED}
+    ON CONFLICT (client_id, file_number) DO UPDATE
+    SET
+        file_number_as_per = EXCLUDED.file_number_as_per,
+        type = EXCLUDED.type,
+        type2 = EXCLUDED.type2,
+        senior = EXCLUDED.senior,
+        assistant = EXCLUDED.assistant,
+        senior_id = EXCLUDED.senior_id,
+        assistant_id = EXCLUDED.assistant_id,
+        status = EXCLUDED.status,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE {ENGAGEMENT_VALUES.format(alias='engagements')} IS DISTINCT FROM {ENGAGEMENT_VALUES.format(alias='EXCLUDED')}
+"""
+
+# Rows in the database but not in the file
+MISSING_CLIENTS = "NOT EXISTS (SELECT 1 FROM import_clients i WHERE i.id = c.id)"
+MISSING_ENGAGEMENTS = (
+    "NOT EXISTS (SELECT 1 FROM import_engagements i "
+    "WHERE i.client_id = e.client_id AND i.file_number = e.file_number)"
+)
+
+# row_key of each invalid CSV row. A missing row matching one is most
+# likely still in the file but failed validation; an invalid File_Number
+# matches all of that client's engagements.
+CREATE_INVALID_KEYS = """
+    CREATE TEMP TABLE import_invalid (client_id TEXT NOT NULL, file_number TEXT NOT NULL) ON COMMIT DROP
+"""
+INVALID_CLIENT = "EXISTS (SELECT 1 FROM import_invalid v WHERE v.client_id = c.id::text)"
+INVALID_ENGAGEMENT = (
+    "EXISTS (SELECT 1 FROM import_invalid v WHERE v.client_id = e.client_id::text "
+    "AND (v.file_number = e.file_number::text OR v.file_number !~ '^-?[0-9]+$'))"
+)
+
+COUNT_MISSING = f"""
+    SELECT (SELECT count(*) FROM clients c WHERE {MISSING_CLIENTS} AND NOT {INVALID_CLIENT}),
+           (SELECT count(*) FROM clients c WHERE {MISSING_CLIENTS} AND {INVALID_CLIENT}),
+           (SELECT count(*) FROM engagements e WHERE {MISSING_ENGAGEMENTS} AND NOT {INVALID_ENGAGEMENT}),
+           (SELECT count(*) FROM engagements e WHERE {MISSING_ENGAGEMENTS} AND {INVALID_ENGAGEMENT})
+"""
+
+# Tombstones as the API writes them, so the change feeds see the deletes.
+# Engagements go first: a missing client's engagements are all missing too.
+# Only run when every row was valid (see apply_missing).
+DELETE_MISSING = f"""
+    WITH removed AS (
+        DELETE FROM engagements e WHERE {MISSING_ENGAGEMENTS} RETURNING e.id, e.client_id
+    )
+    INSERT INTO deletions (entity, entity_id, client_id)
+    SELECT 'engagements', id, client_id FROM removed;
+    
+    WITH removed AS (
+        DELETE FROM clients c WHERE {MISSING_CLIENTS} RETURNING c.id
+    )
+    INSERT INTO deletions (entity, entity_id)
+    SELECT 'clients', id FROM removed;
+"""
+
+
+class CopyStream(io.TextIOBase):
+    """
+    Read-only file over an iterator of text chunks, so COPY FROM STDIN can
+    consume rows as they are produced instead of from one large buffer.
+    """
+    
+    def __init__(self, chunks: Iterable[str]):
+        self._chunks = iter(chunks)
+        self._buffer = ""
+    
+    def readable(self) -> bool:
+        return True
+    
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self._buffer) < size:
+            try:
+                self._buffer += next(self._chunks)
+            except StopIteration:
+                break
+        if size < 0:
+            chunk, self._buffer = self._buffer, ""
+        else:
+            chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+        return chunk
+
+
+def bulk_import(cursor, records: Iterable[Tuple], dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Stream staging records into a staging table with COPY FROM STDIN, diff
+    them against the database, then merge clients, staff and engagements
+    with one statement each, writing only new and changed rows. Runs in the
+    caller's transaction. COPY pulls `records` as it sends them, so upstream
+    stages run while the database ingests.
     
-    # Log validation errors
-    if validation_errors:
-        logger.warning(f"Found {len(validation_errors)} validation errors:")
-        for error in validation_errors:
-            logger.warning(f"  {error}")
+    dry_run: compute the diff only; nothing but the temp tables is written
     
-    logger.info(f"Valid rows to import: {len(rows_data)}")
+    Rows absent from the file are handled by apply_missing, once the whole
+    file has been staged.
+    
+    Returns: diff counts and per-phase timings
+    """
+    stats = {}
+    
+    started = time.perf_counter()
+    cursor.execute(CREATE_STAGING)
+    cursor.copy_expert(
+        f"COPY import_rows ({', '.join(STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+        CopyStream(csv_chunks(records))
+    )
+    stats['rows_staged'] = cursor.rowcount
+    stats['copy_seconds'] = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    cursor.execute("ANALYZE import_rows")
+    cursor.execute(STAGE_CLIENTS)
+    cursor.execute(DIFF_CLIENTS)
+    stats['clients_inserted'], stats['clients_updated'], stats['clients_unchanged'] = cursor.fetchone()
+    if dry_run:
+        cursor.execute(NEW_STAFF)
+        stats['staff_inserted'] = cursor.fetchone()[0]
+    else:
+        cursor.execute(MERGE_STAFF)
+        stats['staff_inserted'] = cursor.rowcount
+    cursor.execute(STAGE_ENGAGEMENTS)
+    cursor.execute("ANALYZE import_clients, import_engagements")
+    cursor.execute(DIFF_ENGAGEMENTS)
+    stats['engagements_inserted'], stats['engagements_updated'], stats['engagements_unchanged'] = cursor.fetchone()
+    
+    if not dry_run:
+        cursor.execute(MERGE_CLIENTS)
+        cursor.execute(MERGE_ENGAGEMENTS)
+    stats['merge_seconds'] = time.perf_counter() - started
+    
+    return stats
+
+
+def apply_missing(cursor, invalid_keys: KeySpool, delete: bool = False) -> Dict[str, int]:
+    """
+    Count database rows absent from a fully staged file, apart from those
+    matching an invalid row, and delete them when `delete` is set. Runs in
+    the bulk import's transaction. Never deletes if any row was invalid:
+    the row behind a mistyped PAN or File_Number would look absent.
+    
+    Returns: missing and invalid-match counts per table
+    """
+    cursor.execute(CREATE_INVALID_KEYS)
+    if invalid_keys.count:
+        invalid_keys.file.seek(0)
+        cursor.copy_expert("COPY import_invalid (client_id, file_number) FROM STDIN WITH (FORMAT csv)", invalid_keys.file)
+        cursor.execute("ANALYZE import_invalid")
+    cursor.execute(COUNT_MISSING)
+    stats = dict(zip(
+        ('clients_missing', 'clients_missing_invalid', 'engagements_missing', 'engagements_missing_invalid'),
+        cursor.fetchone()
+    ))
+    if delete:
+        if invalid_keys.count:
+            raise ValueError(
+                "--delete-missing refused: the file has invalid rows, whose database rows would be deleted; "
+                "fix them and re-run"
+            )
+        cursor.execute(DELETE_MISSING)
+    return stats
+
+
+def log_bulk_stats(stats: Dict[str, Any], total_seconds: float, delete_missing: bool = False) -> None:
+    """Log the diff a bulk import applied (or would apply) and how fast."""
+    rows = stats['rows_staged']
     
-    if not rows_data:
-        logger.error("No valid rows to import")
+    def rate(seconds: float) -> str:
+        return f"{rows / seconds:,.0f} rows/s" if seconds > 0 else "n/a"
+    
+    logger.info(f"  Rows staged: {rows:,}")
+    for table in ('clients', 'engagements'):
+        line = (
+            f"  {table.capitalize()} inserted: {stats[f'{table}_inserted']:,}, "
+            f"updated: {stats[f'{table}_updated']:,}, unchanged: {stats[f'{table}_unchanged']:,}"
+        )
+        if f'{table}_missing' in stats:
+            line += f", not in file: {stats[f'{table}_missing']:,} ({'deleted' if delete_missing else 'kept'})"
+            if stats[f'{table}_missing_invalid']:
+                line += f", behind invalid rows: {stats[f'{table}_missing_invalid']:,} (kept)"
+        logger.info(line)
+    logger.info(f"  Staff members added: {stats['staff_inserted']:,}")
+    logger.info(f"  COPY:  {stats['copy_seconds']:.2f}s ({rate(stats['copy_seconds'])})")
+    logger.info(f"  Merge: {stats['merge_seconds']:.2f}s ({rate(stats['merge_seconds'])})")
+    logger.info(f"  Total: {total_seconds:.2f}s ({rate(total_seconds)})")
+
+
+# ============================================================================
+# Checkpoints (--commit-every / --resume)
+# ============================================================================
+# Chunked imports commit every N rows together with a checkpoint of how far
+# the file has been read, so a failure loses at most one chunk and locks are
+# held per chunk instead of for the whole run.
+
+# Same table as docs/database/schema.sql; created here for databases set up
+# before it existed
+CREATE_PROGRESS = """
+    CREATE TABLE IF NOT EXISTS import_progress (
+        file_hash CHAR(64) PRIMARY KEY,
+        file_name TEXT NOT NULL,
+        byte_offset BIGINT NOT NULL,
+        row_number BIGINT NOT NULL,
+        rows_imported BIGINT NOT NULL,
+        completed_at TIMESTAMP WITH TIME ZONE,
+        updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+SAVE_CHECKPOINT = """
+    INSERT INTO import_progress (file_hash, file_name, byte_offset, row_number, rows_imported, completed_at)
+    VALUES (%s, %s, %s, %s, %s, CASE WHEN %s THEN CURRENT_TIMESTAMP END)
+    ON CONFLICT (file_hash) DO UPDATE
+    SET file_name = EXCLUDED.file_name,
+        byte_offset = EXCLUDED.byte_offset,
+        row_number = EXCLUDED.row_number,
+        rows_imported = EXCLUDED.rows_imported,
+        completed_at = EXCLUDED.completed_at,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+
+def file_hash(csv_file: Path) -> str:
+    """SHA-256 of the file contents; checkpoints only apply to the exact same file."""
+    digest = hashlib.sha256()
+    with open(csv_file, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_checkpoint(cursor, digest: str) -> Optional[Tuple[int, int, int, bool]]:
+    """Last committed (byte offset, row number, rows imported, completed) for a file, if any."""
+    cursor.execute(
+        """
+        SELECT byte_offset, row_number, rows_imported, completed_at IS NOT NULL
+        FROM import_progress WHERE file_hash = %s
+        """,
+        (digest,)
+    )
+    return cursor.fetchone()
+
+
+def save_checkpoint(
+    cursor,
+    digest: str,
+    csv_file: Path,
+    position: Dict[str, int],
+    rows_imported: int,
+    completed: bool = False
+) -> None:
+    """Record how far the file has been imported, in the caller's transaction."""
+    cursor.execute(
+        SAVE_CHECKPOINT,
+        (digest, str(csv_file), position['offset'], position['line'], rows_imported, completed)
+    )
+
+
+def chunked_import(
+    conn,
+    rows: Iterable[Tuple],
+    write: Callable[[Any, Iterable[Tuple]], Dict[str, Any]],
+    commit_every: int,
+    checkpoint: Callable[[Any, int], None]
+) -> Dict[str, Any]:
+    """
+    Write `rows` with `write` in transactions of at most `commit_every` rows.
+    `checkpoint` runs in each transaction just before it commits, with the
+    number of rows written so far.
+    
+    Returns: the summed stats of every chunk
+    """
+    totals: Dict[str, Any] = {}
+    written = 0
+    
+    def counted(chunk: Iterable[Tuple]) -> Iterator[Tuple]:
+        nonlocal written
+        for item in chunk:
+            written += 1
+            yield item
+    
+    rows = iter(rows)
+    with conn.cursor() as cursor:
+        while True:
+            before = written
+            stats = write(cursor, counted(islice(rows, commit_every)))
+            for key, value in stats.items():
+                totals[key] = totals.get(key, 0) + value
+            checkpoint(cursor, written)
+            conn.commit()
+            # A short chunk means the rows ran out
+            if written - before < commit_every:
+                return totals
+
+
+# ============================================================================
+# Main Import Logic
+# ============================================================================
+
+def row_import(cursor, rows: Iterable[Tuple[int, Dict[str, str]]]) -> Dict[str, int]:
+    """Write validated rows one statement at a time (the default mode)."""
+    # Track unique clients
+    clients_processed = set()
+    engagements_inserted = 0
+    staff_cache = {}
+    
+    for line, row in rows:
+        (_, client_id, client_name, pan, file_num, file_number_as_per,
+         type_, type2, senior, assistant, status) = staging_record(line, row)
+        
+        # Upsert client (only once per unique client_id)
+        if client_id not in clients_processed:
+            if upsert_client(cursor, client_id, client_name, pan):
+                clients_processed.add(client_id)
+        
+        # Insert engagement
+        senior_id, senior = resolve_staff(cursor, senior, staff_cache)
+        assistant_id, assistant = resolve_staff(cursor, assistant, staff_cache)
+        engagement_data = {
+            'file_number': file_num,
+            'file_number_as_per': file_number_as_per,
+            'type': type_,
+            'type2': type2,
+            'senior': senior,
+            'assistant': assistant,
+            'senior_id': senior_id,
+            'assistant_id': assistant_id,
+            'status': status
+        }
+        
+        if insert_engagement(cursor, client_id, engagement_data):
+            engagements_inserted += 1
+    
+    return {'clients_processed': len(clients_processed), 'engagements_inserted': engagements_inserted}
+
+
+def import_csv(
+    csv_file: Path = CSV_FILE,
+    bulk: bool = False,
+    workers: int = 1,
+    commit_every: int = 0,
+    resume: bool = False,
+    dry_run: bool = False,
+    delete_missing: bool = False
+):
+    """
+    Main function to import CSV data. Rows stream from the file through
+    validation into the database in one transaction; nothing is committed
+    unless every stage finishes. With `commit_every`, each chunk of that many
+    rows commits with a checkpoint instead, and `resume` continues after the
+    last committed chunk of the same file. `dry_run` and `delete_missing`
+    apply to bulk imports (see bulk_import).
+    """
+    started = time.perf_counter()
+    
+    # Check if CSV file exists
+    if not csv_file.exists():
+        logger.error(f"CSV file not found: {csv_file}")
         sys.exit(1)
     
+    if is_workbook(csv_file) and load_workbook is None:
+        logger.error("openpyxl is not installed; it is needed to read Excel workbooks.")
+        logger.error("Please install it with: pip install openpyxl")
+        sys.exit(1)
+    
+    logger.info(f"Starting import from: {csv_file}")
+    logger.info(f"Log file: {LOG_FILE}")
+    
     # Connect to database and import
     conn = get_db_connection()
     cursor = conn.cursor()
     
+    position = {}
+    committed = {'line': 1, 'rows': 0}
+    imported_before = 0
+    if commit_every:
+        digest = file_hash(csv_file)
+        cursor.execute(CREATE_PROGRESS)
+        checkpoint = load_checkpoint(cursor, digest) if resume else None
+        conn.commit()
+        if checkpoint and checkpoint[3]:
+            logger.info(f"{csv_file} was already imported completely; nothing to resume")
+            cursor.close()
+            conn.close()
+            return
+        if checkpoint:
+            position = {'offset': checkpoint[0], 'line': checkpoint[1]}
+            committed = {'line': checkpoint[1], 'rows': checkpoint[2]}
+            imported_before = checkpoint[2]
+            logger.info(f"Resuming after row {checkpoint[1]} ({checkpoint[2]} rows already imported)")
+    
+    counts = {'rows_read': 0, 'rows_valid': 0, 'rows_invalid': 0}
+    # Only a whole-file bulk import looks for rows missing from the file
+    invalid_keys = KeySpool() if bulk and not commit_every else None
+    if workers > 1:
+        logger.info(f"Validating with {workers} worker processes")
+        rows = parallel_rows(csv_file, workers, counts, normalize=bulk, position=position, invalid_keys=invalid_keys)
+    else:
+        read = read_workbook_rows if is_workbook(csv_file) else read_rows
+        rows = validated_rows(read(csv_file, position), counts, invalid_keys)
+        if bulk:
+            rows = staging_records(rows)
+    if bulk:
+        write = partial(bulk_import, dry_run=dry_run)
+    else:
+        write = row_import
+    
+    def save(cursor, written: int, completed: bool = False) -> None:
+        rows_imported = imported_before + written
+        save_checkpoint(cursor, digest, csv_file, position, rows_imported, completed)
+        committed.update(line=position['line'], rows=rows_imported)
+    
     try:
         # Start transaction
-        logger.info("Starting database transaction...")
+        if commit_every:
+            logger.info(f"Committing every {commit_every} rows...")
+            stats = chunked_import(conn, rows, write, commit_every, save)
+        else:
+            logger.info("Starting database transaction...")
+            stats = write(cursor, rows)
         
-        # Track unique clients
-        clients_processed = set()
-        engagements_inserted = 0
+        if counts['rows_invalid']:
+            logger.warning(f"Found {counts['rows_invalid']} invalid rows (details above)")
+        logger.info(f"Rows read: {counts['rows_read']}, valid: {counts['rows_valid']}")
+        if not counts['rows_valid'] and not committed['rows']:
+            conn.rollback()
+            logger.error("No valid rows to import")
+            sys.exit(1)
         
-        for row in rows_data:
-            client_id = row['Serial Number']
-            client_name = row['Client_Name']
-            pan = row['PAN']
-            
-            # Upsert client (only once per unique client_id)
-            if client_id not in clients_processed:
-                if upsert_client(cursor, client_id, client_name, pan):
-                    clients_processed.add(client_id)
-            
-            # Insert engagement
-            _, _, file_num = validate_file_number(row['File_Number'])
-            engagement_data = {
-                'file_number': file_num,
-                'file_number_as_per': row.get('File_Number_As_Per', ''),
-                'type': row['Type'],
-                'type2': row.get('Type2', ''),
-                'senior': row.get('Senior', ''),
-                'assistant': row.get('Assistant', ''),
-                'status': row['Status']
-            }
-            
-            if insert_engagement(cursor, client_id, engagement_data):
-                engagements_inserted += 1
+        # Rows absent from the file, now that all of it has been read
+        if bulk and not commit_every:
+            stats.update(apply_missing(cursor, invalid_keys, delete=delete_missing and not dry_run))
+            if dry_run and delete_missing and invalid_keys.count:
+                logger.warning("--delete-missing would be refused: the file has invalid rows (details above)")
+        
+        if dry_run:
+            conn.rollback()
+            logger.info("=" * 80)
+            logger.info("Dry run: nothing was written. Changes the import would make:")
+            log_bulk_stats(stats, time.perf_counter() - started, delete_missing and not invalid_keys.count)
+            logger.info("=" * 80)
+            return
         
         # Commit transaction
+        if commit_every:
+            save(cursor, committed['rows'] - imported_before, completed=True)
         conn.commit()
         logger.info("=" * 80)
-        logger.info("Import completed successfully!")
-        logger.info(f"  Clients processed: {len(clients_processed)}")
-        logger.info(f"  Engagements inserted: {engagements_inserted}")
+        if bulk:
+            logger.info("Bulk import completed successfully!")
+            log_bulk_stats(stats, time.perf_counter() - started, delete_missing)
+        else:
+            logger.info("Import completed successfully!")
+            logger.info(f"  Clients processed: {stats['clients_processed']}")
+            logger.info(f"  Engagements inserted: {stats['engagements_inserted']}")
         logger.info("=" * 80)
         
     except Exception as e:
         conn.rollback()
         logger.error(f"Import failed, rolled back transaction: {e}")
+        if commit_every and committed['rows']:
+            logger.error(
+                f"Rows through {committed['line']} are committed; "
+                "re-run with --resume to continue from there"
+            )
         sys.exit(1)
     finally:
+        if invalid_keys is not None:
+            invalid_keys.close()
         cursor.close()
         conn.close()
 
@@ -338,9 +1278,45 @@ def import_csv():
 # Entry Point
 # ============================================================================
 
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Import clients and engagements from CSV into PostgreSQL.")
+    parser.add_argument("--bulk", action="store_true",
+                        help="COPY rows into staging tables and merge them set-based (for large files)")
+    parser.add_argument("--file", type=Path, default=CSV_FILE, help="CSV file or Excel workbook (.xlsx) to import")
+    parser.add_argument("--workers", type=int, default=1, metavar="N",
+                        help="validate and normalize rows in N processes (files without line breaks in quoted fields)")
+    parser.add_argument("--commit-every", type=int, default=0, metavar="N",
+                        help="commit every N valid rows with a checkpoint instead of one transaction")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue after the last checkpoint of this file (requires --commit-every)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="print the inserted/updated/unchanged/not-in-file diff without writing (requires --bulk)")
+    parser.add_argument("--delete-missing", action="store_true",
+                        help="delete clients and engagements that are not in the file (requires --bulk)")
+    args = parser.parse_args(argv)
+    if args.commit_every < 0:
+        parser.error("--commit-every cannot be negative")
+    if args.resume and not args.commit_every:
+        parser.error("--resume requires --commit-every")
+    if args.workers > 1 and is_workbook(args.file):
+        parser.error("--workers splits CSV files by byte range; workbooks are read in one process")
+    for flag, value in (("--dry-run", args.dry_run), ("--delete-missing", args.delete_missing)):
+        if value and not args.bulk:
+            parser.error(f"{flag} requires --bulk")
+        if value and args.commit_every:
+            parser.error(f"{flag} compares the whole file and cannot be combined with --commit-every")
+    return args
+
+
 if __name__ == "__main__":
+    args = parse_args()
+    configure_logging()
+    
     logger.info("=" * 80)
     logger.info("CA Office Suite - CSV Import Migration")
     logger.info("=" * 80)
     
-    import_csv()
+    import_csv(args.file, bulk=args.bulk, workers=args.workers,
+               commit_every=args.commit_every, resume=args.resume,
+               dry_run=args.dry_run, delete_missing=args.delete_missing)